@@ -4,13 +4,20 @@ Aplicando princípios de Engenharia de Software e Clean Code
 """
 import streamlit as st
 import streamlit.components.v1 as components
-import time
 from src.services.page_manager import PageManager, PageType
 from src.services.music_service import MusicService
 from src.services.quiz_service import QuizService
+from src.services.photo_selection_service import PhotoSelectionService
+from src.services.warmup_service import WarmupService
 from src.utils.file_utils import FileManager, ImageProcessor
 from src.utils.date_utils import DateCalculator
+from src.utils.instrumentation import instrumentation
 from src.components.styles import StyleComponents
+from src.components.style_bundle import style_bundle
+
+
+# Aquecimento dos caches em segundo plano ao importar o app (uma vez por processo)
+WarmupService().start()
 
 
 # ============================================================================
@@ -24,6 +31,7 @@ class WeddingProposalApp:
         self.configure_page()
         self.page_manager = PageManager()
         self.music_service = MusicService()
+        self.photo_selection = PhotoSelectionService()
         self.quiz_service = QuizService()
         self.file_manager = FileManager()
         self.image_processor = ImageProcessor()
@@ -54,11 +62,12 @@ class WeddingProposalApp:
         # Aplicar estilos globais
         st.markdown(self.styles.get_global_styles(), unsafe_allow_html=True)
         
-        # Adicionar música
+        # Adicionar música (player persistente: reruns só informam a faixa)
         current_page = self.page_manager.get_current_page()
-        music_html = self.music_service.generate_music_player_html(current_page.value)
+        with instrumentation.page(current_page.value):
+            music_html = self.music_service.generate_music_player_html(current_page.value)
         if music_html:
-            st.markdown(music_html, unsafe_allow_html=True)
+            self.page_manager.render_block('music.player', music_html, height=0)
         
         # Renderizar página atual
         self.page_manager.render_current_page()
@@ -69,32 +78,21 @@ class WeddingProposalApp:
     
     def show_intro_page(self):
         """Página de introdução com mensagem animada"""
-        # Carregar imagens para mosaico
-        image_files = self.file_manager.get_image_files("pictures")
-        
-        # Criar mosaico de fundo
-        import random
-        selected_images = random.sample(image_files, min(20, len(image_files))) if image_files else []
-        images_base64 = []
-        
-        for img_path in selected_images:
-            img_b64 = self.image_processor.image_to_base64(img_path, max_width=800)
-            if img_b64:
-                images_base64.append(img_b64)
+        # Mosaico de fundo: as 16 fotos do conjunto da sessão em uma única imagem
+        photo_set = self.photo_selection.get_set_for_session(16, st.session_state)
+        mosaic_src = self.image_processor.get_mosaic_src(
+            list(photo_set.photos), set_id=photo_set.set_id,
+            columns=4, rows=4, tile_size=(400, 225)
+        ) if photo_set else None
         
         # Gerar CSS do mosaico
-        if images_base64:
-            mosaic_images = ', '.join([f'url({img})' for img in images_base64[:16]])
+        if mosaic_src:
             mosaic_style = f"""
             <style>
                 .stApp {{
-                    background-image: {mosaic_images};
-                    background-size: 25% 25%;
-                    background-position: 
-                        0% 0%, 25% 0%, 50% 0%, 75% 0%,
-                        0% 25%, 25% 25%, 50% 25%, 75% 25%,
-                        0% 50%, 25% 50%, 50% 50%, 75% 50%,
-                        0% 75%, 25% 75%, 50% 75%, 75% 75%;
+                    background-image: url('{mosaic_src}');
+                    background-size: cover;
+                    background-position: center;
                     background-repeat: no-repeat;
                 }}
             </style>
@@ -111,26 +109,20 @@ class WeddingProposalApp:
         st.markdown(mosaic_style, unsafe_allow_html=True)
         
         # HTML da página de introdução
-        intro_html = self._generate_intro_html(images_base64)
+        intro_html = self._generate_intro_html(mosaic_src)
         components.html(intro_html, height=700, scrolling=False)
         
-        # Auto-avançar após 19 segundos
-        time.sleep(19)
-        self.page_manager.navigate_to(PageType.GALLERY)
+        # Auto-avançar após 19 segundos (sem bloquear a thread do script)
+        self.page_manager.navigate_after(PageType.GALLERY, 19)
     
-    def _generate_intro_html(self, images_base64: list) -> str:
+    def _generate_intro_html(self, mosaic_src: str) -> str:
         """Gera HTML da página de introdução"""
         # Preparar fundo
-        if images_base64:
-            mosaic_images = ', '.join([f'url({img})' for img in images_base64[:16]])
+        if mosaic_src:
             body_background = f"""
-                background-image: {mosaic_images};
-                background-size: 25% 25%;
-                background-position: 
-                    0% 0%, 25% 0%, 50% 0%, 75% 0%,
-                    0% 25%, 25% 25%, 50% 25%, 75% 25%,
-                    0% 50%, 25% 50%, 50% 50%, 75% 50%,
-                    0% 75%, 25% 75%, 50% 75%, 75% 75%;
+                background-image: url('{mosaic_src}');
+                background-size: cover;
+                background-position: center;
                 background-repeat: no-repeat;
             """
         else:
@@ -144,7 +136,7 @@ class WeddingProposalApp:
         <head>
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link href="https://fonts.googleapis.com/css2?family=Great+Vibes&family=Dancing+Script:wght@400;700&display=swap" rel="stylesheet">
+            {style_bundle.font_tag()}
             <style>
                 * {{
                     margin: 0;
@@ -0,0 +1,90 @@
+"""
+Benchmark da codificação das fotos da galeria: sequencial contra o pool
+
+Gera uma biblioteca sintética (sem derivados pré-gerados) e codifica a
+versão 'gallery' de todas as fotos duas vezes, com os caches vazios: uma
+foto por vez na thread atual e com ImageProcessor.encode_many. Também mede
+o cancelamento: quanto tempo encode_many leva para retornar quando o
+cancelamento é pedido logo depois do início.
+
+Uso:
+    python -m benchmarks.bench_encode
+    python -m benchmarks.bench_encode --images 40 --workers 1,2,4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# O aquecimento em segundo plano preencheria os caches durante as medições
+os.environ["APP_WARMUP"] = "0"
+
+from benchmarks.bench_pages import make_library, reset_caches  # noqa: E402
+from src.utils.encode_pool import encode_pool  # noqa: E402
+from src.utils.file_utils import FileManager, ImageProcessor  # noqa: E402
+
+
+def sequential(paths: List[str]) -> float:
+    """Codifica uma foto por vez; devolve o tempo em segundos"""
+    reset_caches()
+    start = time.perf_counter()
+    for path in paths:
+        ImageProcessor.get_rendition_src(path, 'gallery')
+    return time.perf_counter() - start
+
+
+def pooled(paths: List[str], workers: int) -> float:
+    """Codifica com encode_many usando o número de threads informado"""
+    reset_caches()
+    encode_pool.shutdown()
+    encode_pool.workers = workers
+    start = time.perf_counter()
+    results = ImageProcessor.encode_many(paths, 'gallery')
+    elapsed = time.perf_counter() - start
+    if None in results:
+        raise RuntimeError("Foto sem src no encode_many")
+    return elapsed
+
+
+def cancelled(paths: List[str], after: float) -> float:
+    """Tempo até encode_many retornar quando cancelado após 'after' segundos"""
+    reset_caches()
+    start = time.perf_counter()
+    ImageProcessor.encode_many(paths, 'gallery', cancel=lambda: time.perf_counter() - start > after)
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Compara a codificação sequencial e em pool")
+    parser.add_argument("--images", type=int, default=20, help="Fotos da biblioteca sintética")
+    parser.add_argument("--size", default="3200x2400", help="Tamanho das fotos sintéticas")
+    parser.add_argument("--workers", default="1,2,4", help="Threads do pool a medir")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.split("x"))
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-encode-") as library:
+        make_library(library, args.images, width, height)
+        os.chdir(library)
+        try:
+            paths = FileManager.get_image_files("pictures")
+            print(f"{len(paths)} fotos {args.size}, {os.cpu_count()} CPUs, "
+                  f"orçamento {encode_pool.budget.max_bytes // (1024 * 1024)} MB")
+            base = sequential(paths)
+            print(f"{'sequencial':<12} {base * 1000:>9.0f} ms")
+            for workers in (int(v) for v in args.workers.split(",")):
+                elapsed = pooled(paths, workers)
+                print(f"{f'pool x{workers}':<12} {elapsed * 1000:>9.0f} ms  ({base / elapsed:.2f}x)")
+            print(f"{'cancelado':<12} {cancelled(paths, 0.05) * 1000:>9.0f} ms  (cancelamento após 50 ms)")
+        finally:
+            os.chdir(original_cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark da decodificação de imagens: caminho completo (LANCZOS sobre a
+imagem inteira) contra o caminho rápido (draft/reduce + filtro da versão)
+
+Cada modo roda em um processo novo para que o pico de memória (RSS) de um
+não contamine o outro.
+
+Uso:
+    python -m benchmarks.bench_image_decode
+    python -m benchmarks.bench_image_decode --synthetic 20 --size 4032x3024
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.derivatives import RENDITIONS, render_image  # noqa: E402
+
+
+MODES = {
+    # Comportamento anterior: decodifica a imagem inteira e aplica LANCZOS
+    'full': {'draft': False, 'resample': 'lanczos'},
+    # Caminho atual: redução no decoder e filtro definido em cada versão
+    'fast': {'draft': True, 'resample': None},
+}
+
+
+def _peak_rss_kb() -> int:
+    """Pico de memória residente do processo em KB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_mode(image_files: List[str], rendition_name: str, mode: str, repeat: int) -> Dict:
+    """Executa um modo em um único processo e mede latência e memória"""
+    rendition = RENDITIONS[rendition_name]
+    options = MODES[mode]
+    resample = options['resample'] or rendition.resample
+
+    baseline_rss = _peak_rss_kb()
+    latencies = []
+    total_bytes = 0
+    for _ in range(repeat):
+        for image_path in image_files:
+            start = time.perf_counter()
+            data, _, _ = render_image(image_path, rendition.max_width, rendition.quality,
+                                      resample, options['draft'])
+            latencies.append((time.perf_counter() - start) * 1000)
+            total_bytes += len(data)
+
+    return {
+        'median_ms': statistics.median(latencies),
+        'p95_ms': sorted(latencies)[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0],
+        'peak_rss_mb': _peak_rss_kb() / 1024,
+        'rss_growth_mb': (_peak_rss_kb() - baseline_rss) / 1024,
+        'avg_kb': total_bytes / len(latencies) / 1024,
+        'resample': resample,
+    }
+
+
+def run_isolated(image_files: List[str], rendition_name: str, mode: str, repeat: int) -> Dict:
+    """Executa um modo em um processo novo (spawn)"""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(_run_mode, (image_files, rendition_name, mode, repeat))
+
+
+def make_synthetic(directory: str, count: int, width: int, height: int) -> List[str]:
+    """Gera fotos JPEG sintéticas com ruído para não comprimirem demais"""
+    from PIL import Image
+
+    files = []
+    for i in range(count):
+        img = Image.effect_noise((width, height), 64).convert('RGB')
+        path = os.path.join(directory, f"{i}.jpeg")
+        img.save(path, quality=92)
+        files.append(path)
+    return files
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Compara os caminhos de decodificação de imagens")
+    parser.add_argument("--pictures", default="pictures", help="Diretório das fotos")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Usa N fotos sintéticas em vez do diretório")
+    parser.add_argument("--size", default="4032x3024", help="Tamanho das fotos sintéticas")
+    parser.add_argument("--renditions", default="mosaic,gallery", help="Versões a medir")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por imagem")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.synthetic:
+            width, height = (int(v) for v in args.size.split("x"))
+            # Gerado em outro processo: ru_maxrss sobrevive ao exec dos filhos
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(1) as pool:
+                image_files = pool.apply(make_synthetic, (tmp_dir, args.synthetic, width, height))
+        else:
+            from src.utils.file_utils import FileManager
+            image_files = FileManager.get_image_files(args.pictures)
+
+        if not image_files:
+            print("Nenhuma imagem encontrada")
+            return
+
+        print(f"{len(image_files)} imagens, {args.repeat} repetições")
+        print(f"{'versão':<10} {'modo':<6} {'filtro':<9} {'mediana ms':>11} {'p95 ms':>8} "
+              f"{'pico RSS MB':>12} {'Δ RSS MB':>9} {'KB/img':>8}")
+        for rendition_name in args.renditions.split(","):
+            results = {}
+            for mode in MODES:
+                result = run_isolated(image_files, rendition_name, mode, args.repeat)
+                results[mode] = result
+                print(f"{rendition_name:<10} {mode:<6} {result['resample']:<9} "
+                      f"{result['median_ms']:>11.1f} {result['p95_ms']:>8.1f} "
+                      f"{result['peak_rss_mb']:>12.1f} {result['rss_growth_mb']:>9.1f} "
+                      f"{result['avg_kb']:>8.1f}")
+            speedup = results['full']['median_ms'] / max(results['fast']['median_ms'], 1e-9)
+            print(f"{rendition_name:<10} ganho: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark dos modelos com __slots__ contra os dicionários que eles substituem
+
+Cria N itens de mídia e N perguntas como dict e como modelo (MediaItem,
+Question) e mede a memória alocada (tracemalloc) e o tempo de leitura dos
+atributos usados pelo carrossel e pelo quiz.
+
+Uso:
+    python -m benchmarks.bench_models
+    python -m benchmarks.bench_models --count 100000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.models import MediaItem, Question  # noqa: E402
+
+
+def media_dict(i: int) -> dict:
+    """Item de mídia no formato antigo (dict)"""
+    return {'type': 'image', 'data': f"app/static/media/{i:020d}.jpg", 'mime': 'image/jpeg'}
+
+
+def media_model(i: int) -> MediaItem:
+    """Item de mídia como modelo"""
+    return MediaItem('image', f"app/static/media/{i:020d}.jpg", 'image/jpeg', f"pictures/{i}.jpeg")
+
+
+def question_dict(i: int) -> dict:
+    """Pergunta no formato antigo (dict)"""
+    return {'num': i, 'question': f"Pergunta {i}?", 'options': ['a', 'b', 'c', 'd'],
+            'correct': i % 4, 'key': f"q{i}"}
+
+
+def question_model(i: int) -> Question:
+    """Pergunta como modelo"""
+    return Question(i, f"q{i}", f"Pergunta {i}?", ('a', 'b', 'c', 'd'), i % 4)
+
+
+def measure(factory: Callable, read: Callable, count: int) -> Tuple[float, float]:
+    """
+    Mede memória dos itens e tempo de leitura
+
+    Returns:
+        (bytes por item, nanossegundos por leitura)
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for item in items:
+        read(item)
+    elapsed = time.perf_counter() - start
+    return (after - before) / count, elapsed * 1e9 / count
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Compara dicts e modelos com __slots__")
+    parser.add_argument("--count", type=int, default=10000, help="Quantidade de itens")
+    args = parser.parse_args(argv)
+
+    cases = [
+        ("mídia dict", media_dict, lambda m: (m['type'], m['data'], m['mime'])),
+        ("MediaItem", media_model, lambda m: (m.kind, m.src, m.mime)),
+        ("pergunta dict", question_dict, lambda q: (q['key'], q['options'], q['correct'])),
+        ("Question", question_model, lambda q: (q.key, q.options, q.correct)),
+    ]
+    print(f"{'tipo':<15} {'bytes/item':>11} {'ns/leitura':>11}")
+    for name, factory, read in cases:
+        size, read_ns = measure(factory, read, args.count)
+        print(f"{name:<15} {size:>11.0f} {read_ns:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
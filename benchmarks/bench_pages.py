@@ -0,0 +1,298 @@
+"""
+Benchmark do custo de render de cada página (intro, galeria, quiz, pedido)
+
+Renderiza as páginas de app.py e app_modular.py com o AppTest do Streamlit
+sobre bibliotecas sintéticas de fotos (10/100/1000 por padrão), em um
+diretório temporário que faz o papel da raiz do projeto. Para cada página
+mede tempo de parede, tempo de CPU, pico de memória alocada pelo Python
+(tracemalloc; buffers internos do Pillow não entram) e o tamanho do que seria enviado ao navegador (bytes das mensagens de delta e
+bytes de HTML).
+
+Depois do render medido, o mesmo app roda de novo na mesma sessão (um
+rerun sem mudanças) e a coluna 'reenvio KB' soma os elementos que seriam
+enviados por inteiro: os novos e os menores que global.minCachedMessageSize
+(os demais o Streamlit envia só como referência ao cache do navegador).
+
+Por padrão as páginas saem como em produção (python -m src.server), com a
+rota de mídia: áudio, vídeo e CSS por URL em app/files/. Com
+--without-media-route elas saem como em `streamlit run app.py`, com esses
+tipos embutidos em data URI e no HTML.
+
+Cada combinação roda duas vezes: 'frio' (caches vazios, sem derivados) e
+'quente' (mesmo processo, caches preenchidos pelo render anterior). O
+tempo vem de um render sem tracemalloc e o pico de memória de um segundo
+render nas mesmas condições, já que o rastreamento distorce o tempo.
+
+Uso:
+    python -m benchmarks.bench_pages
+    python -m benchmarks.bench_pages --sizes 10,100 --pages gallery --apps app.py
+    python -m benchmarks.bench_pages --json resultados.json
+    python -m benchmarks.bench_pages --without-media-route
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# O aquecimento em segundo plano preencheria os caches durante as medições
+os.environ["APP_WARMUP"] = "0"
+
+from PIL import Image  # noqa: E402
+
+from src.utils import media_route  # noqa: E402
+from src.utils.file_utils import FileManager  # noqa: E402
+from src.utils.media_cache import media_cache  # noqa: E402
+
+
+PAGES = ["intro", "gallery", "quiz", "proposal"]
+APPS = ["app.py", "app_modular.py"]
+
+# Campos de texto que carregam HTML nas mensagens do Streamlit
+HTML_FIELDS = ("body", "srcdoc", "html")
+
+
+def make_library(directory: str, count: int, width: int, height: int):
+    """
+    Gera uma biblioteca sintética de fotos e copia as músicas do projeto
+
+    Args:
+        directory: Diretório que fará o papel da raiz do projeto
+        count: Quantidade de fotos
+        width: Largura das fotos
+        height: Altura das fotos
+    """
+    pictures = os.path.join(directory, "pictures")
+    os.makedirs(pictures, exist_ok=True)
+
+    base = Image.linear_gradient("L").resize((width, height))
+    for i in range(1, count + 1):
+        # Cores diferentes por foto para que os JPEGs não sejam idênticos
+        img = Image.merge("RGB", (base, base.rotate(i % 360), Image.new("L", (width, height), i % 256)))
+        img.save(os.path.join(pictures, f"{i}.jpeg"), quality=90)
+
+    # A página do pedido procura a foto 37.jpeg
+    if count < 37:
+        shutil.copy(os.path.join(pictures, "1.jpeg"), os.path.join(pictures, "37.jpeg"))
+
+    music_source = os.path.join(PROJECT_ROOT, "music")
+    if os.path.isdir(music_source):
+        shutil.copytree(music_source, os.path.join(directory, "music"), dirs_exist_ok=True)
+
+    streamlit_config = os.path.join(PROJECT_ROOT, ".streamlit")
+    if os.path.isdir(streamlit_config):
+        shutil.copytree(streamlit_config, os.path.join(directory, ".streamlit"), dirs_exist_ok=True)
+
+
+def _walk(node) -> Iterator:
+    """Percorre a árvore de elementos do AppTest"""
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from _walk(child)
+
+
+def payload_size(app_test) -> Dict[str, int]:
+    """
+    Soma o tamanho das mensagens geradas por um render
+
+    Returns:
+        Dicionário com 'delta_bytes' (protobuf serializado) e 'html_bytes'
+    """
+    delta_bytes = 0
+    html_bytes = 0
+    for node in _walk(app_test._tree):
+        proto = getattr(node, "proto", None)
+        if proto is None or not hasattr(proto, "ByteSize"):
+            continue
+        delta_bytes += proto.ByteSize()
+        for field in HTML_FIELDS:
+            if field in proto.DESCRIPTOR.fields_by_name:
+                value = getattr(proto, field)
+                if isinstance(value, str):
+                    html_bytes += len(value.encode())
+    return {"delta_bytes": delta_bytes, "html_bytes": html_bytes}
+
+
+def element_messages(app_test) -> List[Tuple[str, int]]:
+    """
+    Hash e tamanho serializado de cada elemento (folha) do render
+
+    Returns:
+        Lista de (hash do conteúdo, bytes)
+    """
+    messages = []
+    for node in _walk(app_test._tree):
+        proto = getattr(node, "proto", None)
+        if proto is None or not hasattr(proto, "SerializeToString") or getattr(node, "children", None):
+            continue
+        data = proto.SerializeToString(deterministic=True)
+        messages.append((hashlib.md5(data).hexdigest(), len(data)))
+    return messages
+
+
+def rerun_resent_bytes(app_test) -> int:
+    """
+    Roda o app de novo na mesma sessão e soma os bytes dos elementos que não
+    seriam reenviados apenas como referência
+
+    Returns:
+        Bytes enviados por inteiro no rerun
+    """
+    from streamlit import config
+
+    threshold = int(config.get_option("global.minCachedMessageSize"))
+    previous = {digest for digest, _ in element_messages(app_test)}
+    app_test.run()
+    return sum(size for digest, size in element_messages(app_test)
+               if size < threshold or digest not in previous)
+
+
+def render_page(script: str, page: str, timeout: float, trace: bool = False) -> Dict:
+    """
+    Renderiza uma página e mede o custo
+
+    Args:
+        script: Caminho absoluto do app
+        page: Valor de st.session_state.page
+        timeout: Tempo máximo do render em segundos
+        trace: Mede o pico de memória com tracemalloc (deixa o render mais lento)
+
+    Returns:
+        Métricas do render
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app_test = AppTest.from_file(script, default_timeout=timeout)
+    app_test.session_state.page = page
+
+    if trace:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    app_test.run()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {
+        "wall_ms": wall * 1000,
+        "cpu_ms": cpu * 1000,
+        "peak_mb": peak / 1024 / 1024,
+        "error": str(app_test.exception[0].message) if app_test.exception else "",
+    }
+    result.update(payload_size(app_test))
+    result["rerun_bytes"] = 0 if trace or result["error"] else rerun_resent_bytes(app_test)
+    return result
+
+
+def reset_caches():
+    """Esvazia os caches do processo para um render 'frio'"""
+    media_cache.clear()
+    FileManager.get_index("pictures").refresh(force=True)
+    FileManager.get_index("music").refresh(force=True)
+
+
+def measure(script: str, page: str, timeout: float, cold: bool) -> Dict:
+    """
+    Mede tempo em um render sem tracemalloc e memória em outro, ambos nas
+    mesmas condições de cache
+    """
+    if cold:
+        reset_caches()
+    result = render_page(script, page, timeout)
+    if cold:
+        reset_caches()
+    result["peak_mb"] = render_page(script, page, timeout, trace=True)["peak_mb"]
+    return result
+
+
+def run(sizes: List[int], apps: List[str], pages: List[str],
+        width: int, height: int, timeout: float) -> List[Dict]:
+    """
+    Executa o benchmark para todas as combinações
+
+    Returns:
+        Lista de linhas de resultado
+    """
+    rows = []
+    original_cwd = os.getcwd()
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"bench-{size}-") as library:
+            make_library(library, size, width, height)
+            os.chdir(library)
+            try:
+                for app in apps:
+                    script = os.path.join(PROJECT_ROOT, app)
+                    for page in pages:
+                        for state in ("frio", "quente"):
+                            row = {"images": size, "app": app, "page": page, "state": state}
+                            row.update(measure(script, page, timeout, cold=state == "frio"))
+                            rows.append(row)
+                            print_row(row)
+            finally:
+                os.chdir(original_cwd)
+
+    return rows
+
+
+def print_header():
+    """Imprime o cabeçalho da tabela"""
+    print(f"{'fotos':>6} {'app':<15} {'página':<9} {'estado':<7} {'parede ms':>10} "
+          f"{'CPU ms':>9} {'pico MB':>8} {'delta KB':>10} {'HTML KB':>9} {'reenvio KB':>11}")
+
+
+def print_row(row: Dict):
+    """Imprime uma linha da tabela"""
+    print(f"{row['images']:>6} {row['app']:<15} {row['page']:<9} {row['state']:<7} "
+          f"{row['wall_ms']:>10.1f} {row['cpu_ms']:>9.1f} {row['peak_mb']:>8.1f} "
+          f"{row['delta_bytes'] / 1024:>10.1f} {row['html_bytes'] / 1024:>9.1f} "
+          f"{row['rerun_bytes'] / 1024:>11.1f}"
+          + (f"  ERRO: {row['error']}" if row['error'] else ""))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Mede o custo de render de cada página")
+    parser.add_argument("--sizes", default="10,100,1000", help="Tamanhos das bibliotecas sintéticas")
+    parser.add_argument("--apps", default=",".join(APPS), help="Apps a medir")
+    parser.add_argument("--pages", default=",".join(PAGES), help="Páginas a medir")
+    parser.add_argument("--size", default="1600x1200", help="Tamanho das fotos sintéticas")
+    parser.add_argument("--timeout", type=float, default=300, help="Tempo máximo de cada render")
+    parser.add_argument("--json", help="Salva os resultados neste arquivo para comparação")
+    parser.add_argument("--without-media-route", action="store_true",
+                        help="Mede sem a rota de mídia (como `streamlit run app.py`)")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.split("x"))
+    if not args.without_media_route:
+        media_route.mark_registered()
+    print(f"Rota de mídia: {media_route.is_registered()}")
+    print(f"Servir arquivos estáticos: {FileManager.is_static_serving_enabled()}")
+    print_header()
+    rows = run([int(v) for v in args.sizes.split(",")], args.apps.split(","),
+               args.pages.split(","), width, height, args.timeout)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output_file:
+            json.dump(rows, output_file, indent=2)
+
+    errors = [row for row in rows if row["error"]]
+    if errors:
+        print(f"❌ {len(errors)} renders com erro")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark das respostas do quiz: execuções do script e bytes por pergunta
+
+Responde todas as perguntas do quiz de app.py com o AppTest do Streamlit em
+dois modos:
+    fragmento  cada clique reexecuta só o fragmento do quiz, como faz o
+               navegador quando o botão está dentro de um st.fragment
+    script     cada clique reexecuta o script inteiro (Streamlit sem
+               fragmentos ou widgets fora do fragmento)
+
+Para cada resposta conta as execuções da página inteira (spans
+'page.render') e do quiz (spans 'quiz.fragment') e soma os bytes das
+mensagens de delta enviadas ao navegador.
+
+Uso:
+    python -m benchmarks.bench_quiz
+    python -m benchmarks.bench_quiz --modes fragmento --json quiz.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# O aquecimento em segundo plano preencheria os caches durante as medições
+os.environ["APP_WARMUP"] = "0"
+
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData, ScriptRequests  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas  # noqa: E402
+from streamlit.testing.v1.element_tree import parse_tree_from_messages  # noqa: E402
+
+from benchmarks.bench_pages import make_library  # noqa: E402
+from src.services.quiz_bank import quiz_bank  # noqa: E402
+from src.utils.instrumentation import RingBufferSink, instrumentation  # noqa: E402
+
+
+MODES = ["fragmento", "script"]
+QUESTIONS = len(quiz_bank.get().questions)
+
+
+class QuizScriptRunner(LocalScriptRunner):
+    """
+    Script runner do AppTest que pode executar só alguns fragmentos e
+    registra os bytes das mensagens de delta de cada execução
+    """
+
+    # Fragmentos da próxima execução (vazio: script inteiro)
+    fragment_ids: List[str] = []
+    last: Optional["QuizScriptRunner"] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        QuizScriptRunner.last = self
+
+    def run(self, widget_state=None, query_params=None, timeout: float = 3, page_hash: str = ""):
+        """Como LocalScriptRunner.run, com a fila de fragmentos"""
+        rerun_data = RerunData(
+            widget_states=widget_state,
+            page_script_hash=page_hash,
+            fragment_id_queue=list(self.fragment_ids),
+            is_fragment_scoped_rerun=bool(self.fragment_ids),
+        )
+        # O construtor já pediu uma execução do script inteiro, que absorveria
+        # o pedido de fragmento: começar de uma fila vazia
+        self._requests = ScriptRequests()
+        self.request_rerun(rerun_data)
+        try:
+            if not self._script_thread:
+                self.start()
+            require_widgets_deltas(self, timeout)
+        finally:
+            self.join()
+        return parse_tree_from_messages(self.forward_msgs())
+
+    def sent_bytes(self) -> int:
+        """Bytes das mensagens de delta enviadas nesta execução"""
+        return sum(data["forward_msg"].ByteSize() for data in self.event_data
+                   if "forward_msg" in data and data["forward_msg"].HasField("delta"))
+
+    def quiz_fragment_id(self) -> Optional[str]:
+        """Fragmento que contém o botão de resposta do quiz"""
+        for msg in self.forward_msgs():
+            if not msg.HasField("delta") or not msg.delta.fragment_id:
+                continue
+            element = msg.delta.new_element
+            if element.WhichOneof("type") == "button" and "next_btn" in element.button.id:
+                return msg.delta.fragment_id
+        return None
+
+
+def count_spans(sink: RingBufferSink, name: str) -> int:
+    """Quantidade de spans registrados com o nome"""
+    return len(sink.spans(name=name))
+
+
+def answer_all(mode: str, timeout: float) -> Dict:
+    """
+    Abre o quiz e responde todas as perguntas
+
+    Args:
+        mode: 'fragmento' ou 'script'
+        timeout: Tempo máximo de cada execução em segundos
+
+    Returns:
+        Métricas médias por resposta e tamanho do primeiro render
+    """
+    sink = instrumentation.get_sink(RingBufferSink)
+    sink.clear()
+    QuizScriptRunner.fragment_ids = []
+
+    app = AppTest.from_file(os.path.join(PROJECT_ROOT, "app.py"), default_timeout=timeout)
+    app.session_state.page = "quiz"
+    app.run()
+    first_bytes = QuizScriptRunner.last.sent_bytes()
+    fragment_id = QuizScriptRunner.last.quiz_fragment_id()
+    if mode == "fragmento":
+        if fragment_id is None:
+            raise RuntimeError("Fragmento do quiz não encontrado (Streamlit sem st.fragment?)")
+        QuizScriptRunner.fragment_ids = [fragment_id]
+
+    full_runs = count_spans(sink, "page.render")
+    quiz_runs = count_spans(sink, "quiz.fragment")
+    answer_bytes = 0
+    wall = 0.0
+    for _ in range(QUESTIONS):
+        start = time.perf_counter()
+        app.button(key="next_btn").click().run()
+        wall += time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+        answer_bytes += QuizScriptRunner.last.sent_bytes()
+
+    QuizScriptRunner.fragment_ids = []
+    if not app.session_state.quiz_show_result:
+        raise RuntimeError("Quiz não chegou ao resultado")
+
+    return {
+        "mode": mode,
+        "first_kb": first_bytes / 1024,
+        "page_runs": (count_spans(sink, "page.render") - full_runs) / QUESTIONS,
+        "quiz_runs": (count_spans(sink, "quiz.fragment") - quiz_runs) / QUESTIONS,
+        "kb_per_answer": answer_bytes / 1024 / QUESTIONS,
+        "ms_per_answer": wall * 1000 / QUESTIONS,
+    }
+
+
+def print_header():
+    """Imprime o cabeçalho da tabela"""
+    print(f"{'modo':<10} {'1º render KB':>13} {'páginas/resp':>13} {'quiz/resp':>10} "
+          f"{'KB/resp':>8} {'ms/resp':>8}")
+
+
+def print_row(row: Dict):
+    """Imprime uma linha da tabela"""
+    print(f"{row['mode']:<10} {row['first_kb']:>13.1f} {row['page_runs']:>13.1f} "
+          f"{row['quiz_runs']:>10.1f} {row['kb_per_answer']:>8.1f} {row['ms_per_answer']:>8.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Mede o custo de cada resposta do quiz")
+    parser.add_argument("--modes", default=",".join(MODES), help="Modos a medir")
+    parser.add_argument("--images", type=int, default=100, help="Fotos da biblioteca sintética")
+    parser.add_argument("--timeout", type=float, default=120, help="Tempo máximo de cada execução")
+    parser.add_argument("--json", help="Salva os resultados neste arquivo para comparação")
+    args = parser.parse_args(argv)
+
+    # O AppTest cria o script runner pelo nome importado em app_test
+    app_test.LocalScriptRunner = QuizScriptRunner
+
+    rows = []
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-quiz-") as library:
+        make_library(library, args.images, 1600, 1200)
+        os.chdir(library)
+        try:
+            print_header()
+            for mode in args.modes.split(","):
+                row = answer_all(mode, args.timeout)
+                rows.append(row)
+                print_row(row)
+        finally:
+            os.chdir(original_cwd)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output_file:
+            json.dump(rows, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
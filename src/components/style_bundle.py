@@ -0,0 +1,285 @@
+"""
+Folhas de estilo estáticas com nome pelo hash do conteúdo
+
+As regras CSS ficam em src/components/stylesheets/<nome>.css. Com a rota
+de mídia (app/files/, que entrega .css como text/css; veja
+src/utils/media_route.py), cada combinação de folhas é publicada uma vez
+como static/media/<hash>.css e a página recebe só um <link>: o navegador
+baixa a folha uma vez e a reaproveita nos reruns e nas visitas seguintes (o
+nome muda quando o conteúdo muda). Sem ela (o handler app/static do
+Streamlit entrega .css como text/plain) as folhas vão em um <style>.
+
+As fontes ficam no repositório, em static/fonts/ (sem @import do Google
+Fonts), e a rota as entrega como font/woff2. Para baixar as que faltarem,
+com acesso à rede:
+    python -m src.components.style_bundle --fetch-fonts
+
+Sem os arquivos de fonte a página continua funcionando, com as fontes
+genéricas (cursive, serif, sans-serif) de cada font-family.
+
+Modo por variável de ambiente:
+    APP_CSS_MODE=auto|link|inline   (auto: link se o servidor servir CSS)
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import urllib.request
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from ..utils.file_utils import FileManager
+from ..utils.instrumentation import instrumentation
+
+
+STYLESHEETS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stylesheets")
+FONTS_SUBDIRECTORY = "fonts"
+
+# Nome reservado: @font-face das fontes encontradas em static/fonts/
+FONTS_SHEET = "fonts"
+
+
+class FontFace(NamedTuple):
+    """Fonte usada pelas páginas e o arquivo local correspondente"""
+    family: str
+    weight: int
+    file_name: str
+
+
+FONT_FACES: Tuple[FontFace, ...] = (
+    FontFace("Dancing Script", 400, "dancing-script-400.woff2"),
+    FontFace("Dancing Script", 700, "dancing-script-700.woff2"),
+    FontFace("Great Vibes", 400, "great-vibes-400.woff2"),
+    FontFace("Cinzel", 400, "cinzel-400.woff2"),
+    FontFace("Cinzel", 700, "cinzel-700.woff2"),
+    FontFace("Allura", 400, "allura-400.woff2"),
+    FontFace("Montserrat", 400, "montserrat-400.woff2"),
+    FontFace("Montserrat", 700, "montserrat-700.woff2"),
+)
+
+GOOGLE_FONTS_CSS_URL = "https://fonts.googleapis.com/css2?family={family}:wght@{weight}&display=swap"
+
+# Agente de navegador moderno: o Google Fonts só responde woff2 para eles
+_FETCH_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                     "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.S)
+
+
+def minify_css(css: str) -> str:
+    """Remove comentários, indentação e linhas vazias (sem alterar as regras)"""
+    lines = (line.strip() for line in _COMMENT_PATTERN.sub("", css).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def server_serves_css() -> bool:
+    """
+    Verifica se o servidor entrega .css de static/ como text/css (só pela
+    rota de mídia; veja FileManager.server_serves)
+    """
+    return FileManager.server_serves(".css")
+
+
+class StyleBundle:
+    """Carrega as folhas de estilo e gera as tags <link>/<style> das páginas"""
+
+    def __init__(self, directory: str = STYLESHEETS_DIRECTORY, mode: Optional[str] = None):
+        self.directory = directory
+        self.mode = (mode or os.environ.get("APP_CSS_MODE", "auto")).lower()
+        self._sheets: Dict[str, str] = {}
+        self._tags: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def fonts_directory(self) -> str:
+        """Diretório das fontes locais (servido em app/files/fonts/)"""
+        return os.path.join(FileManager.STATIC_DIRECTORY, FONTS_SUBDIRECTORY)
+
+    def load(self):
+        """(Re)carrega os arquivos .css do diretório"""
+        sheets = {}
+        try:
+            for file_name in sorted(os.listdir(self.directory)):
+                name, ext = os.path.splitext(file_name)
+                if ext.lower() != ".css":
+                    continue
+                with open(os.path.join(self.directory, file_name), "r", encoding="utf-8") as f:
+                    sheets[name] = minify_css(f.read())
+        except OSError as e:
+            print(f"Erro ao carregar folhas de estilo de {self.directory}: {e}")
+        with self._lock:
+            self._sheets = sheets
+            self._tags.clear()
+
+    def names(self) -> List[str]:
+        """Nomes das folhas registradas"""
+        return sorted(self._sheets)
+
+    def uses_links(self) -> bool:
+        """Indica se as folhas são entregues como <link> para arquivos estáticos"""
+        if self.mode == "inline" or not FileManager.is_static_serving_enabled():
+            return False
+        return self.mode == "link" or server_serves_css()
+
+    def available_fonts(self) -> List[FontFace]:
+        """Fontes com arquivo presente em static/fonts/"""
+        return [face for face in FONT_FACES
+                if os.path.isfile(os.path.join(self.fonts_directory, face.file_name))]
+
+    def font_css(self, base_url: str) -> str:
+        """
+        Regras @font-face das fontes locais
+
+        Args:
+            base_url: Prefixo das URLs dos arquivos de fonte
+
+        Returns:
+            CSS (vazio se não houver fontes ou arquivos estáticos)
+        """
+        if not FileManager.is_static_serving_enabled():
+            return ""
+        return "\n".join(
+            f"@font-face{{font-family:'{face.family}';font-style:normal;font-weight:{face.weight};"
+            f"font-display:swap;src:url('{base_url}{face.file_name}') format('woff2');}}"
+            for face in self.available_fonts()
+        )
+
+    def css(self, *names: str, font_base_url: Optional[str] = None) -> str:
+        """
+        Conteúdo das folhas, na ordem pedida
+
+        Args:
+            *names: Nomes das folhas ('fonts' gera as regras @font-face)
+            font_base_url: Prefixo das URLs das fontes (padrão: URL estática)
+
+        Returns:
+            CSS concatenado
+
+        Raises:
+            KeyError: Se alguma folha não existir
+        """
+        if font_base_url is None:
+            font_base_url = FileManager.static_url(f"{FONTS_SUBDIRECTORY}/")
+        parts = []
+        for name in names:
+            if name == FONTS_SHEET:
+                parts.append(self.font_css(font_base_url))
+            elif name in self._sheets:
+                parts.append(self._sheets[name])
+            else:
+                raise KeyError(f"Folha de estilo não encontrada: {name}")
+        return "\n".join(part for part in parts if part)
+
+    def tag(self, *names: str) -> str:
+        """
+        HTML que aplica as folhas na página
+
+        Com arquivos estáticos, um <link> para a folha publicada com nome pelo
+        hash (publicada uma vez por processo); sem eles, um <style> inline.
+
+        Args:
+            *names: Nomes das folhas
+
+        Returns:
+            Tag <link> ou <style>
+        """
+        links = self.uses_links()
+        key = (names, links, len(self.available_fonts()) if FONTS_SHEET in names else 0)
+        with self._lock:
+            cached = self._tags.get(key)
+        if cached:
+            return cached
+
+        with instrumentation.span(f"styles.{'+'.join(names)}", "render") as span:
+            html = None
+            if links:
+                # A folha fica em <static>/media/: as fontes em ../fonts/
+                css = self.css(*names, font_base_url=f"../{FONTS_SUBDIRECTORY}/")
+                url = FileManager.publish_bytes(css.encode("utf-8"), ".css", check_type=False)
+                if url:
+                    html = f'<link rel="stylesheet" href="{url}">'
+            if html is None:
+                html = f"<style>\n{self.css(*names)}\n</style>"
+            span.add_bytes(html)
+
+        with self._lock:
+            self._tags[key] = html
+        return html
+
+    def font_tag(self) -> str:
+        """
+        <style> com as regras @font-face, para documentos em iframe
+        (components.html), que não herdam as folhas da página
+
+        Returns:
+            Tag <style> ou string vazia se não houver fontes locais
+        """
+        css = self.font_css(FileManager.static_url(f"{FONTS_SUBDIRECTORY}/"))
+        return f"<style>{css}</style>" if css else ""
+
+
+def fetch_fonts(output_directory: str, timeout: float = 30) -> int:
+    """
+    Baixa do Google Fonts os arquivos woff2 (subconjunto latin) de FONT_FACES
+
+    Args:
+        output_directory: Diretório de destino (normalmente static/fonts)
+        timeout: Tempo máximo de cada requisição em segundos
+
+    Returns:
+        Quantidade de fontes baixadas
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    downloaded = 0
+    for face in FONT_FACES:
+        target = os.path.join(output_directory, face.file_name)
+        if os.path.isfile(target):
+            downloaded += 1
+            continue
+        try:
+            css_url = GOOGLE_FONTS_CSS_URL.format(family=face.family.replace(" ", "+"), weight=face.weight)
+            request = urllib.request.Request(css_url, headers={"User-Agent": _FETCH_USER_AGENT})
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                css = response.read().decode("utf-8")
+
+            # Blocos precedidos por /* latin */ cobrem os acentos do português
+            match = re.search(r"/\*\s*latin\s*\*/\s*@font-face\s*\{[^}]*?url\((\S+?)\)", css)
+            if not match:
+                print(f"Erro ao baixar {face.family} {face.weight}: subconjunto latin não encontrado")
+                continue
+
+            with urllib.request.urlopen(match.group(1), timeout=timeout) as response:
+                data = response.read()
+            with open(target, "wb") as font_file:
+                font_file.write(data)
+            downloaded += 1
+            print(f"✅ {face.file_name} ({len(data) // 1024} KB)")
+        except (OSError, ValueError) as e:
+            print(f"Erro ao baixar {face.family} {face.weight}: {e}")
+    return downloaded
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Folhas de estilo e fontes locais")
+    parser.add_argument("--fetch-fonts", action="store_true", help="Baixa as fontes para static/fonts")
+    parser.add_argument("--output", default=os.path.join(FileManager.STATIC_DIRECTORY, FONTS_SUBDIRECTORY),
+                        help="Diretório das fontes")
+    args = parser.parse_args(argv)
+
+    if args.fetch_fonts:
+        count = fetch_fonts(args.output)
+        print(f"{count}/{len(FONT_FACES)} fontes em {args.output}")
+        if count < len(FONT_FACES):
+            sys.exit(1)
+    else:
+        for name in style_bundle.names():
+            print(f"{name}: {len(style_bundle.css(name).encode())} bytes")
+
+
+# Instância única, carregada na importação
+style_bundle = StyleBundle()
+
+
+if __name__ == "__main__":
+    main()
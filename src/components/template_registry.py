@@ -0,0 +1,134 @@
+"""
+Registro de templates HTML pré-compilados
+
+Os templates ficam em src/components/templates/<nome>.html e usam slots no
+formato {{ nome }}. Cada arquivo é lido e dividido uma única vez, na
+importação, em trechos estáticos e slots; por render só os slots são
+preenchidos, sem reconstruir o HTML inteiro a cada rerun.
+"""
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from ..utils.instrumentation import instrumentation
+
+
+TEMPLATES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+_SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    """Template dividido em trechos estáticos intercalados com slots"""
+
+    __slots__ = ("name", "source", "slots", "_parts", "_positions")
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+
+        # Trechos estáticos nas posições pares, slots nas ímpares
+        pieces = _SLOT_PATTERN.split(source)
+        self._parts: List[str] = pieces
+        self._positions: Tuple[Tuple[int, str], ...] = tuple(
+            (index, pieces[index]) for index in range(1, len(pieces), 2)
+        )
+        self.slots = frozenset(name for _, name in self._positions)
+
+    @property
+    def static_size(self) -> int:
+        """Bytes (UTF-8) da parte estática do template"""
+        return sum(len(self._parts[index].encode()) for index in range(0, len(self._parts), 2))
+
+    def render(self, **values) -> str:
+        """
+        Preenche os slots
+
+        Args:
+            **values: Valor de cada slot (convertido com str())
+
+        Returns:
+            HTML final
+
+        Raises:
+            KeyError: Se faltar o valor de algum slot
+        """
+        if not self._positions:
+            return self.source
+
+        missing = self.slots.difference(values)
+        if missing:
+            raise KeyError(f"Template '{self.name}' sem valor para: {', '.join(sorted(missing))}")
+
+        parts = list(self._parts)
+        for index, name in self._positions:
+            parts[index] = str(values[name])
+        return "".join(parts)
+
+
+class TemplateRegistry:
+    """Carrega e compila todos os templates de um diretório"""
+
+    def __init__(self, directory: str = TEMPLATES_DIRECTORY):
+        self.directory = directory
+        self._templates: Dict[str, Template] = {}
+        self.load()
+
+    def load(self):
+        """(Re)carrega os arquivos .html do diretório"""
+        templates = {}
+        try:
+            for file_name in sorted(os.listdir(self.directory)):
+                name, ext = os.path.splitext(file_name)
+                if ext.lower() != ".html":
+                    continue
+                with open(os.path.join(self.directory, file_name), "r", encoding="utf-8") as f:
+                    templates[name] = Template(name, f.read())
+        except OSError as e:
+            print(f"Erro ao carregar templates de {self.directory}: {e}")
+        self._templates = templates
+
+    def names(self) -> List[str]:
+        """Nomes dos templates registrados"""
+        return sorted(self._templates)
+
+    def get(self, name: str) -> Optional[Template]:
+        """Obtém um template pelo nome"""
+        return self._templates.get(name)
+
+    def render(self, name: str, **values) -> str:
+        """
+        Renderiza um template registrado
+
+        O render é medido como o span 'template.<nome>' com o tamanho do HTML
+        gerado, o que permite comparar o payload de cada template.
+
+        Args:
+            name: Nome do template (arquivo sem .html)
+            **values: Valores dos slots
+
+        Returns:
+            HTML final
+
+        Raises:
+            KeyError: Se o template não existir ou faltar algum slot
+        """
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Template não encontrado: {name}")
+        with instrumentation.span(f"template.{name}", "render") as span:
+            html = template.render(**values)
+            span.add_bytes(html)
+        return html
+
+    def sizes(self) -> Dict[str, int]:
+        """
+        Tamanho da parte estática de cada template
+
+        Returns:
+            Dicionário nome -> bytes
+        """
+        return {name: template.static_size for name, template in sorted(self._templates.items())}
+
+
+# Instância única, compilada na importação
+templates = TemplateRegistry()
@@ -0,0 +1,6 @@
+"""Modelos de dados compactos (__slots__) da aplicação"""
+from .base import SlotsModel
+from .media import ImageSource, MediaItem
+from .quiz import Question, QuizResult
+
+__all__ = ["SlotsModel", "ImageSource", "MediaItem", "Question", "QuizResult"]
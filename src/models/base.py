@@ -0,0 +1,58 @@
+"""
+Base dos modelos com __slots__
+
+Sem __dict__ por instância, cada objeto guarda só os ponteiros dos seus
+atributos (bem menos memória que um dict com as mesmas chaves) e o acesso
+a atributo é resolvido por descritor, sem busca em dicionário.
+"""
+from typing import Any, Dict, Iterator, Tuple
+
+
+class SlotsModel:
+    """
+    Modelo imutável com atributos declarados em __slots__
+
+    As subclasses declaram __slots__ na mesma ordem dos argumentos do
+    __init__ e atribuem os valores com _set(); depois disso os atributos
+    não podem ser alterados. Igualdade, hash e pickle usam os valores dos
+    slots.
+    """
+
+    __slots__ = ()
+
+    def _set(self, **values: Any):
+        """Atribui os valores iniciais (usado apenas no __init__)"""
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} é imutável")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} é imutável")
+
+    def _values(self) -> Tuple:
+        """Valores dos slots, na ordem declarada"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.__slots__, self._values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Atributos como dicionário"""
+        return dict(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__,) + self._values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return (type(self), self._values())
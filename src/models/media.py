@@ -0,0 +1,61 @@
+"""
+Item de mídia da galeria
+"""
+from typing import Dict, List, Optional, Tuple
+from .base import SlotsModel
+
+
+class ImageSource(SlotsModel):
+    """Alternativa de uma foto em outro formato (ex.: WebP, AVIF) ou largura"""
+
+    __slots__ = ("src", "mime", "width", "height")
+
+    src: str
+    mime: str
+    width: Optional[int]   # largura em pixels (descritor 'w' do srcset)
+    height: Optional[int]
+
+    def __init__(self, src: str, mime: str, width: Optional[int] = None, height: Optional[int] = None):
+        self._set(src=src, mime=mime, width=width, height=height)
+
+    def candidate(self) -> str:
+        """Candidato do srcset ('url 960w', ou só a URL sem largura)"""
+        return f"{self.src} {self.width}w" if self.width else self.src
+
+
+class MediaItem(SlotsModel):
+    """Foto ou vídeo com o src entregue ao navegador (URL ou data URI)"""
+
+    __slots__ = ("kind", "src", "mime", "path", "sources", "poster")
+
+    kind: str            # 'image' ou 'video'
+    src: str
+    mime: str
+    path: Optional[str]  # arquivo de origem
+    sources: Tuple[ImageSource, ...]  # alternativas ao src, da preferida para a menos
+    poster: Optional[str]  # vídeos: quadro exibido antes de tocar
+
+    def __init__(self, kind: str, src: str, mime: str, path: Optional[str] = None,
+                 sources: Tuple[ImageSource, ...] = (), poster: Optional[str] = None):
+        self._set(kind=kind, src=src, mime=mime, path=path, sources=tuple(sources), poster=poster)
+
+    @property
+    def is_video(self) -> bool:
+        """Indica se o item é um vídeo"""
+        return self.kind == "video"
+
+    def to_json(self) -> Dict[str, object]:
+        """
+        Formato usado pelo carrossel (JavaScript); as alternativas vão como
+        um srcset por mime type, na ordem de preferência, e o poster dos
+        vídeos quando houver
+        """
+        data: Dict[str, object] = {"type": self.kind, "src": self.src, "mime": self.mime}
+        if self.sources:
+            srcsets: Dict[str, List[str]] = {}
+            for source in self.sources:
+                srcsets.setdefault(source.mime, []).append(source.candidate())
+            data["srcset"] = {mime: ", ".join(candidates) for mime, candidates in srcsets.items()}
+        if self.poster:
+            data["poster"] = self.poster
+        return data
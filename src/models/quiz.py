@@ -0,0 +1,57 @@
+"""
+Modelos do quiz: pergunta e resultado
+"""
+from typing import Optional, Tuple
+from .base import SlotsModel
+
+
+class Question(SlotsModel):
+    """Pergunta do quiz (correct < 0: resposta especial, sem acerto ou erro)"""
+
+    __slots__ = ("num", "key", "question", "options", "correct")
+
+    num: int
+    key: str
+    question: str
+    options: Tuple[str, ...]
+    correct: int
+
+    def __init__(self, num: int, key: str, question: str, options: Tuple[str, ...], correct: int):
+        self._set(num=num, key=key, question=question, options=tuple(options), correct=correct)
+
+    @property
+    def is_scored(self) -> bool:
+        """Indica se a pergunta conta para o resultado"""
+        return self.correct >= 0
+
+    @property
+    def correct_option(self) -> Optional[str]:
+        """Texto da opção correta"""
+        return self.options[self.correct] if self.is_scored else None
+
+
+class QuizResult(SlotsModel):
+    """Estatísticas das respostas do quiz"""
+
+    __slots__ = ("correct_count", "wrong_count", "total", "percentage",
+                 "performance_msg", "emoji", "wrong_questions")
+
+    correct_count: int
+    wrong_count: int
+    total: int
+    percentage: float
+    performance_msg: str
+    emoji: str
+    wrong_questions: Tuple[int, ...]  # números das perguntas erradas
+
+    def __init__(self, correct_count: int, wrong_count: int, total: int, percentage: float,
+                 performance_msg: str, emoji: str, wrong_questions: Tuple[int, ...] = ()):
+        self._set(correct_count=correct_count, wrong_count=wrong_count, total=total,
+                  percentage=percentage, performance_msg=performance_msg, emoji=emoji,
+                  wrong_questions=tuple(wrong_questions))
+
+    def __getitem__(self, key: str):
+        """Acesso como dicionário (formato antigo de calculate_statistics)"""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
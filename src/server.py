@@ -0,0 +1,52 @@
+"""
+Inicia o servidor do Streamlit com o aquecimento dos caches no mesmo processo
+
+Os caches de mídia (imagens codificadas, mosaicos, URLs publicadas, faixas)
+vivem na memória do processo. Aquecidos por um processo separado, morreriam
+com ele; aquecidos só quando o app roda pela primeira vez, o primeiro
+visitante pagaria por eles. Aqui o aquecimento começa junto com o servidor e
+o marcador de prontidão só é criado quando os caches do servidor estão
+quentes.
+
+Também registra no servidor a rota de mídia (app/files/, veja
+src/utils/media_route.py), que entrega áudio, vídeo, AVIF, CSS e fontes de
+static/ com o tipo certo e range requests.
+
+Uso (os argumentos depois do script vão para `streamlit run`):
+    python -m src.server --marker /tmp/app-warmup.ready app.py --server.port=8501
+"""
+import argparse
+import os
+from typing import List, Optional
+from .services.warmup_service import WarmupService
+from .utils import media_route
+from .utils.file_utils import FileManager
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Servidor do Streamlit com aquecimento dos caches")
+    parser.add_argument("--pictures", default="pictures", help="Diretório das fotos")
+    parser.add_argument("--music", default="music", help="Diretório das músicas")
+    parser.add_argument("--workers", type=int, default=None, help="Número de threads do aquecimento")
+    parser.add_argument("--marker", default=None, help="Arquivo criado quando o aquecimento termina")
+    parser.add_argument("--skip-derivatives", action="store_true", help="Não gera os derivados")
+    parser.add_argument("script", help="Script do app (ex.: app.py)")
+    parser.add_argument("streamlit_args", nargs=argparse.REMAINDER, help="Argumentos de `streamlit run`")
+    args = parser.parse_args(argv)
+
+    if args.marker and os.path.exists(args.marker):
+        os.remove(args.marker)
+
+    media_route.install(FileManager.STATIC_DIRECTORY, FileManager.STATIC_MIME_TYPES)
+    WarmupService(args.pictures, args.music, args.workers, args.marker).start_with_server(
+        build_derivatives=not args.skip_derivatives)
+
+    # O script do app importa os mesmos módulos (src.*) deste processo: o
+    # WarmupService().start() dele vê o aquecimento já iniciado
+    from streamlit.web import cli
+    cli.main(args=["run", args.script, *args.streamlit_args], prog_name="streamlit")
+
+
+if __name__ == "__main__":
+    main()
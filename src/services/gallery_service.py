@@ -0,0 +1,180 @@
+"""
+Manifesto paginado da galeria (slides que o carrossel busca sob demanda)
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional, Set
+from ..models import MediaItem
+from ..utils.derivatives import RENDITIONS, derivative_store
+from ..utils.file_utils import FileManager, ImageProcessor
+from ..utils.instrumentation import instrumentation
+
+
+class GalleryService:
+    """
+    Itens do carrossel em páginas JSON publicadas em static/
+
+    A página do Streamlit só envia os slides da janela inicial; os demais o
+    carrossel busca em <static>/media/gallery/<versão>/<página>.json
+    (<static> é app/files com a rota de mídia, app/static sem ela) quando se
+    aproximam. As páginas são geradas uma vez por versão da biblioteca
+    (fotos, vídeos, derivados e rota que serve as URLs), em segundo plano ou no
+    aquecimento, nunca durante o render: fotos sem derivado são codificadas
+    na versão 'gallery' em vez de publicadas no tamanho original.
+    """
+
+    PAGE_SIZE = 20
+    MANIFEST_SUBDIRECTORY = "gallery"
+
+    # Versões com todas as páginas publicadas / em geração, no processo
+    _ready: Set[str] = set()
+    _building: Set[str] = set()
+    _lock = threading.Lock()
+
+    def __init__(self, pictures_directory: str = "pictures", page_size: int = PAGE_SIZE):
+        self.pictures_directory = pictures_directory
+        self.page_size = page_size
+
+    def get_files(self) -> List[str]:
+        """Fotos e vídeos da galeria, na ordem dos slides"""
+        return FileManager.get_media_files(self.pictures_directory)
+
+    def version(self) -> str:
+        """
+        Identifica o manifesto: muda quando fotos, vídeos, derivados, o
+        tamanho das páginas ou o prefixo das URLs mudam
+        """
+        fingerprint = FileManager.get_index(self.pictures_directory).fingerprint(['image', 'video'])
+        identity = (f"{fingerprint}:{derivative_store.version()}:{self.page_size}:"
+                    f"{tuple(RENDITIONS['gallery'])}:{FileManager.static_url('')}")
+        return hashlib.sha1(identity.encode()).hexdigest()[:12]
+
+    @classmethod
+    def _manifest_path(cls, version: str, page: Optional[int] = None) -> str:
+        """Diretório de uma versão do manifesto (ou arquivo de uma página)"""
+        path = os.path.join(FileManager.STATIC_DIRECTORY, FileManager.STATIC_MEDIA_SUBDIRECTORY,
+                            cls.MANIFEST_SUBDIRECTORY, version)
+        return path if page is None else os.path.join(path, f"{page}.json")
+
+    @classmethod
+    def page_url_pattern(cls, version: str) -> str:
+        """URL das páginas com '{page}' no lugar do número da página"""
+        return FileManager.static_url(f"{FileManager.STATIC_MEDIA_SUBDIRECTORY}/"
+                                      f"{cls.MANIFEST_SUBDIRECTORY}/{version}/{{page}}.json")
+
+    def page_count(self, total: int) -> int:
+        """Número de páginas para total itens"""
+        return (total + self.page_size - 1) // self.page_size
+
+    @staticmethod
+    def window_positions(total: int, window: int) -> List[int]:
+        """
+        Posições entregues junto com a página: o primeiro slide e seus
+        vizinhos (window de cada lado, dando a volta no fim)
+        """
+        return sorted({offset % total for offset in range(-window, window + 1)}) if total else []
+
+    def ensure_pages(self, files: List[str], version: str) -> bool:
+        """
+        Garante que as páginas da versão existem, gerando-as em uma thread
+        de fundo se preciso (uma vez por versão no processo)
+
+        Args:
+            files: Itens da galeria, na ordem dos slides
+            version: Versão do manifesto (veja version())
+
+        Returns:
+            True se todas as páginas já estão publicadas
+        """
+        if self._is_ready(version, len(files)):
+            return True
+        if self._claim(version):
+            threading.Thread(target=self._build_claimed, args=(list(files), version),
+                             name=f"gallery-{version}", daemon=True).start()
+        return False
+
+    def build_pages(self) -> str:
+        """
+        Gera as páginas da versão atual na thread atual (aquecimento)
+
+        Returns:
+            Versão do manifesto (já publicada, gerada agora ou em geração
+            por outra thread)
+        """
+        files = self.get_files()
+        version = self.version()
+        if not self._is_ready(version, len(files)) and self._claim(version):
+            self._build_claimed(files, version)
+        return version
+
+    def _is_ready(self, version: str, total: int) -> bool:
+        """Verifica (no disco na primeira vez) se a versão está completa"""
+        with self._lock:
+            if version in self._ready:
+                return True
+        # A última página é gravada por último
+        if total and os.path.exists(self._manifest_path(version, self.page_count(total) - 1)):
+            with self._lock:
+                self._ready.add(version)
+            return True
+        return False
+
+    @classmethod
+    def _claim(cls, version: str) -> bool:
+        """Marca a versão como em geração; False se já está"""
+        with cls._lock:
+            if version in cls._building or version in cls._ready:
+                return False
+            cls._building.add(version)
+            return True
+
+    @instrumentation.timed('gallery.build_pages', 'encode')
+    def _build_claimed(self, files: List[str], version: str):
+        """Gera e publica as páginas, em ordem, e remove versões antigas"""
+        try:
+            for page in range(self.page_count(len(files))):
+                chunk = files[page * self.page_size:(page + 1) * self.page_size]
+                ImageProcessor.encode_many([path for path in chunk if not FileManager.is_video_file(path)],
+                                           'gallery')
+                items = [self._item_json(path) for path in chunk]
+                data = json.dumps(items).encode("utf-8")
+                if not FileManager.publish_named(data, f"{self.MANIFEST_SUBDIRECTORY}/{version}/{page}.json"):
+                    return
+            with self._lock:
+                self._ready.add(version)
+            self._remove_old_versions(version)
+        finally:
+            with self._lock:
+                self._building.discard(version)
+
+    @staticmethod
+    def _item_json(path: str) -> Optional[Dict[str, object]]:
+        """
+        Item do carrossel (None se não puder ser servido)
+        
+        Vídeos que o servidor não entrega por URL ficam de fora: em data URI
+        cada página JSON carregaria o vídeo inteiro em base64.
+        """
+        try:
+            if FileManager.is_video_file(path) and not FileManager.server_serves(
+                    os.path.splitext(path)[1], os.path.getsize(path)):
+                return None
+            item: Optional[MediaItem] = FileManager.get_media_item(path)
+        except Exception as e:
+            print(f"Erro ao processar {path}: {e}")
+            return None
+        return item.to_json() if item else None
+
+    def _remove_old_versions(self, version: str):
+        """Apaga os manifestos de versões anteriores"""
+        root = os.path.dirname(self._manifest_path(version))
+        if not os.path.isdir(root):
+            return
+        with self._lock:
+            keep = self._building | {version}
+        for name in os.listdir(root):
+            if name not in keep:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
@@ -1,42 +1,125 @@
 """
 Serviço de gerenciamento de música
 """
-from typing import Optional, List
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from ..components.template_registry import templates
 from ..utils.file_utils import FileManager, ImageProcessor
+from ..utils.instrumentation import instrumentation
+from ..utils.media_cache import media_cache
 
 
 class MusicService:
     """Serviço para gerenciar música da aplicação"""
     
+    ALCEU_KEYWORDS = ("Alceu", "alceu", "Belle")
+    ROBERTA_KEYWORDS = ("Roberta", "roberta", "Janeiro")
+    
+    # Mapeamento de faixas por diretório, compartilhado pelo processo:
+    # diretório -> (mtime do diretório, {'alceu': ..., 'roberta': ..., 'default': ...})
+    _tracks_by_directory: Dict[str, Tuple[int, Dict[str, Optional[str]]]] = {}
+    _tracks_lock = threading.Lock()
+    
     def __init__(self, music_directory: str = "music"):
         self.music_directory = music_directory
         self.file_manager = FileManager()
         self.processor = ImageProcessor()
     
+    def get_tracks(self) -> Dict[str, Optional[str]]:
+        """
+        Identifica as faixas do diretório uma única vez por processo
+        
+        A listagem só é refeita quando o mtime do diretório muda (arquivo
+        adicionado, removido ou renomeado).
+        
+        Returns:
+            Dicionário com os caminhos das faixas 'alceu', 'roberta' e 'default'
+        """
+        try:
+            directory_mtime = os.stat(self.music_directory).st_mtime_ns
+        except OSError:
+            return {}
+        
+        with self._tracks_lock:
+            cached = self._tracks_by_directory.get(self.music_directory)
+            if cached and cached[0] == directory_mtime:
+                return cached[1]
+        
+        music_files = self.file_manager.get_music_files(self.music_directory)
+        tracks: Dict[str, Optional[str]] = {
+            'alceu': None,
+            'roberta': None,
+            'default': music_files[0] if music_files else None
+        }
+        
+        # Identificar músicas
+        for music_file in music_files:
+            if any(keyword in music_file for keyword in self.ALCEU_KEYWORDS):
+                tracks['alceu'] = music_file
+            elif any(keyword in music_file for keyword in self.ROBERTA_KEYWORDS):
+                tracks['roberta'] = music_file
+        
+        with self._tracks_lock:
+            self._tracks_by_directory[self.music_directory] = (directory_mtime, tracks)
+        return tracks
+    
+    @staticmethod
+    def _memoized(kind: str, music_file: str, factory: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Memoiza no cache do processo o resultado de codificar uma faixa
+        
+        A chave inclui tamanho e mtime do arquivo; quando a faixa muda,
+        as entradas antigas do mesmo arquivo são descartadas.
+        """
+        key = ImageProcessor._cache_key(kind, music_file)
+        if key is None:
+            return None
+        
+        cached = media_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        media_cache.invalidate(lambda k: k[:2] == key[:2] and k != key)
+        value = factory()
+        if value is not None:
+            media_cache.put(key, value)
+        return value
+    
+    @instrumentation.timed('music.page_base64', 'base64')
     def get_music_for_page(self, page: str) -> Optional[str]:
         """
         Obtém música apropriada para a página
         
+        Apenas a faixa selecionada é lida e codificada, e o resultado fica
+        memoizado para todas as sessões.
+        
         Args:
             page: Nome da página ('intro', 'gallery', 'quiz', 'proposal')
             
         Returns:
             Base64 da música ou None
         """
-        music_files = self.file_manager.get_music_files(self.music_directory)
-        
-        if not music_files:
+        music_file = self.get_music_file_for_page(page)
+        if not music_file:
             return None
+        return self._memoized('music_base64', music_file,
+                              lambda: self.processor.audio_to_base64(music_file))
+    
+    def get_music_file_for_page(self, page: str) -> Optional[str]:
+        """
+        Obtém o caminho da música apropriada para a página
         
-        alceu_music = None
-        roberta_music = None
-        
-        # Identificar músicas
-        for music_file in music_files:
-            if any(keyword in music_file for keyword in ["Alceu", "alceu", "Belle"]):
-                alceu_music = self.processor.audio_to_base64(music_file)
-            elif any(keyword in music_file for keyword in ["Roberta", "roberta", "Janeiro"]):
-                roberta_music = self.processor.audio_to_base64(music_file)
+        Args:
+            page: Nome da página ('intro', 'gallery', 'quiz', 'proposal')
+            
+        Returns:
+            Caminho do arquivo de música ou None
+        """
+        tracks = self.get_tracks()
+        alceu_music = tracks.get('alceu')
+        roberta_music = tracks.get('roberta')
         
         # Escolher música baseada na página
         if page == 'proposal':
@@ -44,9 +127,78 @@ class MusicService:
         else:  # intro, quiz, gallery
             return alceu_music if alceu_music else roberta_music
     
+    def get_default_music_file(self) -> Optional[str]:
+        """Obtém a primeira música do diretório (ordem alfabética)"""
+        return self.get_tracks().get('default')
+    
+    @instrumentation.timed('music.track_src', 'encode')
+    def get_track_src(self, music_file: str) -> Optional[str]:
+        """
+        Obtém o src de uma faixa, memoizado para todas as sessões
+        
+        URL estática quando o servidor entrega o tipo do áudio (pela rota de
+        mídia, com range requests; veja src/utils/media_route.py). O data URI
+        (a faixa inteira em base64 em cada página) fica como último recurso,
+        para quando o app roda sem a rota ou a publicação falha.
+        """
+        suffix = os.path.splitext(music_file)[1]
+        if self.file_manager.is_static_serving_enabled() and self.file_manager.server_serves(suffix):
+            url = self._memoized('music_url', music_file, lambda: self.file_manager.publish_file(music_file))
+            if url:
+                return url
+        return self._memoized('music_data_uri', music_file, lambda: self._track_data_uri(music_file))
+    
+    def _track_data_uri(self, music_file: str) -> Optional[str]:
+        """Data URI de uma faixa (avisa no log: a faixa vai inteira em cada página)"""
+        print(f"⚠️ {music_file}: servidor não entrega {self.file_manager.get_mime_type(music_file)} "
+              f"(rode com python -m src.server), faixa embutida como data URI")
+        audio_base64 = self.processor.audio_to_base64(music_file)
+        if audio_base64 is None:
+            return None
+        return f"data:{self.file_manager.get_mime_type(music_file)};base64,{audio_base64}"
+    
+    def get_music_src_for_page(self, page: str) -> Optional[str]:
+        """
+        Obtém o src do player para a página (URL estática ou, em último
+        caso, data URI; veja get_track_src)
+        """
+        music_file = self.get_music_file_for_page(page)
+        if not music_file:
+            return None
+        return self.get_track_src(music_file)
+    
+    @instrumentation.timed('music.player_html', 'render')
+    def player_html(self, music_file: str) -> str:
+        """
+        Gera o HTML do componente (components.html) que toca uma faixa no
+        player persistente
+        
+        O <audio> é criado uma única vez no documento da página e sobrevive
+        aos reruns; o componente só informa qual faixa deve tocar. A mesma
+        faixa em outra página continua de onde está, sem novo download, e
+        com URL estática o navegador busca o áudio por range requests.
+        
+        Args:
+            music_file: Caminho da faixa
+            
+        Returns:
+            HTML do componente ou string vazia se a faixa não puder ser servida
+        """
+        music_src = self.get_track_src(music_file)
+        if not music_src:
+            return ""
+        
+        track = {
+            'key': os.path.basename(music_file),
+            'src': music_src,
+            'mime': self.file_manager.get_mime_type(music_file),
+        }
+        return templates.render('music_player', track_json=json.dumps(track).replace('</', '<\\/'))
+    
     def generate_music_player_html(self, page: str) -> str:
         """
         Gera HTML do player de música para uma página específica
+        (veja player_html; deve ser renderizado com components.html)
         
         Args:
             page: Nome da página
@@ -54,72 +206,7 @@ class MusicService:
         Returns:
             HTML do player
         """
-        music_base64 = self.get_music_for_page(page)
-        
-        if not music_base64:
+        music_file = self.get_music_file_for_page(page)
+        if not music_file:
             return ""
-        
-        return f"""
-        <audio id="global-music-player" loop style="display: none;">
-            <source src="data:audio/mpeg;base64,{music_base64}" type="audio/mpeg">
-        </audio>
-        <script>
-            // Player de música persistente que não recarrega entre páginas
-            (function() {{
-                const audioPlayer = document.getElementById('global-music-player');
-                const musicKey = 'music_playing_{page}';
-                
-                // Verificar se a música já está tocando
-                const isMusicPlaying = localStorage.getItem('music_is_playing') === 'true';
-                const currentTime = parseFloat(localStorage.getItem('music_current_time') || '0');
-                
-                if (audioPlayer) {{
-                    // Restaurar tempo se for a mesma música
-                    if (isMusicPlaying && currentTime > 0) {{
-                        audioPlayer.currentTime = currentTime;
-                    }}
-                    
-                    // Função para iniciar música
-                    const startMusic = () => {{
-                        audioPlayer.play().then(() => {{
-                            localStorage.setItem('music_is_playing', 'true');
-                            console.log('Música iniciada com sucesso!');
-                            
-                            // Salvar progresso da música periodicamente
-                            setInterval(() => {{
-                                if (!audioPlayer.paused) {{
-                                    localStorage.setItem('music_current_time', audioPlayer.currentTime.toString());
-                                }}
-                            }}, 1000);
-                        }}).catch(e => {{
-                            console.log('Aguardando interação do usuário...');
-                        }});
-                    }};
-                    
-                    // Tentar tocar imediatamente
-                    startMusic();
-                    
-                    // Tentar novamente após pequeno delay
-                    setTimeout(startMusic, 100);
-                    setTimeout(startMusic, 500);
-                    
-                    // Adicionar listeners para múltiplos eventos
-                    const events = ['click', 'touchstart', 'keydown', 'scroll', 'mousemove'];
-                    const playOnInteraction = () => {{
-                        if (audioPlayer.paused) {{
-                            startMusic();
-                        }}
-                        // Remover listeners após primeiro sucesso
-                        events.forEach(event => {{
-                            document.removeEventListener(event, playOnInteraction);
-                        }});
-                    }};
-                    
-                    events.forEach(event => {{
-                        document.addEventListener(event, playOnInteraction, {{ once: true }});
-                    }});
-                }}
-            }})();
-        </script>
-        """
-
+        return self.player_html(music_file)
@@ -1,9 +1,14 @@
 """
 Gerenciador de páginas e navegação
 """
+import hashlib
+import time
 import streamlit as st
-from typing import Callable, Dict, Optional
+import streamlit.components.v1 as components
+from typing import Callable, Dict, Optional, Tuple, Union
 from enum import Enum
+from ..utils.instrumentation import instrumentation
+from ..utils.media_cache import media_cache
 
 
 class PageType(Enum):
@@ -17,6 +22,19 @@ class PageType(Enum):
 class PageManager:
     """Gerenciador de navegação entre páginas"""
     
+    # Margem para disparos do timer um pouco antes do prazo
+    TRANSITION_TOLERANCE = 0.25
+    
+    # Padrão do Streamlit para global.minCachedMessageSize: elementos a partir
+    # deste tamanho que o navegador já tem são reenviados só como referência
+    DEFAULT_MIN_CACHED_MESSAGE_SIZE = 10_000
+    
+    # rerun_requested() lê ScriptRequests._state (enum CONTINUE/STOP/RERUN),
+    # atributo privado do Streamlit conferido nas versões 1.37 a 1.50. Em
+    # outras versões a consulta fica desligada em vez de falhar em silêncio.
+    RERUN_STATE_VERSIONS = ((1, 37), (1, 50))
+    _rerun_state_checked: Optional[bool] = None
+    
     def __init__(self):
         self.pages: Dict[PageType, Callable] = {}
         self._initialize_session_state()
@@ -51,6 +69,10 @@ class PageManager:
         # Estado da proposta
         if 'proposal_answer' not in st.session_state:
             st.session_state.proposal_answer = None
+        
+        # Transições agendadas (chave -> página, prazo e ação)
+        if 'scheduled_transitions' not in st.session_state:
+            st.session_state.scheduled_transitions = {}
     
     def register_page(self, page_type: PageType, page_function: Callable):
         """
@@ -76,29 +98,235 @@ class PageManager:
         st.session_state.page = page_type.value
         st.rerun()
     
+    def schedule_transition(self, seconds: float, action: Optional[Callable[[], None]] = None,
+                            key: str = "default"):
+        """
+        Agenda uma ação para daqui a alguns segundos sem bloquear a thread
+        do script
+        
+        O prazo é verificado por um fragmento com auto-rerun
+        (st.fragment(run_every=...)), então nenhuma thread do servidor fica
+        parada esperando. Agendar de novo a mesma chave mantém o prazo
+        original, de modo que reruns completos não reiniciam a contagem.
+        A transição é descartada se a página mudar antes do prazo.
+        
+        Args:
+            seconds: Tempo de espera em segundos
+            action: Função executada no prazo, antes do rerun da aplicação
+            key: Identificador da transição
+        """
+        transitions = st.session_state.scheduled_transitions
+        current_page = st.session_state.get('page', PageType.INTRO.value)
+        
+        scheduled = transitions.get(key)
+        if scheduled is None or scheduled['page'] != current_page:
+            transitions[key] = {
+                'page': current_page,
+                'deadline': time.time() + seconds,
+                'action': action
+            }
+        
+        self._render_transition_timer(key)
+    
+    def navigate_after(self, page_type: PageType, seconds: float, with_transition: bool = True):
+        """
+        Navega para uma página após alguns segundos sem bloquear o script
+        
+        Args:
+            page_type: Tipo da página de destino
+            seconds: Tempo de espera em segundos
+            with_transition: Se deve usar transição suave
+        """
+        def navigate():
+            if with_transition:
+                st.session_state.page_transition = True
+            st.session_state.page = page_type.value
+        
+        self.schedule_transition(seconds, navigate, key=f"navigate_{page_type.value}")
+    
+    def rerun_after(self, seconds: float, key: str = "rerun"):
+        """Agenda apenas um rerun da aplicação após alguns segundos"""
+        self.schedule_transition(seconds, None, key=key)
+    
+    def _run_due_transition(self, key: str) -> bool:
+        """
+        Executa a transição se o prazo já passou
+        
+        Returns:
+            True se a transição foi executada (e a aplicação deve rodar de novo)
+        """
+        transitions = st.session_state.scheduled_transitions
+        scheduled = transitions.get(key)
+        if scheduled is None:
+            return False
+        
+        # Página mudou antes do prazo: descartar
+        if scheduled['page'] != st.session_state.get('page', PageType.INTRO.value):
+            del transitions[key]
+            return False
+        
+        if time.time() + self.TRANSITION_TOLERANCE < scheduled['deadline']:
+            return False
+        
+        del transitions[key]
+        if scheduled['action']:
+            scheduled['action']()
+        return True
+    
+    def render_fragment(self, func: Callable, *args, **kwargs):
+        """
+        Renderiza uma parte da página como fragmento
+        
+        Widgets dentro do fragmento reexecutam só a função, não o script
+        inteiro (mosaicos, músicas e demais blocos da página ficam como
+        estão).
+        
+        Args:
+            func: Função que renderiza a parte da página
+            *args: Argumentos repassados para func
+            **kwargs: Argumentos nomeados repassados para func
+        """
+        st.fragment(func)(*args, **kwargs)
+
+    @classmethod
+    def rerun_requested(cls) -> bool:
+        """
+        Indica se o navegador já pediu outra execução (ou a parada) do script
+
+        Serve para abandonar trabalho longo cujo resultado não será mais
+        exibido, como a codificação das fotos quando o usuário já saiu da
+        galeria. Deve ser chamada na thread do script; sem o contexto do
+        Streamlit ou fora das versões em RERUN_STATE_VERSIONS retorna False.
+        """
+        if not cls._rerun_state_supported():
+            return False
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is None or ctx.script_requests is None:
+            return False
+        return ctx.script_requests._state.name != 'CONTINUE'
+
+    @classmethod
+    def _rerun_state_supported(cls) -> bool:
+        """Verifica (uma vez) se a versão do Streamlit está em RERUN_STATE_VERSIONS"""
+        if cls._rerun_state_checked is None:
+            try:
+                version = tuple(int(part) for part in st.__version__.split('.')[:2])
+            except ValueError:
+                version = (0, 0)
+            oldest, newest = cls.RERUN_STATE_VERSIONS
+            cls._rerun_state_checked = oldest <= version <= newest
+            if not cls._rerun_state_checked:
+                print(f"Streamlit {st.__version__} fora de {oldest}-{newest}: "
+                      f"rerun_requested() desativado (trabalho longo não será cancelado)")
+        return cls._rerun_state_checked
+
+    def _render_transition_timer(self, key: str):
+        """Renderiza o fragmento que verifica o prazo de uma transição"""
+        scheduled = st.session_state.scheduled_transitions.get(key)
+        if scheduled is None:
+            return
+        
+        remaining = max(scheduled['deadline'] - time.time(), 0.1)
+        
+        # st.fragment(run_every=...) existe desde o Streamlit 1.37 (mínimo em requirements.txt)
+        @st.fragment(run_every=remaining)
+        def transition_timer():
+            if self._run_due_transition(key):
+                st.rerun()
+        
+        transition_timer()
+    
+    @classmethod
+    def _min_cached_message_size(cls) -> int:
+        """Tamanho mínimo (bytes) para o Streamlit reenviar um elemento como referência"""
+        try:
+            return int(st.get_option("global.minCachedMessageSize"))
+        except Exception:
+            return cls.DEFAULT_MIN_CACHED_MESSAGE_SIZE
+    
+    @staticmethod
+    def _fingerprint(html: str) -> str:
+        """Impressão digital do conteúdo de um bloco"""
+        return hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def render_block(self, key: str, content: Union[str, Callable[[], Optional[str]]],
+                     inputs: Tuple = (), height: Optional[int] = None,
+                     scrolling: bool = False) -> bool:
+        """
+        Renderiza um bloco pesado de HTML (st.markdown ou components.html)
+        sem reconstruir nem reenviar conteúdo idêntico a cada rerun
+        
+        Com uma função em content, o HTML é montado uma única vez por
+        combinação de inputs e compartilhado entre sessões (cache de mídia),
+        então reruns emitem exatamente a mesma string. Elementos idênticos a
+        partir de global.minCachedMessageSize que o navegador já recebeu são
+        enviados pelo Streamlit apenas como referência (hash), sem o conteúdo.
+        
+        Args:
+            key: Identificador do bloco (ex.: 'music.player')
+            content: HTML ou função sem argumentos que o monta
+            inputs: Valores dos quais o HTML depende (chave do cache)
+            height: Altura do iframe; None renderiza com st.markdown
+            scrolling: Barra de rolagem do iframe
+            
+        Returns:
+            True se o bloco é idêntico ao do rerun anterior da sessão
+        """
+        if callable(content):
+            cache_key = ('render_block', key) + tuple(inputs)
+            html = media_cache.get_or_compute(cache_key, content)
+            fingerprint = media_cache.get_or_compute(
+                ('render_fingerprint', key) + tuple(inputs),
+                lambda: self._fingerprint(html) if html else None
+            )
+        else:
+            html = content
+            fingerprint = self._fingerprint(html) if html else None
+        if not html:
+            return False
+        
+        memo = st.session_state.setdefault('render_memo', {})
+        page = st.session_state.get('page', PageType.INTRO.value)
+        unchanged = memo.get(key) == (page, fingerprint)
+        memo[key] = (page, fingerprint)
+        
+        with instrumentation.span(f'render.{key}', 'render') as span:
+            if height is None:
+                st.markdown(html, unsafe_allow_html=True)
+            else:
+                components.html(html, height=height, scrolling=scrolling)
+            # Bytes estimados enviados ao navegador neste rerun
+            if not unchanged or len(html) < self._min_cached_message_size():
+                span.add_bytes(html)
+        return unchanged
+    
     def get_current_page(self) -> PageType:
         """Retorna o tipo da página atual"""
         page_value = st.session_state.get('page', PageType.INTRO.value)
         return PageType(page_value)
     
     def render_current_page(self):
-        """Renderiza a página atual"""
+        """Renderiza a página atual, registrando cada fase como span"""
         current_page = self.get_current_page()
         
-        # Verificar query params para navegação externa
-        self._check_query_params()
-        
-        # Renderizar transição se necessário
-        if st.session_state.get('page_transition', False):
-            self._render_transition()
-            st.session_state.page_transition = False
-        
-        # Renderizar página
-        page_function = self.pages.get(current_page)
-        if page_function:
-            page_function()
-        else:
-            st.error(f"Página não encontrada: {current_page}")
+        with instrumentation.page(current_page.value):
+            # Verificar query params para navegação externa
+            self._check_query_params()
+            
+            # Renderizar transição se necessário
+            if st.session_state.get('page_transition', False):
+                with instrumentation.span('page.transition', 'render'):
+                    self._render_transition()
+                st.session_state.page_transition = False
+            
+            # Renderizar página
+            page_function = self.pages.get(current_page)
+            if page_function:
+                with instrumentation.span('page.render', 'render'):
+                    page_function()
+            else:
+                st.error(f"Página não encontrada: {current_page}")
     
     def _check_query_params(self):
         """Verifica parâmetros de query para navegação"""
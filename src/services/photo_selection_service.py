@@ -0,0 +1,123 @@
+"""
+Serviço de seleção de fotos para os mosaicos de fundo
+"""
+import hashlib
+import random
+import threading
+import time
+from typing import Dict, List, MutableMapping, NamedTuple, Optional, Tuple
+from ..utils.file_utils import FileManager
+
+
+class PhotoSet(NamedTuple):
+    """Conjunto de fotos exibido junto (ex.: os ladrilhos de um mosaico)"""
+    set_id: str
+    photos: Tuple[str, ...]
+
+
+class PhotoSelectionService:
+    """
+    Seleção determinística de fotos em conjuntos de rodízio pré-calculados
+
+    Para cada biblioteca (identificada por nomes, tamanhos e mtimes das
+    fotos) e quantidade de fotos por conjunto, é calculado uma única vez um
+    pool de pool_size conjuntos. Cada sessão (ou janela de tempo) recebe um
+    desses conjuntos, e o set_id permite que o conteúdo codificado de um
+    conjunto seja reaproveitado entre sessões.
+    """
+
+    POOL_SIZE = 4
+
+    # Pools por (diretório, fotos por conjunto, tamanho do pool), compartilhados
+    # pelo processo: chave -> (impressão digital da biblioteca, conjuntos)
+    _pools: Dict[Tuple[str, int, int], Tuple[str, List[PhotoSet]]] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, pictures_directory: str = "pictures", pool_size: int = POOL_SIZE):
+        self.pictures_directory = pictures_directory
+        self.pool_size = pool_size
+
+    def _library_fingerprint(self) -> Tuple[str, List[str]]:
+        """Impressão digital da biblioteca e lista de fotos, a partir do índice"""
+        entries = FileManager.get_entries(self.pictures_directory, ['image'])
+        digest = hashlib.sha1()
+        for entry in entries:
+            digest.update(f"{entry.name}:{entry.size}:{entry.mtime_ns};".encode())
+        return digest.hexdigest()[:12], [entry.path for entry in entries]
+
+    def get_pool(self, count: int) -> List[PhotoSet]:
+        """
+        Obtém os conjuntos de rodízio, calculando-os se a biblioteca mudou
+
+        As fotos são embaralhadas uma vez (semente = impressão digital) e
+        divididas em conjuntos consecutivos, então conjuntos diferentes
+        mostram fotos diferentes enquanto a biblioteca permitir.
+
+        Args:
+            count: Quantidade de fotos por conjunto
+
+        Returns:
+            Lista de até pool_size conjuntos (vazia se não houver fotos)
+        """
+        fingerprint, photos = self._library_fingerprint()
+        key = (self.pictures_directory, count, self.pool_size)
+
+        with self._pools_lock:
+            cached = self._pools.get(key)
+            if cached and cached[0] == fingerprint:
+                return cached[1]
+
+        pool: List[PhotoSet] = []
+        if photos:
+            shuffled = list(photos)
+            random.Random(fingerprint).shuffle(shuffled)
+            size = min(count, len(shuffled))
+            for index in range(self.pool_size):
+                start = index * size
+                chosen = tuple(shuffled[(start + offset) % len(shuffled)] for offset in range(size))
+                pool.append(PhotoSet(f"{fingerprint}-{count}-{index}", chosen))
+
+        with self._pools_lock:
+            self._pools[key] = (fingerprint, pool)
+        return pool
+
+    def get_set(self, count: int, index: int) -> Optional[PhotoSet]:
+        """
+        Obtém um conjunto do pool pelo índice (módulo o tamanho do pool)
+
+        Args:
+            count: Quantidade de fotos por conjunto
+            index: Índice do conjunto
+
+        Returns:
+            Conjunto de fotos ou None se não houver fotos
+        """
+        pool = self.get_pool(count)
+        if not pool:
+            return None
+        return pool[index % len(pool)]
+
+    def get_set_for_session(self, count: int, session_state: MutableMapping,
+                            bucket_seconds: Optional[float] = None) -> Optional[PhotoSet]:
+        """
+        Obtém o conjunto da sessão atual
+
+        Por padrão o conjunto é sorteado uma vez por sessão e mantido nos
+        reruns. Com bucket_seconds, todas as sessões recebem o mesmo conjunto
+        dentro de cada janela de tempo.
+
+        Args:
+            count: Quantidade de fotos por conjunto
+            session_state: Estado da sessão (st.session_state)
+            bucket_seconds: Duração da janela de rodízio por tempo
+
+        Returns:
+            Conjunto de fotos ou None se não houver fotos
+        """
+        if bucket_seconds:
+            index = int(time.time() // bucket_seconds)
+        else:
+            if 'photo_set_index' not in session_state:
+                session_state['photo_set_index'] = random.randrange(self.pool_size)
+            index = session_state['photo_set_index']
+        return self.get_set(count, index)
@@ -0,0 +1,274 @@
+"""
+Banco de perguntas do quiz, carregado de arquivos de dados
+
+Cada conjunto de perguntas fica em src/services/quizzes/<conjunto>.<idioma>.json
+(ex.: principal.pt-BR.json) com título, perguntas e as mensagens de
+acerto, erro e desempenho. Os arquivos são lidos e validados uma única vez,
+na importação; os conjuntos são imutáveis e a busca de pergunta por chave
+é O(1).
+
+Para trocar o conjunto ou o idioma sem mudar o código:
+    APP_QUIZ_SET=alternativo APP_QUIZ_LANGUAGE=pt-BR
+
+Para validar os arquivos (sai com código 1 se houver erros):
+    python -m src.services.quiz_bank --check
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+from ..models import Question
+
+
+QUIZZES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quizzes")
+
+DEFAULT_SET = "principal"
+DEFAULT_LANGUAGE = "pt-BR"
+
+# Marcador da resposta certa nas mensagens de erro
+ANSWER_PLACEHOLDER = "{answer}"
+
+
+class PerformanceTier(NamedTuple):
+    """Mensagem do resultado a partir de um percentual de acertos"""
+    min_percentage: float
+    emoji: str
+    message: str
+
+
+class QuizSet(NamedTuple):
+    """Conjunto de perguntas em um idioma, com as mensagens do quiz"""
+    set_id: str
+    language: str
+    title: str
+    questions: Tuple[Question, ...]
+    success_messages: Tuple[str, ...]
+    error_messages: Tuple[str, ...]
+    special_message: str
+    performance: Tuple[PerformanceTier, ...]   # do maior percentual para o menor
+    index: Mapping[str, Question]              # chave -> pergunta
+
+    def question(self, key: str) -> Optional[Question]:
+        """Busca uma pergunta pela chave"""
+        return self.index.get(key)
+
+    @property
+    def scored_questions(self) -> Tuple[Question, ...]:
+        """Perguntas que contam para o resultado"""
+        return tuple(q for q in self.questions if q.is_scored)
+
+    def success_message(self) -> str:
+        """Mensagem aleatória de acerto"""
+        return random.choice(self.success_messages)
+
+    def error_message(self, correct_answer: str) -> str:
+        """Mensagem aleatória de erro com a resposta correta"""
+        return random.choice(self.error_messages).replace(ANSWER_PLACEHOLDER, correct_answer)
+
+    def performance_for(self, percentage: float) -> PerformanceTier:
+        """Faixa de desempenho de um percentual de acertos"""
+        for tier in self.performance:
+            if percentage >= tier.min_percentage:
+                return tier
+        return self.performance[-1]
+
+
+def _require(condition: bool, message: str, errors: List[str]):
+    """Acumula a mensagem se a condição não for atendida"""
+    if not condition:
+        errors.append(message)
+
+
+def _is_text(value) -> bool:
+    """Indica se o valor é um texto não vazio"""
+    return isinstance(value, str) and bool(value.strip())
+
+
+def parse_quiz_set(set_id: str, language: str, data: Dict) -> QuizSet:
+    """
+    Valida os dados de um arquivo e monta o conjunto imutável
+
+    Args:
+        set_id: Identificador do conjunto
+        language: Idioma (ex.: 'pt-BR')
+        data: Conteúdo do arquivo JSON
+
+    Returns:
+        Conjunto de perguntas
+
+    Raises:
+        ValueError: Com todos os problemas encontrados no arquivo
+    """
+    errors: List[str] = []
+    if not isinstance(data, dict):
+        raise ValueError("o arquivo deve conter um objeto JSON")
+
+    raw_questions = data.get("questions")
+    _require(isinstance(raw_questions, list) and bool(raw_questions), "'questions' deve ser uma lista não vazia", errors)
+    messages = data.get("messages")
+    _require(isinstance(messages, dict), "'messages' deve ser um objeto", errors)
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    questions = []
+    seen_keys = set()
+    for position, raw in enumerate(raw_questions, 1):
+        where = f"pergunta {position}"
+        if not isinstance(raw, dict):
+            errors.append(f"{where}: deve ser um objeto")
+            continue
+        key = raw.get("key")
+        options = raw.get("options")
+        correct = raw.get("correct")
+        _require(_is_text(key), f"{where}: 'key' obrigatória", errors)
+        if _is_text(key):
+            _require(key not in seen_keys, f"{where}: chave repetida '{key}'", errors)
+            seen_keys.add(key)
+        _require(_is_text(raw.get("question")), f"{where}: 'question' obrigatória", errors)
+        valid_options = (isinstance(options, list) and len(options) >= 2
+                         and all(_is_text(option) for option in options))
+        _require(valid_options, f"{where}: 'options' deve ter ao menos 2 textos", errors)
+        valid_correct = isinstance(correct, int) and not isinstance(correct, bool)
+        if valid_correct and valid_options:
+            valid_correct = correct == -1 or 0 <= correct < len(options)
+        _require(valid_correct, f"{where}: 'correct' fora das opções ({correct!r})", errors)
+        if valid_options and valid_correct:
+            questions.append(Question(position, key, raw["question"], tuple(options), correct))
+
+    success = messages.get("success")
+    error = messages.get("error")
+    special = messages.get("special", "")
+    raw_tiers = messages.get("performance")
+    _require(isinstance(success, list) and bool(success) and all(_is_text(m) for m in success),
+             "'messages.success' deve ser uma lista de textos", errors)
+    _require(isinstance(error, list) and bool(error)
+             and all(_is_text(m) and ANSWER_PLACEHOLDER in m for m in error),
+             f"'messages.error' deve ser uma lista de textos com {ANSWER_PLACEHOLDER}", errors)
+    if any(not q.is_scored for q in questions):
+        _require(_is_text(special), "'messages.special' obrigatória para perguntas com correct -1", errors)
+
+    tiers = []
+    if isinstance(raw_tiers, list):
+        for raw in raw_tiers:
+            try:
+                tiers.append(PerformanceTier(float(raw["min_percentage"]), str(raw["emoji"]), str(raw["message"])))
+            except (KeyError, TypeError, ValueError):
+                errors.append(f"'messages.performance': faixa inválida {raw!r}")
+    tiers.sort(key=lambda tier: tier.min_percentage, reverse=True)
+    _require(bool(tiers) and tiers[-1].min_percentage <= 0,
+             "'messages.performance' deve ter uma faixa com min_percentage 0", errors)
+
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    return QuizSet(
+        set_id=set_id,
+        language=language,
+        title=str(data.get("title", "")),
+        questions=tuple(questions),
+        success_messages=tuple(success),
+        error_messages=tuple(error),
+        special_message=special,
+        performance=tuple(tiers),
+        index=MappingProxyType({q.key: q for q in questions}),
+    )
+
+
+class QuizBank:
+    """Carrega e valida todos os conjuntos de perguntas de um diretório"""
+
+    def __init__(self, directory: str = QUIZZES_DIRECTORY):
+        self.directory = directory
+        self._sets: Dict[Tuple[str, str], QuizSet] = {}
+        self.errors: Dict[str, str] = {}
+        self.load()
+
+    def load(self):
+        """(Re)carrega os arquivos .json do diretório"""
+        sets = {}
+        errors = {}
+        try:
+            file_names = sorted(os.listdir(self.directory))
+        except OSError as e:
+            print(f"Erro ao carregar quizzes de {self.directory}: {e}")
+            file_names = []
+
+        for file_name in file_names:
+            name, ext = os.path.splitext(file_name)
+            if ext.lower() != ".json":
+                continue
+            set_id, _, language = name.partition(".")
+            try:
+                with open(os.path.join(self.directory, file_name), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                sets[(set_id, language or DEFAULT_LANGUAGE)] = parse_quiz_set(
+                    set_id, language or DEFAULT_LANGUAGE, data)
+            except (OSError, ValueError) as e:
+                # Um arquivo inválido não derruba os demais conjuntos
+                errors[file_name] = str(e)
+                print(f"Erro ao carregar quiz {file_name}: {e}")
+
+        self._sets = sets
+        self.errors = errors
+
+    def sets(self) -> List[Tuple[str, str]]:
+        """Conjuntos disponíveis como (conjunto, idioma)"""
+        return sorted(self._sets)
+
+    def languages(self, set_id: str) -> List[str]:
+        """Idiomas disponíveis de um conjunto"""
+        return sorted(language for sid, language in self._sets if sid == set_id)
+
+    def get(self, set_id: Optional[str] = None, language: Optional[str] = None) -> QuizSet:
+        """
+        Obtém um conjunto de perguntas
+
+        Sem o idioma pedido, usa o idioma padrão do conjunto (ou o primeiro
+        disponível).
+
+        Args:
+            set_id: Conjunto (padrão: APP_QUIZ_SET ou 'principal')
+            language: Idioma (padrão: APP_QUIZ_LANGUAGE ou 'pt-BR')
+
+        Returns:
+            Conjunto de perguntas
+
+        Raises:
+            KeyError: Se o conjunto não existir
+        """
+        set_id = set_id or os.environ.get("APP_QUIZ_SET", DEFAULT_SET)
+        language = language or os.environ.get("APP_QUIZ_LANGUAGE", DEFAULT_LANGUAGE)
+
+        quiz_set = self._sets.get((set_id, language)) or self._sets.get((set_id, DEFAULT_LANGUAGE))
+        if quiz_set is None:
+            languages = self.languages(set_id)
+            if not languages:
+                raise KeyError(f"Conjunto de perguntas não encontrado: {set_id}")
+            quiz_set = self._sets[(set_id, languages[0])]
+        return quiz_set
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Conjuntos de perguntas do quiz")
+    parser.add_argument("--check", action="store_true", help="Sai com código 1 se algum arquivo for inválido")
+    parser.add_argument("--directory", default=QUIZZES_DIRECTORY, help="Diretório dos arquivos")
+    args = parser.parse_args(argv)
+
+    bank = quiz_bank if args.directory == QUIZZES_DIRECTORY else QuizBank(args.directory)
+    for set_id, language in bank.sets():
+        quiz_set = bank.get(set_id, language)
+        print(f"{set_id} ({language}): {len(quiz_set.questions)} perguntas, {len(quiz_set.scored_questions)} valendo pontos")
+    if args.check and bank.errors:
+        sys.exit(1)
+
+
+# Instância única, carregada e validada na importação
+quiz_bank = QuizBank()
+
+
+if __name__ == "__main__":
+    main()
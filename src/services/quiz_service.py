@@ -1,164 +1,237 @@
 """
 Serviço de gerenciamento do quiz
 """
-from typing import Dict, List, Tuple
-import random
+from enum import Enum
+from typing import Dict, MutableMapping, NamedTuple, Optional, Sequence, Tuple
+from ..models import Question, QuizResult
+from ..utils.instrumentation import instrumentation
+from .quiz_bank import QuizSet, quiz_bank
+
+
+class QuizState(Enum):
+    """Estados do quiz"""
+    QUESTION = "question"
+    FEEDBACK = "feedback"
+    RESULT = "result"
+
+
+class Feedback(NamedTuple):
+    """Resposta ao usuário depois de uma pergunta"""
+    message: str
+    kind: str        # 'success', 'error' ou 'special'
+    question: int    # índice da pergunta respondida
 
 
 class QuizService:
-    """Serviço para gerenciar lógica do quiz"""
+    """
+    Serviço para gerenciar lógica do quiz
+    
+    Uma instância ligada ao estado da sessão funciona como máquina de
+    estados: pergunta -> feedback -> próxima pergunta (ou resultado). O estado
+    fica nas mesmas chaves de sessão inicializadas pelo PageManager
+    (quiz_current_question, quiz_answers, quiz_show_result, show_popup,
+    popup_message, popup_type).
+    
+    Perguntas e mensagens vêm de um conjunto do banco de perguntas
+    (src/services/quizzes/); sem conjunto, o padrão de quiz_bank.get().
+    """
+    
+    # Tempo que o feedback fica na tela antes de sumir (animação no navegador)
+    FEEDBACK_SECONDS = 2
+    
+    def __init__(self, quiz_set: Optional[QuizSet] = None,
+                 session_state: Optional[MutableMapping] = None):
+        self.quiz_set = quiz_set if quiz_set is not None else quiz_bank.get()
+        self.questions = self.quiz_set.questions
+        self.session_state = session_state if session_state is not None else {}
+        self._ensure_state()
+    
+    def _ensure_state(self):
+        """Cria as chaves de sessão que ainda não existem"""
+        defaults = {
+            'quiz_current_question': 0,
+            'quiz_answers': {},
+            'quiz_show_result': False,
+            'show_popup': False,
+            'popup_message': "",
+            'popup_type': "success",
+        }
+        for key, value in defaults.items():
+            if key not in self.session_state:
+                self.session_state[key] = value
+    
+    @property
+    def state(self) -> QuizState:
+        """Estado atual da máquina"""
+        if self.session_state['show_popup']:
+            return QuizState.FEEDBACK
+        if self.session_state['quiz_show_result']:
+            return QuizState.RESULT
+        return QuizState.QUESTION
+    
+    @property
+    def current_index(self) -> int:
+        """Índice da pergunta atual"""
+        return min(self.session_state['quiz_current_question'], len(self.questions) - 1)
+    
+    @property
+    def current_question(self) -> Question:
+        """Pergunta atual"""
+        return self.questions[self.current_index]
+    
+    @property
+    def total(self) -> int:
+        """Quantidade de perguntas"""
+        return len(self.questions)
+    
+    @property
+    def is_last_question(self) -> bool:
+        """Indica se a pergunta atual é a última"""
+        return self.current_index >= len(self.questions) - 1
+    
+    @property
+    def answers(self) -> Dict[str, int]:
+        """Respostas dadas até agora (chave da pergunta -> opção)"""
+        return self.session_state['quiz_answers']
+    
+    def answer(self, choice: int) -> bool:
+        """
+        Registra a resposta da pergunta atual e passa para o feedback
+        
+        Args:
+            choice: Índice da opção escolhida
+            
+        Returns:
+            True se a transição pergunta -> feedback ocorreu
+        """
+        if self.state != QuizState.QUESTION:
+            return False
+        
+        question = self.current_question
+        self.answers[question.key] = choice
+        message, kind = self.feedback_for(question, choice)
+        self.session_state['popup_message'] = message
+        self.session_state['popup_type'] = kind
+        self.session_state['show_popup'] = True
+        return True
+    
+    def advance(self) -> bool:
+        """
+        Sai do feedback para a próxima pergunta ou para o resultado
+        
+        Returns:
+            True se a transição ocorreu
+        """
+        if self.state != QuizState.FEEDBACK:
+            return False
+        
+        self.session_state['show_popup'] = False
+        if self.is_last_question:
+            self.session_state['quiz_show_result'] = True
+        else:
+            self.session_state['quiz_current_question'] = self.current_index + 1
+        return True
+    
+    def consume_feedback(self) -> Optional[Feedback]:
+        """
+        Retorna o feedback pendente e avança a máquina
+        
+        O feedback é exibido sobre a tela seguinte (e some sozinho no
+        navegador), então não é preciso um rerun só para avançar.
+        
+        Returns:
+            Feedback pendente ou None se não houver
+        """
+        if self.state != QuizState.FEEDBACK:
+            return None
+        feedback = Feedback(self.session_state['popup_message'], self.session_state['popup_type'],
+                            self.current_index)
+        self.advance()
+        return feedback
+    
+    def reset(self):
+        """Volta para a primeira pergunta, sem respostas"""
+        self.session_state['quiz_current_question'] = 0
+        self.session_state['quiz_answers'] = {}
+        self.session_state['quiz_show_result'] = False
+        self.session_state['show_popup'] = False
+        self.session_state['popup_message'] = ""
+        self.session_state['popup_type'] = "success"
+    
+    def result(self) -> QuizResult:
+        """Estatísticas das respostas (veja calculate_statistics)"""
+        return self.calculate_statistics(self.answers, self.questions, self.quiz_set)
+    
+    def feedback_for(self, question: Question, choice: int) -> Tuple[str, str]:
+        """
+        Mensagem e tipo do feedback de uma resposta
+        
+        Args:
+            question: Pergunta respondida
+            choice: Índice da opção escolhida
+            
+        Returns:
+            Tupla (mensagem, tipo)
+        """
+        if not question.is_scored:
+            return self.quiz_set.special_message, "special"
+        if choice == question.correct:
+            return self.quiz_set.success_message(), "success"
+        return self.quiz_set.error_message(question.correct_option), "error"
     
     @staticmethod
-    def get_questions() -> List[Dict]:
-        """Retorna lista de perguntas do quiz"""
-        return [
-            {
-                'num': 1,
-                'question': 'Onde nos conhecemos?',
-                'options': ['Tinder', 'Instagram', 'Badoo', 'Amigos em comum'],
-                'correct': 0,
-                'key': 'q1'
-            },
-            {
-                'num': 2,
-                'question': 'Qual foi nosso primeiro encontro?',
-                'options': ['Cinema', 'Restaurante', 'Parque', 'Shopping'],
-                'correct': 1,
-                'key': 'q2'
-            },
-            {
-                'num': 3,
-                'question': 'Qual foi o apelido carinhoso que te dei primeiro?',
-                'options': ['Meu amor', 'Bebê', 'Linda', 'Princesa'],
-                'correct': 1,
-                'key': 'q3'
-            },
-            {
-                'num': 4,
-                'question': 'Qual é a nossa música?',
-                'options': ['Ed Sheeran - Perfect', 'John Legend - All of Me', 
-                           'Bruno Mars - Just The Way You Are', 'Alceu Valença - La Belle de Jour'],
-                'correct': 3,
-                'key': 'q4'
-            },
-            {
-                'num': 5,
-                'question': 'Qual foi nossa primeira viagem juntos?',
-                'options': ['Praia', 'Montanha', 'Campo', 'Cidade histórica'],
-                'correct': 0,
-                'key': 'q5'
-            },
-            {
-                'num': 6,
-                'question': 'O que eu mais admiro em você?',
-                'options': ['Inteligência', 'Carinho', 'Determinação', 'Todas as anteriores'],
-                'correct': 3,
-                'key': 'q6'
-            },
-            {
-                'num': 7,
-                'question': 'Qual o motivo da nossa primeira briga?',
-                'options': ['Stella', 'Sorvete', 'Viagem', 'Sol quente'],
-                'correct': 0,
-                'key': 'q7'
-            },
-            {
-                'num': 8,
-                'question': 'O que eu gosto mais em você?',
-                'options': ['Cabeça e Topete', 'Sorriso e Sinal no canto da boca', 
-                           'Olhar e bico', 'Quando fica manhosa', 'Todas as respostas anteriores'],
-                'correct': 4,
-                'key': 'q8'
-            },
-            {
-                'num': 9,
-                'question': 'Qual comida eu não costumava comer muito e passei a comer mais depois que te conheci?',
-                'options': ['Sushi', 'Kebbab', 'Pizza', 'Hamburguer'],
-                'correct': 1,
-                'key': 'q9'
-            },
-            {
-                'num': 10,
-                'question': 'Qual foi o primeiro presente que te dei?',
-                'options': ['Squeeze', 'Bolsa', 'Viagem', 'Calça', 'Perfume'],
-                'correct': -1,  # Resposta especial
-                'key': 'q10'
-            }
-        ]
+    def get_questions(set_id: Optional[str] = None, language: Optional[str] = None) -> Tuple[Question, ...]:
+        """Retorna as perguntas de um conjunto (já carregadas na importação)"""
+        return quiz_bank.get(set_id, language).questions
     
     @staticmethod
     def get_success_message() -> str:
         """Retorna mensagem aleatória de acerto"""
-        messages = [
-            "✅ Ai sim bebê,<br>você é o amor da<br>minha vida ❤️",
-            "💕 Acertou meu amor!<br>Você me conhece<br>tão bem! 💕",
-            "🌟 Isso aí bebê!<br>Você é demais! 🌟",
-            "💖 Perfeito!<br>Meu coração é seu! 💖",
-            "✨ Maravilhosa!<br>Como sempre! ✨",
-            "❤️ Acertou meu bem!<br>Te amo demais! ❤️"
-        ]
-        return random.choice(messages)
+        return quiz_bank.get().success_message()
     
     @staticmethod
     def get_error_message(correct_answer: str) -> str:
         """Retorna mensagem aleatória de erro com a resposta correta"""
-        messages = [
-            f"❌ Ops bebê!<br>A resposta certa é:<br><b>{correct_answer}</b>",
-            f"💔 Errou meu amor!<br>Mas tudo bem...<br>Era: <b>{correct_answer}</b>",
-            f"😅 Quase lá bebê!<br>A correta era:<br><b>{correct_answer}</b>",
-            f"🤔 Não foi dessa vez!<br>A certa é:<br><b>{correct_answer}</b>"
-        ]
-        return random.choice(messages)
+        return quiz_bank.get().error_message(correct_answer)
     
     @staticmethod
-    def calculate_statistics(answers: Dict[str, int], questions: List[Dict]) -> Dict:
+    @instrumentation.timed('quiz.statistics', 'quiz')
+    def calculate_statistics(answers: Dict[str, int], questions: Sequence[Question],
+                             quiz_set: Optional[QuizSet] = None) -> QuizResult:
         """
         Calcula estatísticas do quiz
         
         Args:
             answers: Dicionário de respostas do usuário
             questions: Lista de perguntas
+            quiz_set: Conjunto com as faixas de desempenho (padrão: quiz_bank.get())
             
         Returns:
-            Dicionário com estatísticas
+            Estatísticas (QuizResult também aceita acesso como dicionário)
         """
         correct_count = 0
         wrong_questions = []
         
-        for q in questions[:9]:  # Excluir pergunta 10
-            if answers.get(q['key']) == q['correct']:
+        scored = [q for q in questions if q.is_scored]  # Excluir perguntas especiais
+        for q in scored:
+            if answers.get(q.key) == q.correct:
                 correct_count += 1
             else:
-                wrong_questions.append(q['num'])
+                wrong_questions.append(q.num)
         
-        total = 9
-        percentage = (correct_count / total) * 100
+        total = len(scored)
+        percentage = (correct_count / total) * 100 if total else 0.0
         wrong_count = total - correct_count
         
         # Mensagem personalizada baseada na performance
-        if percentage == 100:
-            performance_msg = "PERFEIÇÃO ABSOLUTA! 🏆<br>Você me conhece melhor<br>que eu mesma! 💖"
-            emoji = "🌟"
-        elif percentage >= 80:
-            performance_msg = "INCRÍVEL! 🎉<br>Você realmente presta<br>atenção em tudo! 💕"
-            emoji = "⭐"
-        elif percentage >= 60:
-            performance_msg = "MUITO BOM! 😊<br>Você me conhece<br>bastante! ❤️"
-            emoji = "💫"
-        elif percentage >= 40:
-            performance_msg = "BOM COMEÇO! 😅<br>Mas ainda tem<br>muito pra aprender! 💗"
-            emoji = "✨"
-        else:
-            performance_msg = "VAMOS ESTUDAR<br>MAIS BEBÊ! 📚<br>Ainda temos tempo! 💝"
-            emoji = "💕"
+        tier = (quiz_set or quiz_bank.get()).performance_for(percentage)
         
-        return {
-            'correct_count': correct_count,
-            'wrong_count': wrong_count,
-            'total': total,
-            'percentage': percentage,
-            'performance_msg': performance_msg,
-            'emoji': emoji,
-            'wrong_questions': wrong_questions
-        }
-
+        return QuizResult(
+            correct_count=correct_count,
+            wrong_count=wrong_count,
+            total=total,
+            percentage=percentage,
+            performance_msg=tier.message,
+            emoji=tier.emoji,
+            wrong_questions=wrong_questions
+        )
@@ -0,0 +1,297 @@
+"""
+Pré-aquecimento dos caches de mídia (fotos, mosaicos, vídeos e músicas)
+
+Os caches ficam na memória do processo, então o aquecimento que vale para os
+visitantes é o do processo do servidor: src/server.py o inicia junto com o
+servidor e cria o marcador de prontidão usado pelo HEALTHCHECK.
+
+Uso pela linha de comando (gera os derivados e publica os arquivos estáticos
+no disco, por exemplo no build; os caches em memória morrem com o processo):
+    python -m src.services.warmup_service
+
+O aquecimento em segundo plano ao importar o app pode ser desligado com
+APP_WARMUP=0.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+from ..utils import media_route
+from ..utils.derivatives import RENDITIONS
+from ..utils.file_utils import FileManager, ImageProcessor
+from ..utils.instrumentation import instrumentation
+from .gallery_service import GalleryService
+from .music_service import MusicService
+from .photo_selection_service import PhotoSelectionService
+
+
+class WarmupService:
+    """
+    Percorre o índice de arquivos e preenche os caches em um pool de threads
+
+    O aquecimento roda uma única vez por processo (start() é idempotente) e
+    em segundo plano, então não atrasa o primeiro render.
+    """
+
+    # Layouts dos mosaicos: app.py (12 fotos, 4x3) e app_modular.py (16 fotos, 4x4)
+    MOSAIC_LAYOUTS = ((12, 4, 3, (400, 300)), (16, 4, 4, (400, 225)))
+    IMAGE_RENDITIONS = ('proposal', 'gallery')
+    PAGES = ('intro', 'gallery', 'quiz', 'proposal')
+
+    # Sem arquivos estáticos cada foto vira base64 em memória: limitar às
+    # primeiras da galeria (as mesmas que app.py envia nesse modo)
+    INLINE_GALLERY_LIMIT = 50
+
+    _progress = {'started': False, 'total': 0, 'done': 0, 'failed': 0,
+                 'started_at': None, 'finished_at': None}
+    _progress_lock = threading.Lock()
+
+    def __init__(self, pictures_directory: str = "pictures", music_directory: str = "music",
+                 workers: Optional[int] = None, marker_path: Optional[str] = None):
+        self.pictures_directory = pictures_directory
+        self.music_directory = music_directory
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.marker_path = marker_path
+        self.music_service = MusicService(music_directory)
+        self.photo_selection = PhotoSelectionService(pictures_directory)
+        self.gallery_service = GalleryService(pictures_directory)
+
+    def plan(self) -> List[Tuple[str, Callable]]:
+        """
+        Lista as tarefas de aquecimento, das mais urgentes para as demais:
+        músicas e mosaicos (intro e quiz), foto do pedido, a galeria na ordem
+        dos slides e os vídeos
+
+        Returns:
+            Lista de (nome da tarefa, função sem argumentos)
+        """
+        tasks: List[Tuple[str, Callable]] = []
+
+        tracks = {self.music_service.get_music_file_for_page(page) for page in self.PAGES}
+        tracks.add(self.music_service.get_default_music_file())
+        for track in sorted(t for t in tracks if t):
+            tasks.append((f"music:{os.path.basename(track)}",
+                          partial(self.music_service.get_track_src, track)))
+
+        for count, columns, rows, tile_size in self.MOSAIC_LAYOUTS:
+            for photo_set in self.photo_selection.get_pool(count):
+                tasks.append((f"mosaic:{photo_set.set_id}",
+                              partial(ImageProcessor.get_mosaic_src, list(photo_set.photos),
+                                      photo_set.set_id, columns, rows, tile_size)))
+
+        entries = FileManager.get_entries(self.pictures_directory, ['image'])
+        if not FileManager.is_static_serving_enabled():
+            entries = entries[:self.INLINE_GALLERY_LIMIT]
+        for rendition in self.IMAGE_RENDITIONS:
+            for entry in entries:
+                if RENDITIONS[rendition].applies_to(entry.name):
+                    tasks.append((f"{rendition}:{entry.name}",
+                                  partial(ImageProcessor.get_rendition_src, entry.path, rendition)))
+
+        # Vídeos: publicação (cópia faststart se preciso) e poster; sem URL
+        # (servidor sem a rota de mídia) só o poster: o data URI do vídeo é
+        # codificado e memoizado quando ele entra na janela da galeria
+        for entry in FileManager.get_entries(self.pictures_directory, ['video']):
+            if FileManager.is_static_serving_enabled() and FileManager.server_serves(entry.suffix, entry.size):
+                task = partial(FileManager.get_media_item, entry.path)
+            else:
+                task = partial(ImageProcessor.get_video_poster, entry.path)
+            tasks.append((f"video:{entry.name}", task))
+
+        # Páginas do manifesto da galeria (slides buscados sob demanda)
+        if FileManager.is_static_serving_enabled():
+            tasks.append(("gallery:pages", self.gallery_service.build_pages))
+
+        return tasks
+
+    @classmethod
+    def progress(cls) -> Dict:
+        """
+        Estado do aquecimento no processo
+
+        Returns:
+            Dicionário com total, done, failed, ready e elapsed (segundos)
+        """
+        with cls._progress_lock:
+            state = dict(cls._progress)
+        end = state['finished_at'] or time.monotonic()
+        state['elapsed'] = end - state['started_at'] if state['started_at'] else 0.0
+        state['ready'] = state['finished_at'] is not None
+        return state
+
+    @classmethod
+    def _claim(cls) -> bool:
+        """Marca o aquecimento como iniciado; False se já foi iniciado"""
+        with cls._progress_lock:
+            if cls._progress['started']:
+                return False
+            cls._progress.update(started=True, started_at=time.monotonic())
+            return True
+
+    def start(self) -> bool:
+        """
+        Inicia o aquecimento em uma thread de fundo (uma vez por processo)
+
+        Returns:
+            True se o aquecimento foi iniciado agora
+        """
+        if os.environ.get("APP_WARMUP", "1") == "0" or not self._claim():
+            return False
+        thread = threading.Thread(target=self._run_claimed, name="warmup", daemon=True)
+        thread.start()
+        return True
+
+    def start_with_server(self, build_derivatives: bool = True, timeout: float = 120.0) -> bool:
+        """
+        Inicia o aquecimento em segundo plano no processo do servidor, antes
+        da primeira visita
+
+        Os derivados são gerados em um processo separado (ficam no disco);
+        as tarefas esperam o servidor do Streamlit existir, quando a
+        configuração (server.enableStaticServing) já foi carregada. O
+        marcador (marker_path) só é criado no fim, com os caches deste
+        processo quentes.
+
+        Args:
+            build_derivatives: Gera os derivados antes das tarefas
+            timeout: Espera máxima (segundos) pelo servidor
+
+        Returns:
+            True se o aquecimento foi iniciado agora
+        """
+        if os.environ.get("APP_WARMUP", "1") == "0":
+            # Sem aquecimento não há o que esperar
+            if self.marker_path:
+                self._write_marker(self.progress())
+            return False
+        if not self._claim():
+            return False
+        thread = threading.Thread(target=self._run_with_server, args=(build_derivatives, timeout),
+                                  name="warmup", daemon=True)
+        thread.start()
+        return True
+
+    def _run_with_server(self, build_derivatives: bool, timeout: float):
+        """Gera os derivados, espera o servidor e executa as tarefas"""
+        if build_derivatives:
+            command = [sys.executable, "-m", "src.utils.derivatives", "--pictures", self.pictures_directory]
+            try:
+                subprocess.run(command, check=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"Erro ao gerar derivados: {e}")
+
+        deadline = time.monotonic() + timeout
+        try:
+            from streamlit.runtime import Runtime
+            while not Runtime.exists() and time.monotonic() < deadline:
+                time.sleep(0.1)
+        except ImportError as e:
+            print(f"Erro ao esperar o servidor: {e}")
+        # As URLs publicadas dependem da rota de mídia, registrada quando o
+        # servidor cria o app do tornado (depois do Runtime)
+        if media_route.is_installed() and not media_route.wait(max(0.0, deadline - time.monotonic())):
+            print("⚠️ Rota de mídia não registrada; aquecendo com app/static")
+        self._run_claimed()
+
+    def run(self, report_every: float = 0.1) -> Dict:
+        """
+        Executa o aquecimento na thread atual, esperando terminar
+
+        Args:
+            report_every: Fração do total entre mensagens de progresso
+
+        Returns:
+            Estado final (veja progress())
+        """
+        if not self._claim():
+            return self.progress()
+        return self._run_claimed(report_every)
+
+    def _run_claimed(self, report_every: float = 0.1) -> Dict:
+        """Executa as tarefas no pool, atualizando o progresso"""
+        try:
+            tasks = self.plan()
+        except Exception as e:
+            print(f"Erro ao planejar aquecimento: {e}")
+            tasks = []
+
+        with self._progress_lock:
+            self._progress['total'] = len(tasks)
+        print(f"🔥 Aquecendo {len(tasks)} itens com {self.workers} threads")
+
+        step = max(1, int(len(tasks) * report_every))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warmup") as executor:
+            futures = {executor.submit(self._run_task, name, task): name for name, task in tasks}
+            for completed, future in enumerate(as_completed(futures), 1):
+                ok = future.result()
+                with self._progress_lock:
+                    self._progress['done'] += 1
+                    if not ok:
+                        self._progress['failed'] += 1
+                if completed % step == 0 or completed == len(tasks):
+                    print(f"🔥 Aquecimento: {completed}/{len(tasks)}")
+
+        with self._progress_lock:
+            self._progress['finished_at'] = time.monotonic()
+        state = self.progress()
+        print(f"✅ Aquecimento concluído em {state['elapsed']:.1f}s ({state['failed']} falhas)")
+
+        if self.marker_path:
+            self._write_marker(state)
+        return state
+
+    @staticmethod
+    def _run_task(name: str, task: Callable) -> bool:
+        """Executa uma tarefa; uma falha não interrompe as demais"""
+        try:
+            with instrumentation.span('warmup.task', 'warmup') as span:
+                result = task()
+                span.add_bytes(result)
+            return result is not None
+        except Exception as e:
+            print(f"Erro ao aquecer {name}: {e}")
+            return False
+
+    def _write_marker(self, state: Dict):
+        """Cria o marcador de prontidão consultado pelo HEALTHCHECK"""
+        try:
+            marker_dir = os.path.dirname(self.marker_path)
+            if marker_dir:
+                os.makedirs(marker_dir, exist_ok=True)
+            with open(self.marker_path, "w", encoding="utf-8") as marker:
+                marker.write(f"{state['done']} {state['failed']} {state['elapsed']:.1f}\n")
+        except OSError as e:
+            print(f"Erro ao criar marcador de aquecimento: {e}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Pré-aquece derivados e arquivos estáticos")
+    parser.add_argument("--pictures", default="pictures", help="Diretório das fotos")
+    parser.add_argument("--music", default="music", help="Diretório das músicas")
+    parser.add_argument("--workers", type=int, default=None, help="Número de threads")
+    parser.add_argument("--skip-derivatives", action="store_true", help="Não gera os derivados")
+    args = parser.parse_args(argv)
+
+    # Fora do servidor a opção não vem da linha de comando do streamlit: o
+    # aquecimento pela CLI serve para publicar os arquivos em static/
+    try:
+        from streamlit import config
+        config.set_option("server.enableStaticServing", True, "command-line argument or environment variable")
+    except Exception as e:
+        print(f"Erro ao ativar arquivos estáticos: {e}")
+
+    if not args.skip_derivatives:
+        manifest = ImageProcessor.build_derivatives(args.pictures, workers=args.workers)
+        print(f"✅ Derivados de {len(manifest)} imagens prontos")
+
+    WarmupService(args.pictures, args.music, args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
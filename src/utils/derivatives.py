@@ -0,0 +1,660 @@
+"""
+Armazenamento de derivados pré-gerados das fotos (miniaturas e previews)
+
+Uso pela linha de comando:
+    python -m src.utils.derivatives --pictures pictures --output derivatives
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageOps, features
+
+
+# Filtros de reamostragem disponíveis para as versões
+RESAMPLING_FILTERS = {
+    'lanczos': Image.Resampling.LANCZOS,
+    'bicubic': Image.Resampling.BICUBIC,
+    'bilinear': Image.Resampling.BILINEAR,
+    'box': Image.Resampling.BOX,
+    'nearest': Image.Resampling.NEAREST,
+}
+
+
+class ImageFormat(NamedTuple):
+    """Formato de codificação das versões"""
+    name: str
+    mime: str
+    extension: str
+    pillow_format: str
+    quality_delta: int = 0                  # ajuste sobre a qualidade JPEG da versão
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+
+# JPEG é sempre gerado (fallback); os demais são alternativas menores que o
+# navegador escolhe quando suporta. As qualidades de WebP e AVIF ficam abaixo
+# da JPEG porque as escalas não são equivalentes (AVIF 60 ~ JPEG 85).
+IMAGE_FORMATS: Dict[str, ImageFormat] = {
+    'jpeg': ImageFormat('jpeg', 'image/jpeg', '.jpg', 'JPEG', 0, (('optimize', True),)),
+    'webp': ImageFormat('webp', 'image/webp', '.webp', 'WEBP', -5, (('method', 4),)),
+    'avif': ImageFormat('avif', 'image/avif', '.avif', 'AVIF', -25, (('speed', 8),)),
+}
+
+# Alternativas ao JPEG, da mais compacta para a menos
+MODERN_FORMATS = ('avif', 'webp')
+
+
+@lru_cache(maxsize=1)
+def supported_formats() -> Tuple[str, ...]:
+    """Formatos que o Pillow instalado consegue codificar"""
+    supported = []
+    for name in IMAGE_FORMATS:
+        try:
+            if name == 'jpeg' or features.check(name):
+                supported.append(name)
+        except ValueError:
+            # Pillow sem o recurso (ex.: 'avif' antes da versão 11.2)
+            pass
+    return tuple(supported)
+
+
+# Degraus a partir desta fração da largura original quase não reduzem os
+# pixels e, com o filtro de nitidez do lanczos, podem até ficar maiores
+LADDER_MAX_FRACTION = 0.8
+
+
+class Rendition(NamedTuple):
+    """Definição de uma versão redimensionada de imagem"""
+    name: str
+    max_width: int
+    quality: int = 85
+    only: Tuple[str, ...] = ()
+    resample: str = 'lanczos'
+    formats: Tuple[str, ...] = MODERN_FORMATS   # alternativas geradas além do JPEG
+    widths: Tuple[int, ...] = ()                # larguras menores para srcset
+
+    def wanted_formats(self) -> Tuple[str, ...]:
+        """Alternativas da versão que o Pillow instalado consegue gerar"""
+        return tuple(name for name in self.formats if name in supported_formats())
+
+    def applies_to(self, file_name: str) -> bool:
+        """Verifica se a versão deve ser gerada para o arquivo"""
+        return not self.only or file_name in self.only
+
+    def ladder(self, source_width: Optional[int] = None) -> List['Rendition']:
+        """
+        Degraus da escada de larguras, da menor para a maior, como versões
+        próprias ('gallery@480', ...) sem a versão principal
+
+        Args:
+            source_width: Largura da imagem original; degraus a partir de
+                LADDER_MAX_FRACTION dela ficam de fora
+
+        Returns:
+            Lista de versões
+        """
+        limit = min(self.max_width, int((source_width or self.max_width) * LADDER_MAX_FRACTION))
+        return [self._replace(name=f"{self.name}@{width}", max_width=width, widths=())
+                for width in sorted(self.widths) if width < limit]
+
+
+# Escada de larguras do srcset (a maior é a max_width da versão)
+RESPONSIVE_WIDTHS = (480, 960, 1440)
+
+RENDITIONS: Dict[str, Rendition] = {
+    # Ladrilhos de compose_mosaic: lidos como JPEG, sem alternativas
+    'mosaic': Rendition('mosaic', max_width=400, resample='bicubic', formats=()),
+    'gallery': Rendition('gallery', max_width=1920, widths=RESPONSIVE_WIDTHS),
+    'proposal': Rendition('proposal', max_width=1920, only=('37.jpeg',), widths=RESPONSIVE_WIDTHS),
+}
+
+
+def load_downscaled(image_path: str, max_width: int, resample: str = 'lanczos',
+                    draft: bool = True) -> Image.Image:
+    """
+    Abre a imagem já reduzida para a largura máxima
+
+    Para JPEG, Image.draft faz o decoder reduzir no domínio DCT (1/2, 1/4 ou
+    1/8) sem passar da largura final, então só a reamostragem final roda
+    sobre poucos pixels. Para outros formatos, reducing_gap usa
+    Image.reduce antes do filtro.
+
+    Args:
+        image_path: Caminho da imagem original
+        max_width: Largura máxima
+        resample: Nome do filtro em RESAMPLING_FILTERS
+        draft: Se deve usar a redução rápida no decoder
+
+    Returns:
+        Imagem redimensionada
+    """
+    img = Image.open(image_path)
+
+    if img.width > max_width:
+        ratio = max_width / img.width
+        size = (max_width, int(img.height * ratio))
+        if draft and img.format == 'JPEG':
+            img.draft('RGB', size)
+        img = img.resize(size, RESAMPLING_FILTERS[resample],
+                         reducing_gap=3.0 if draft else None)
+
+    return img
+
+
+def estimate_render_bytes(image_path: str, max_width: int, draft: bool = True) -> int:
+    """
+    Estima a memória de pico de render_image lendo só o cabeçalho da imagem
+
+    Conta o bitmap decodificado (já reduzido pelo draft, no caso de JPEG)
+    e o bitmap final, ambos em 4 bytes por pixel.
+
+    Args:
+        image_path: Caminho da imagem original
+        max_width: Largura máxima
+        draft: Se a redução rápida no decoder será usada
+
+    Returns:
+        Bytes estimados (0 se a imagem não puder ser lida)
+    """
+    try:
+        with Image.open(image_path) as img:
+            width, height, is_jpeg = img.width, img.height, img.format == 'JPEG'
+    except Exception:
+        return 0
+
+    decoded = width * height
+    if draft and is_jpeg and width > max_width:
+        scale = 1
+        while scale < 8 and width // (scale * 2) >= max_width:
+            scale *= 2
+        decoded = (width // scale) * (height // scale)
+    final_width = min(width, max_width)
+    final = final_width * int(height * final_width / width) if width else 0
+    return (decoded + final) * 4
+
+
+def encode_image(img: Image.Image, image_format: str = 'jpeg', quality: int = 85, **options) -> bytes:
+    """
+    Codifica uma imagem já redimensionada
+
+    Args:
+        img: Imagem RGB
+        image_format: Nome em IMAGE_FORMATS
+        quality: Qualidade JPEG da versão (ajustada por quality_delta)
+        **options: Opções do Pillow que substituem as do formato
+
+    Returns:
+        Bytes codificados
+    """
+    spec = IMAGE_FORMATS[image_format]
+    buffer = BytesIO()
+    img.save(buffer, format=spec.pillow_format, quality=max(1, quality + spec.quality_delta),
+             **{**dict(spec.options), **options})
+    return buffer.getvalue()
+
+
+def render_image(image_path: str, max_width: int, quality: int,
+                 resample: str = 'lanczos', draft: bool = True,
+                 image_format: str = 'jpeg') -> Tuple[bytes, int, int]:
+    """
+    Redimensiona e recodifica uma imagem
+
+    Args:
+        image_path: Caminho da imagem original
+        max_width: Largura máxima
+        quality: Qualidade JPEG
+        resample: Nome do filtro em RESAMPLING_FILTERS
+        draft: Se deve usar a redução rápida no decoder
+        image_format: Nome em IMAGE_FORMATS
+
+    Returns:
+        Tupla (bytes codificados, largura, altura)
+    """
+    img = load_downscaled(image_path, max_width, resample, draft)
+
+    if img.mode in ('RGBA', 'P'):
+        img = img.convert('RGB')
+
+    return encode_image(img, image_format, quality), img.width, img.height
+
+
+def _build_source(job: Tuple[str, str, List[Rendition]]) -> Tuple[str, Dict]:
+    """Gera todas as versões de uma imagem (executado no pool de processos)"""
+    image_path, output_dir, renditions = job
+    stat = os.stat(image_path)
+    entry = {
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'renditions': {}
+    }
+
+    for rendition in renditions:
+        try:
+            img = load_downscaled(image_path, rendition.max_width, rendition.resample)
+            if img.mode in ('RGBA', 'P'):
+                img = img.convert('RGB')
+            data = encode_image(img, 'jpeg', rendition.quality)
+        except Exception as e:
+            print(f"Erro ao gerar {rendition.name} de {image_path}: {e}")
+            continue
+
+        relative_path, digest = _write_derivative(output_dir, rendition.name, image_path, data, '.jpg')
+        info = {
+            'file': relative_path,
+            'sha256': digest,
+            'width': img.width,
+            'height': img.height,
+            'bytes': len(data),
+            'max_width': rendition.max_width,
+            'quality': rendition.quality,
+            'resample': rendition.resample,
+            'formats': {}
+        }
+
+        # Alternativas a partir da mesma imagem decodificada; 'savings' é a
+        # fração de bytes economizada em relação ao JPEG (negativa se maior)
+        for image_format in rendition.wanted_formats():
+            try:
+                alternative = encode_image(img, image_format, rendition.quality)
+            except Exception as e:
+                print(f"Erro ao gerar {rendition.name} ({image_format}) de {image_path}: {e}")
+                continue
+            alternative_path, alternative_digest = _write_derivative(
+                output_dir, rendition.name, image_path, alternative, IMAGE_FORMATS[image_format].extension)
+            info['formats'][image_format] = {
+                'file': alternative_path,
+                'sha256': alternative_digest,
+                'bytes': len(alternative),
+                'savings': round(1 - len(alternative) / len(data), 3)
+            }
+
+        entry['renditions'][rendition.name] = info
+
+    return image_path, entry
+
+
+def _image_width(image_path: str) -> Optional[int]:
+    """Largura da imagem lida do cabeçalho (None se não puder ser lida)"""
+    try:
+        with Image.open(image_path) as img:
+            return img.width
+    except Exception:
+        return None
+
+
+# Nome dos arquivos gravados por _write_derivative (sem a extensão)
+DERIVATIVE_NAME = re.compile(r".+-[0-9a-f]{12}")
+
+
+def _write_derivative(output_dir: str, rendition_name: str, image_path: str,
+                      data: bytes, extension: str) -> Tuple[str, str]:
+    """Grava um derivado com nome pelo hash; devolve (caminho relativo, sha256)"""
+    digest = hashlib.sha256(data).hexdigest()
+    relative_path = os.path.join(rendition_name, f"{Path(image_path).stem}-{digest[:12]}{extension}")
+    target = os.path.join(output_dir, relative_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as output_file:
+        output_file.write(data)
+    return relative_path, digest
+
+
+def format_savings(manifest: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Soma a economia de cada formato em relação ao JPEG
+
+    Args:
+        manifest: Entradas do manifesto {caminho da imagem: entrada}
+
+    Returns:
+        {formato: {'images', 'jpeg_bytes', 'bytes', 'savings'}}
+    """
+    totals: Dict[str, Dict] = {}
+    for entry in manifest.values():
+        for info in entry['renditions'].values():
+            for image_format, alternative in info.get('formats', {}).items():
+                total = totals.setdefault(image_format, {'images': 0, 'jpeg_bytes': 0, 'bytes': 0})
+                total['images'] += 1
+                total['jpeg_bytes'] += info['bytes']
+                total['bytes'] += alternative['bytes']
+    for total in totals.values():
+        total['savings'] = round(1 - total['bytes'] / total['jpeg_bytes'], 3) if total['jpeg_bytes'] else 0.0
+    return totals
+
+
+def compose_mosaic(image_paths: List[str], columns: int, rows: int,
+                   tile_size: Tuple[int, int]) -> Image.Image:
+    """
+    Compõe as fotos em uma grade
+
+    Cada foto vem do derivado 'mosaic' quando ele cobre o ladrilho (ou é
+    decodificada já reduzida, com load_downscaled) e é recortada para
+    preencher o ladrilho sem distorcer. Posições sem foto ficam na cor de fundo.
+
+    Args:
+        image_paths: Fotos na ordem da grade (linha a linha)
+        columns: Número de colunas
+        rows: Número de linhas
+        tile_size: Tamanho (largura, altura) de cada ladrilho
+
+    Returns:
+        Imagem RGB da grade
+    """
+    tile_width, tile_height = tile_size
+    canvas = Image.new('RGB', (columns * tile_width, rows * tile_height), (255, 182, 193))
+
+    for position, image_path in enumerate(image_paths[:columns * rows]):
+        try:
+            with Image.open(image_path) as header:
+                width, height = header.size
+            # Largura mínima para que o recorte cubra o ladrilho nas duas dimensões
+            needed_width = max(tile_width, -(-tile_height * width // height))
+            tile = _mosaic_tile(image_path, needed_width)
+            if tile.mode != 'RGB':
+                tile = tile.convert('RGB')
+            tile = ImageOps.fit(tile, tile_size, Image.Resampling.BICUBIC)
+        except Exception as e:
+            print(f"Erro ao compor {image_path} no mosaico: {e}")
+            continue
+
+        row, column = divmod(position, columns)
+        canvas.paste(tile, (column * tile_width, row * tile_height))
+
+    return canvas
+
+
+def _mosaic_tile(image_path: str, needed_width: int) -> Image.Image:
+    """
+    Foto de um ladrilho com pelo menos needed_width de largura: o derivado
+    'mosaic' atualizado, se for largo o bastante, ou o original reduzido
+    """
+    rendition = RENDITIONS['mosaic']
+    if needed_width <= rendition.max_width:
+        path = derivative_store.find(image_path, rendition.max_width, rendition.quality, rendition.resample)
+        if path:
+            return Image.open(path)
+    return load_downscaled(image_path, needed_width, rendition.resample)
+
+
+def render_mosaic(image_paths: List[str], columns: int, rows: int,
+                  tile_size: Tuple[int, int], quality: int = 80) -> Tuple[bytes, int, int]:
+    """
+    Compõe as fotos em uma grade (compose_mosaic) e codifica o resultado em
+    um único JPEG progressivo
+
+    Returns:
+        Tupla (bytes JPEG, largura, altura)
+    """
+    canvas = compose_mosaic(image_paths, columns, rows, tile_size)
+    return encode_image(canvas, 'jpeg', quality, progressive=True), canvas.width, canvas.height
+
+
+def _matches(info: Optional[Dict], rendition: Rendition) -> bool:
+    """Verifica se a entrada do manifesto foi gerada com os parâmetros da versão"""
+    return bool(info) and (info['max_width'], info['quality'], info.get('resample', 'lanczos')) == \
+        (rendition.max_width, rendition.quality, rendition.resample) and \
+        set(rendition.wanted_formats()) <= set(info.get('formats', {}))
+
+
+def _derivative_files(info: Dict) -> List[str]:
+    """Arquivos (relativos) de uma versão: o JPEG e as alternativas"""
+    return [info['file']] + [alternative['file'] for alternative in info.get('formats', {}).values()]
+
+
+class DerivativeStore:
+    """Leitura e geração dos derivados descritos em um manifesto"""
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, directory: str = "derivatives"):
+        self.directory = directory
+        self._manifest: Dict[str, Dict] = {}
+        self._manifest_mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        """Caminho do arquivo de manifesto"""
+        return os.path.join(self.directory, self.MANIFEST_NAME)
+
+    def load_manifest(self) -> Dict[str, Dict]:
+        """
+        Carrega o manifesto do disco, relendo apenas se o arquivo mudou
+
+        Returns:
+            Dicionário {caminho da imagem: entrada do manifesto}
+        """
+        try:
+            mtime_ns = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return {}
+
+        with self._lock:
+            if mtime_ns != self._manifest_mtime_ns:
+                try:
+                    with open(self.manifest_path, encoding="utf-8") as manifest_file:
+                        self._manifest = json.load(manifest_file).get('images', {})
+                except (OSError, ValueError) as e:
+                    print(f"Erro ao ler manifesto de derivados: {e}")
+                    self._manifest = {}
+                self._manifest_mtime_ns = mtime_ns
+            return self._manifest
+
+    def version(self) -> Optional[int]:
+        """Identifica o manifesto atual (mtime); muda a cada build"""
+        self.load_manifest()
+        return self._manifest_mtime_ns
+
+    def _fresh_entry(self, image_path: str) -> Optional[Dict]:
+        """Entrada do manifesto da imagem, se ela não mudou desde o build"""
+        entry = self.load_manifest().get(os.path.normpath(image_path))
+        if not entry:
+            return None
+
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (entry['source_size'], entry['source_mtime_ns']):
+            return None
+        return entry
+
+    def find(self, image_path: str, max_width: int, quality: int,
+             resample: str = 'lanczos', image_format: str = 'jpeg') -> Optional[str]:
+        """
+        Procura um derivado atualizado com os parâmetros informados
+
+        Alternativas ao JPEG só são devolvidas quando ficaram menores que ele.
+
+        Args:
+            image_path: Caminho da imagem original
+            max_width: Largura máxima desejada
+            quality: Qualidade JPEG desejada
+            resample: Filtro de reamostragem desejado
+            image_format: Nome em IMAGE_FORMATS
+
+        Returns:
+            Caminho do arquivo derivado ou None se não existir ou estiver desatualizado
+        """
+        entry = self._fresh_entry(image_path)
+        if not entry:
+            return None
+
+        for info in entry['renditions'].values():
+            if (info['max_width'], info['quality'], info.get('resample', 'lanczos')) == \
+                    (max_width, quality, resample):
+                if image_format != 'jpeg':
+                    info = info.get('formats', {}).get(image_format)
+                    if not info or info['savings'] <= 0:
+                        return None
+                path = os.path.join(self.directory, info['file'])
+                return path if os.path.exists(path) else None
+        return None
+
+    def variants(self, image_path: str, rendition: Rendition) -> List[Tuple[str, int, int, str]]:
+        """
+        Derivados atualizados de uma versão e dos degraus da sua escada
+
+        Inclui o JPEG de cada largura e as alternativas que ficaram menores
+        que ele.
+
+        Args:
+            image_path: Caminho da imagem original
+            rendition: Versão principal
+
+        Returns:
+            Lista de (formato, largura, altura, caminho), da menor largura
+            para a maior
+        """
+        entry = self._fresh_entry(image_path)
+        if not entry:
+            return []
+
+        variants = []
+        for step in rendition.ladder() + [rendition]:
+            info = entry['renditions'].get(step.name)
+            if not info or (info['max_width'], info['quality'], info.get('resample', 'lanczos')) != \
+                    (step.max_width, step.quality, step.resample):
+                continue
+            files = [('jpeg', info['file'])] + [
+                (image_format, alternative['file'])
+                for image_format, alternative in info.get('formats', {}).items() if alternative['savings'] > 0
+            ]
+            for image_format, file in files:
+                path = os.path.join(self.directory, file)
+                if os.path.exists(path):
+                    variants.append((image_format, info['width'], info['height'], path))
+        return variants
+
+    def read(self, image_path: str, max_width: int, quality: int,
+             resample: str = 'lanczos') -> Optional[bytes]:
+        """Lê os bytes pré-codificados de um derivado, se existir"""
+        path = self.find(image_path, max_width, quality, resample)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as derivative_file:
+                return derivative_file.read()
+        except OSError:
+            return None
+
+    def build(self, image_files: Iterable[str],
+              renditions: Optional[Iterable[Rendition]] = None,
+              workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Gera os derivados das imagens em um pool de processos
+
+        Imagens que não mudaram desde o último build são mantidas. Versões
+        com widths também geram os degraus da escada menores que a imagem
+        original (veja Rendition.ladder).
+
+        Args:
+            image_files: Caminhos das imagens originais
+            renditions: Versões a gerar (default: RENDITIONS)
+            workers: Número de processos (default: número de CPUs)
+
+        Returns:
+            Manifesto atualizado
+        """
+        renditions = list(renditions or RENDITIONS.values())
+        previous = self.load_manifest()
+        manifest: Dict[str, Dict] = {}
+        jobs = []
+
+        for image_path in image_files:
+            key = os.path.normpath(image_path)
+            source_width = _image_width(image_path)
+            wanted = []
+            for rendition in renditions:
+                if rendition.applies_to(Path(image_path).name):
+                    wanted += [rendition] + rendition.ladder(source_width)
+            stat = os.stat(image_path)
+            old = previous.get(key)
+            if (old and (old['source_size'], old['source_mtime_ns']) == (stat.st_size, stat.st_mtime_ns)
+                    and all(_matches(old['renditions'].get(r.name), r) for r in wanted)
+                    and all(os.path.exists(os.path.join(self.directory, file))
+                            for info in old['renditions'].values() for file in _derivative_files(info))):
+                manifest[key] = old
+            else:
+                jobs.append((image_path, self.directory, wanted))
+
+        os.makedirs(self.directory, exist_ok=True)
+        if jobs:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for done, (image_path, entry) in enumerate(executor.map(_build_source, jobs), 1):
+                    manifest[os.path.normpath(image_path)] = entry
+                    print(f"[{done}/{len(jobs)}] {image_path}")
+
+        self._remove_orphans(manifest, renditions)
+
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump({'renditions': {r.name: r._asdict() for r in renditions},
+                       'formats': format_savings(manifest), 'images': manifest},
+                      manifest_file, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+        return manifest
+
+    def _remove_orphans(self, manifest: Dict[str, Dict], renditions: Iterable[Rendition]):
+        """
+        Remove arquivos derivados que não estão mais no manifesto
+
+        Só olha os diretórios das versões (e dos degraus da escada) e só apaga
+        arquivos com o nome que _write_derivative grava ('<nome>-<hash><ext>'),
+        então um --output apontando para outro diretório não perde nada.
+        """
+        referenced = {
+            os.path.normpath(os.path.join(self.directory, file))
+            for entry in manifest.values()
+            for info in entry['renditions'].values()
+            for file in _derivative_files(info)
+        }
+        rendition_names = {step.name for rendition in renditions for step in [rendition] + rendition.ladder()}
+        rendition_names |= {os.path.dirname(os.path.relpath(file, self.directory)) for file in referenced}
+        extensions = {spec.extension for spec in IMAGE_FORMATS.values()}
+
+        for rendition_name in sorted(rendition_names):
+            rendition_dir = Path(self.directory, rendition_name)
+            if not rendition_name or not rendition_dir.is_dir():
+                continue
+            for derivative in rendition_dir.iterdir():
+                if (derivative.is_file() and derivative.suffix in extensions
+                        and DERIVATIVE_NAME.fullmatch(derivative.stem)
+                        and os.path.normpath(str(derivative)) not in referenced):
+                    derivative.unlink()
+
+
+# Instância única consultada por ImageProcessor
+derivative_store = DerivativeStore()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    from .file_utils import FileManager
+
+    parser = argparse.ArgumentParser(description="Gera derivados pré-codificados das fotos")
+    parser.add_argument("--pictures", default="pictures", help="Diretório das fotos originais")
+    parser.add_argument("--output", default=derivative_store.directory, help="Diretório dos derivados")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos")
+    args = parser.parse_args(argv)
+
+    image_files = FileManager.get_image_files(args.pictures)
+    manifest = DerivativeStore(args.output).build(image_files, workers=args.workers)
+    total_bytes = sum(
+        info['bytes'] for entry in manifest.values() for info in entry['renditions'].values()
+    )
+    print(f"✅ {len(manifest)} imagens, {total_bytes / 1024 / 1024:.1f} MB em '{args.output}'")
+    for image_format, total in format_savings(manifest).items():
+        print(f"   {image_format}: {total['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{total['savings']:.0%} menor que JPEG em {total['images']} versões")
+
+
+if __name__ == "__main__":
+    main()
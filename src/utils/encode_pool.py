@@ -0,0 +1,169 @@
+"""
+Pool compartilhado e limitado para codificar imagens em paralelo
+
+O Pillow libera o GIL na decodificação, no redimensionamento e na
+codificação, então threads dão paralelismo real sem copiar as imagens
+entre processos, e os resultados vão direto para o cache de mídia do
+processo. O pool é único por processo (todas as sessões dividem as
+mesmas threads) e cada tarefa reserva uma estimativa da memória que vai
+usar: com o orçamento esgotado, novas tarefas esperam as anteriores.
+
+Configuração por variáveis de ambiente:
+    APP_ENCODE_WORKERS=4        threads do pool (padrão: CPUs, até 4)
+    APP_ENCODE_MEMORY_MB=256    memória estimada em uso ao mesmo tempo
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class MemoryBudget:
+    """Orçamento de memória compartilhado pelas tarefas em execução"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, amount: int, cancel: Optional[Callable[[], bool]] = None,
+                poll_interval: float = 0.05) -> int:
+        """
+        Reserva memória, esperando enquanto o orçamento estiver esgotado
+
+        Uma tarefa maior que o orçamento inteiro roda sozinha.
+
+        Args:
+            amount: Bytes estimados da tarefa
+            cancel: Função consultada durante a espera; True desiste
+            poll_interval: Intervalo entre consultas a cancel em segundos
+
+        Returns:
+            Bytes reservados (passar para release) ou -1 se cancelado
+        """
+        amount = max(0, min(amount, self.max_bytes))
+        with self._condition:
+            while self.used_bytes and self.used_bytes + amount > self.max_bytes:
+                if cancel and cancel():
+                    return -1
+                self._condition.wait(poll_interval)
+            self.used_bytes += amount
+        return amount
+
+    def release(self, amount: int):
+        """Devolve memória reservada"""
+        with self._condition:
+            self.used_bytes -= amount
+            self._condition.notify_all()
+
+
+class EncodePool:
+    """Pool de threads limitado por número de tarefas e por memória"""
+
+    def __init__(self, workers: Optional[int] = None, max_memory_bytes: Optional[int] = None):
+        self.workers = workers or int(os.environ.get("APP_ENCODE_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+        max_memory_bytes = max_memory_bytes or int(os.environ.get("APP_ENCODE_MEMORY_MB", 256)) * 1024 * 1024
+        self.budget = MemoryBudget(max_memory_bytes)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Cria o pool no primeiro uso"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="encode")
+            return self._executor
+
+    @staticmethod
+    def _run(func: Callable[[Any], Any], item: Any) -> Any:
+        """Executa uma tarefa; uma falha vira None sem afetar as demais"""
+        try:
+            return func(item)
+        except Exception as e:
+            print(f"Erro ao codificar {item}: {e}")
+            return None
+
+    def submit(self, func: Callable[[Any], Any], item: Any) -> Future:
+        """
+        Agenda uma tarefa em segundo plano, sem esperar o resultado
+
+        Serve para trabalho opcional (ex.: versões em formatos modernos) que
+        não deve atrasar o render atual. Erros são impressos e viram None.
+
+        Args:
+            func: Função de um argumento (executada em outra thread)
+            item: Argumento de func
+
+        Returns:
+            Future com o resultado
+        """
+        context = contextvars.copy_context()
+        return self._get_executor().submit(context.run, self._run, func, item)
+
+    def map(self, func: Callable[[Any], Any], items: Sequence[Any],
+            cost: Optional[Callable[[Any], int]] = None,
+            cancel: Optional[Callable[[], bool]] = None,
+            poll_interval: float = 0.05) -> List[Optional[Any]]:
+        """
+        Aplica func a cada item no pool, devolvendo os resultados na ordem
+
+        As tarefas são enviadas em ordem, cada uma depois de reservar sua
+        memória estimada. Se cancel retornar True, as tarefas que ainda não
+        começaram são canceladas e ficam com None (as que já estão rodando
+        terminam em segundo plano e seus resultados continuam no cache).
+
+        Args:
+            func: Função de um argumento (executada em outra thread)
+            items: Itens a processar
+            cost: Estimativa de memória em bytes de cada item
+            cancel: Função sem argumentos consultada enquanto espera
+            poll_interval: Intervalo entre consultas a cancel em segundos
+
+        Returns:
+            Lista com o resultado de cada item (None em erro ou cancelamento)
+        """
+        results: List[Optional[Any]] = [None] * len(items)
+        if not items:
+            return results
+
+        executor = self._get_executor()
+        futures: Dict[Future, int] = {}
+        cancelled = False
+
+        for index, item in enumerate(items):
+            if cancel and cancel():
+                cancelled = True
+                break
+            reserved = self.budget.acquire(cost(item) if cost else 0, cancel, poll_interval)
+            if reserved < 0:
+                cancelled = True
+                break
+            # Cada tarefa leva uma cópia do contexto (página dos spans)
+            context = contextvars.copy_context()
+            future = executor.submit(context.run, self._run, func, item)
+            future.add_done_callback(lambda _, amount=reserved: self.budget.release(amount))
+            futures[future] = index
+
+        pending = set(futures)
+        while pending and not cancelled:
+            _, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            cancelled = bool(pending) and cancel is not None and cancel()
+        for future in pending:
+            future.cancel()
+
+        for future, index in futures.items():
+            if future.done() and not future.cancelled():
+                results[index] = future.result()
+        return results
+
+    def shutdown(self, wait_running: bool = True):
+        """Encerra o pool (recriado no próximo uso)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait_running, cancel_futures=True)
+
+
+# Instância única, compartilhada por todas as sessões do processo
+encode_pool = EncodePool()
@@ -0,0 +1,211 @@
+"""
+Índice em memória dos diretórios de mídia (pictures/, music/)
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from .instrumentation import instrumentation
+
+
+class FileEntry(NamedTuple):
+    """Arquivo indexado com metadados"""
+    path: str
+    name: str
+    suffix: str
+    kind: str
+    size: int
+    mtime_ns: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class DirectoryIndex:
+    """
+    Índice de um diretório construído uma vez e atualizado sob demanda
+
+    Consultas não tocam o sistema de arquivos: no máximo uma vez a cada
+    check_interval segundos o mtime do diretório é verificado (muda quando
+    arquivos são adicionados, removidos ou renomeados), e a cada
+    rescan_interval segundos os arquivos são verificados um a um para
+    detectar alterações de conteúdo. Com o watchdog disponível, eventos do
+    sistema de arquivos marcam o índice como sujo imediatamente.
+    """
+
+    def __init__(self, directory: str, kinds: Dict[str, set],
+                 check_interval: float = 2.0, rescan_interval: float = 30.0):
+        self.directory = directory
+        self.kinds = kinds
+        self.check_interval = check_interval
+        self.rescan_interval = rescan_interval
+        self._entries: List[FileEntry] = []
+        self._by_path: Dict[str, FileEntry] = {}
+        self._fingerprints: Dict[Tuple[str, ...], str] = {}
+        self._directory_mtime_ns: Optional[int] = None
+        self._last_check = 0.0
+        self._last_rescan = 0.0
+        self._dirty = True
+        self._observer = None
+        self._lock = threading.Lock()
+
+    def _kind_of(self, suffix: str) -> Optional[str]:
+        """Determina o tipo do arquivo pela extensão"""
+        for kind, extensions in self.kinds.items():
+            if suffix in extensions:
+                return kind
+        return None
+
+    @staticmethod
+    def _read_dimensions(path: str) -> tuple:
+        """Lê largura e altura do cabeçalho da imagem (sem decodificar)"""
+        try:
+            with Image.open(path) as img:
+                return img.width, img.height
+        except Exception:
+            return None, None
+
+    def _scan(self):
+        """Relê o diretório, reaproveitando entradas que não mudaram"""
+        entries = []
+        for dir_entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            name = dir_entry.name
+            if name.endswith(':Zone.Identifier') or not dir_entry.is_file():
+                continue
+
+            suffix = Path(name).suffix.lower()
+            kind = self._kind_of(suffix)
+            if kind is None:
+                continue
+
+            path = os.path.join(self.directory, name)
+            stat = dir_entry.stat()
+            previous = self._by_path.get(path)
+            if previous and (previous.size, previous.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                entries.append(previous)
+                continue
+
+            width, height = self._read_dimensions(path) if kind == 'image' else (None, None)
+            entries.append(FileEntry(path, name, suffix, kind, stat.st_size,
+                                     stat.st_mtime_ns, width, height))
+
+        self._entries = entries
+        self._by_path = {entry.path: entry for entry in entries}
+        self._fingerprints = {}
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Atualiza o índice se o diretório mudou
+
+        Args:
+            force: Relê o diretório mesmo sem mudanças detectadas
+
+        Returns:
+            True se o diretório foi relido
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and not self._dirty and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            try:
+                directory_mtime = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                self._entries = []
+                self._by_path = {}
+                self._directory_mtime_ns = None
+                return False
+
+            if (force or self._dirty or directory_mtime != self._directory_mtime_ns
+                    or now - self._last_rescan >= self.rescan_interval):
+                with instrumentation.span('files.scan', 'disk'):
+                    self._scan()
+                self._directory_mtime_ns = directory_mtime
+                self._last_rescan = now
+                self._dirty = False
+                return True
+            return False
+
+    def start_watching(self) -> bool:
+        """
+        Observa o diretório com watchdog (inotify), se estiver instalado
+
+        Returns:
+            True se o observador foi iniciado
+        """
+        if self._observer is not None:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+        if not os.path.isdir(self.directory):
+            return False
+
+        index = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Leituras dos arquivos (abrir/fechar sem escrita) não mudam o índice
+                if event.event_type not in ('opened', 'closed_no_write'):
+                    index._dirty = True
+
+        observer = Observer()
+        observer.schedule(_Handler(), self.directory, recursive=False)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        return True
+
+    def entries(self, kinds: Optional[Iterable[str]] = None) -> List[FileEntry]:
+        """
+        Lista as entradas do índice em ordem alfabética
+
+        Args:
+            kinds: Tipos desejados ('image', 'video', 'music'); None para todos
+
+        Returns:
+            Lista de entradas
+        """
+        self.refresh()
+        if kinds is None:
+            return list(self._entries)
+        kinds = set(kinds)
+        return [entry for entry in self._entries if entry.kind in kinds]
+
+    def fingerprint(self, kinds: Optional[Iterable[str]] = None) -> str:
+        """
+        Impressão digital (nomes, tamanhos e mtimes) das entradas dos tipos
+        desejados, calculada uma vez por leitura do diretório
+
+        Args:
+            kinds: Tipos desejados ('image', 'video', 'music'); None para todos
+
+        Returns:
+            Hash hexadecimal curto; muda quando algum arquivo muda
+        """
+        entries = self.entries(kinds)
+        key = tuple(sorted(kinds)) if kinds is not None else ()
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            digest = hashlib.sha1()
+            for entry in entries:
+                digest.update(f"{entry.name}:{entry.size}:{entry.mtime_ns};".encode())
+            fingerprint = digest.hexdigest()[:12]
+            self._fingerprints[key] = fingerprint
+        return fingerprint
+
+    def paths(self, kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """Lista os caminhos das entradas dos tipos desejados"""
+        return [entry.path for entry in self.entries(kinds)]
+
+    def get(self, path: str) -> Optional[FileEntry]:
+        """Obtém a entrada de um arquivo pelo caminho"""
+        self.refresh()
+        return self._by_path.get(os.path.join(self.directory, os.path.basename(path)))
@@ -3,10 +3,23 @@ Utilitários para manipulação de arquivos (imagens, vídeos, músicas)
 """
 import os
 import base64
+import hashlib
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
-from PIL import Image
-from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models import ImageSource, MediaItem
+from .media_cache import media_cache
+from .derivatives import (IMAGE_FORMATS, MODERN_FORMATS, RENDITIONS, compose_mosaic, derivative_store,
+                          encode_image, estimate_render_bytes, render_image, supported_formats)
+from .encode_pool import encode_pool
+from .file_index import DirectoryIndex, FileEntry
+from .html_builder import HtmlBuilder
+from .instrumentation import instrumentation
+from . import media_route
+from .video import extract_poster, faststart_remux, inspect_mp4
 
 
 class FileManager:
@@ -16,129 +29,941 @@ class FileManager:
     VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
     MUSIC_EXTENSIONS = {'.mp3', '.wav', '.ogg', '.m4a'}
     
-    @staticmethod
-    def get_files_by_extension(directory: str, extensions: set) -> List[str]:
+    # Contêineres ISO/QuickTime (átomos 'moov'/'mdat'), verificados para faststart
+    MP4_EXTENSIONS = {'.mp4', '.mov'}
+    
+    MIME_TYPES = {
+        '.jpg': 'image/jpeg',
+        '.jpeg': 'image/jpeg',
+        '.png': 'image/png',
+        '.gif': 'image/gif',
+        '.bmp': 'image/bmp',
+        '.webp': 'image/webp',
+        '.avif': 'image/avif',
+        '.mp4': 'video/mp4',
+        '.webm': 'video/webm',
+        '.avi': 'video/x-msvideo',
+        '.mov': 'video/quicktime',
+        '.mkv': 'video/x-matroska',
+        '.mp3': 'audio/mpeg',
+        '.wav': 'audio/wav',
+        '.ogg': 'audio/ogg',
+        '.m4a': 'audio/mp4'
+    }
+    
+    # Diretório servido pelo Streamlit com server.enableStaticServing (e
+    # pela rota de mídia, veja src/utils/media_route.py)
+    STATIC_DIRECTORY = "static"
+    STATIC_MEDIA_SUBDIRECTORY = "media"
+    STATIC_URL_PREFIX = "app/static"
+    
+    # Tipos entregues pela rota de mídia: mídia, folhas de estilo, fontes e
+    # as páginas do manifesto da galeria
+    STATIC_MIME_TYPES = {
+        **MIME_TYPES,
+        '.css': 'text/css',
+        '.woff2': 'font/woff2',
+        '.json': 'application/json'
+    }
+    
+    _published: dict = {}
+    _publish_lock = threading.Lock()
+    
+    # Índices em memória por diretório, compartilhados pelo processo
+    _indexes: Dict[str, DirectoryIndex] = {}
+    _indexes_lock = threading.Lock()
+    
+    @classmethod
+    def get_index(cls, directory: str) -> DirectoryIndex:
         """
-        Obtém lista de arquivos com extensões específicas
+        Obtém o índice em memória de um diretório, criando-o na primeira vez
         
         Args:
-            directory: Diretório para buscar arquivos
-            extensions: Set de extensões permitidas
+            directory: Diretório indexado
             
         Returns:
-            Lista de caminhos completos dos arquivos
+            Índice do diretório (compartilhado entre sessões)
+        """
+        with cls._indexes_lock:
+            index = cls._indexes.get(directory)
+            if index is None:
+                index = DirectoryIndex(directory, {
+                    'image': cls.IMAGE_EXTENSIONS,
+                    'video': cls.VIDEO_EXTENSIONS,
+                    'music': cls.MUSIC_EXTENSIONS
+                })
+                index.start_watching()
+                cls._indexes[directory] = index
+            return index
+    
+    @classmethod
+    def get_entries(cls, directory: str, kinds: Optional[List[str]] = None) -> List[FileEntry]:
         """
-        files = []
+        Consulta tipada do índice: arquivos com tipo, tamanho, mtime e dimensões
         
-        if not os.path.exists(directory):
-            return files
+        Args:
+            directory: Diretório indexado
+            kinds: Tipos desejados ('image', 'video', 'music'); None para todos
             
-        for file in sorted(os.listdir(directory)):
-            if Path(file).suffix.lower() in extensions:
-                full_path = os.path.join(directory, file)
-                if not file.endswith(':Zone.Identifier'):
-                    files.append(full_path)
+        Returns:
+            Lista de entradas em ordem alfabética
+        """
+        return cls.get_index(directory).entries(kinds)
+    
+    @classmethod
+    def get_files_by_extension(cls, directory: str, extensions: set) -> List[str]:
+        """
+        Obtém lista de arquivos com extensões específicas (a partir do índice)
         
-        return files
+        Args:
+            directory: Diretório para buscar arquivos
+            extensions: Set de extensões permitidas
+            
+        Returns:
+            Lista de caminhos completos dos arquivos
+        """
+        return [
+            entry.path for entry in cls.get_entries(directory)
+            if entry.suffix in extensions
+        ]
     
     @classmethod
     def get_image_files(cls, directory: str) -> List[str]:
         """Obtém lista de arquivos de imagem"""
-        return cls.get_files_by_extension(directory, cls.IMAGE_EXTENSIONS)
+        return cls.get_index(directory).paths(['image'])
     
     @classmethod
     def get_video_files(cls, directory: str) -> List[str]:
         """Obtém lista de arquivos de vídeo"""
-        return cls.get_files_by_extension(directory, cls.VIDEO_EXTENSIONS)
+        return cls.get_index(directory).paths(['video'])
     
     @classmethod
     def get_music_files(cls, directory: str) -> List[str]:
         """Obtém lista de arquivos de música"""
-        return cls.get_files_by_extension(directory, cls.MUSIC_EXTENSIONS)
+        return cls.get_index(directory).paths(['music'])
     
     @classmethod
     def get_media_files(cls, directory: str) -> List[str]:
         """Obtém lista de arquivos de mídia (imagens e vídeos)"""
-        all_extensions = cls.IMAGE_EXTENSIONS | cls.VIDEO_EXTENSIONS
-        return cls.get_files_by_extension(directory, all_extensions)
+        return cls.get_index(directory).paths(['image', 'video'])
     
     @staticmethod
     def is_video_file(file_path: str) -> bool:
         """Verifica se o arquivo é um vídeo"""
         return Path(file_path).suffix.lower() in FileManager.VIDEO_EXTENSIONS
+    
+    @classmethod
+    def get_mime_type(cls, file_path: str) -> str:
+        """Determina o mime type baseado na extensão do arquivo"""
+        return cls.MIME_TYPES.get(Path(file_path).suffix.lower(), 'application/octet-stream')
+    
+    @classmethod
+    def get_src_mime_type(cls, src: str) -> str:
+        """Determina o mime type de um src: o declarado no data URI ou o da extensão da URL"""
+        if src.startswith('data:'):
+            return src[len('data:'):].split(',', 1)[0].split(';', 1)[0]
+        return cls.get_mime_type(src)
+    
+    @classmethod
+    def get_media_item(cls, media_path: str, rendition: str = 'gallery') -> Optional[MediaItem]:
+        """
+        Monta o item de mídia (src e mime type) de uma foto ou vídeo
+        
+        Args:
+            media_path: Caminho do arquivo
+            rendition: Versão da foto ('gallery', 'proposal', ...)
+            
+        Returns:
+            MediaItem ou None se houver erro
+        """
+        if cls.is_video_file(media_path):
+            src = ImageProcessor.get_media_src(media_path)
+            if not src:
+                return None
+            return MediaItem('video', src, cls.get_mime_type(media_path), media_path,
+                             poster=ImageProcessor.get_video_poster(media_path))
+        
+        src = ImageProcessor.get_rendition_src(media_path, rendition)
+        if not src:
+            return None
+        return MediaItem('image', src, cls.get_src_mime_type(src), media_path,
+                         ImageProcessor.get_rendition_sources(media_path, rendition))
+    
+    @staticmethod
+    def is_static_serving_enabled() -> bool:
+        """
+        Verifica se o servidor serve o diretório static/ (pela rota de mídia
+        ou por app/static com server.enableStaticServing)
+        """
+        if media_route.is_registered():
+            return True
+        try:
+            import streamlit as st
+            return bool(st.get_option("server.enableStaticServing"))
+        except Exception:
+            return False
+    
+    @classmethod
+    def server_serves(cls, suffix: str, size: int = 0) -> bool:
+        """
+        Verifica se o servidor entrega um arquivo de static/ com o tipo certo
+        
+        Com a rota de mídia registrada, todo tipo de STATIC_MIME_TYPES é
+        servido com o Content-Type da extensão e range requests. Sem ela vale
+        o handler de app/static do Streamlit, que só entrega com o tipo certo
+        as extensões de uma lista fixa (JPEG/PNG/GIF/WebP na 1.37; PDF a
+        partir da 1.40; fontes, XML e JSON a partir da 1.43) e serve o resto
+        como text/plain com nosniff, que o navegador recusa para áudio,
+        vídeo, AVIF e CSS; arquivos acima do seu limite (200 MB) não são
+        servidos.
+        
+        Args:
+            suffix: Extensão do arquivo (ex.: '.mp3')
+            size: Tamanho do arquivo em bytes
+        """
+        if media_route.is_registered():
+            return suffix.lower() in cls.STATIC_MIME_TYPES
+        safe_extensions, max_size = _app_static_file_limits()
+        if safe_extensions is not None and suffix.lower() not in safe_extensions:
+            return False
+        return max_size is None or size <= max_size
+    
+    @classmethod
+    def static_url(cls, relative_path: str) -> str:
+        """
+        URL relativa de um arquivo de static/ (ex.: 'fonts/x.woff2'): pela
+        rota de mídia quando registrada, por app/static caso contrário
+        """
+        prefix = media_route.ROUTE_PREFIX if media_route.is_registered() else cls.STATIC_URL_PREFIX
+        return f"{prefix}/{relative_path}"
+    
+    @classmethod
+    def _static_media_path(cls, name: str) -> str:
+        """Caminho no disco de um arquivo publicado"""
+        return os.path.join(cls.STATIC_DIRECTORY, cls.STATIC_MEDIA_SUBDIRECTORY, name)
+    
+    @classmethod
+    def _static_media_url(cls, name: str) -> str:
+        """URL relativa de um arquivo publicado"""
+        return cls.static_url(f"{cls.STATIC_MEDIA_SUBDIRECTORY}/{name}")
+    
+    @classmethod
+    @instrumentation.timed('files.publish_bytes', 'disk')
+    def publish_bytes(cls, data: bytes, suffix: str, check_type: bool = True) -> Optional[str]:
+        """
+        Publica conteúdo em memória como arquivo estático com nome pelo hash
+        
+        Args:
+            data: Conteúdo do arquivo
+            suffix: Extensão do arquivo (ex.: '.jpg')
+            check_type: Recusa tipos que o servidor não entrega (False quando
+                quem chama já decidiu, como as folhas com APP_CSS_MODE=link)
+            
+        Returns:
+            URL relativa do arquivo (ex.: 'app/files/media/<hash>.jpg') ou
+            None se houver erro ou o servidor não entregar o tipo (veja
+            server_serves)
+        """
+        if check_type and not cls.server_serves(suffix, len(data)):
+            return None
+        name = hashlib.sha256(data).hexdigest()[:20] + suffix.lower()
+        if not os.path.exists(cls._static_media_path(name)) and not cls._write_static(name, data):
+            return None
+        return cls._static_media_url(name)
+    
+    @classmethod
+    @instrumentation.timed('files.publish_named', 'disk')
+    def publish_named(cls, data: bytes, name: str) -> Optional[str]:
+        """
+        Publica conteúdo em memória com um nome fixo (sobrescreve o anterior)
+        
+        Para arquivos cuja URL precisa ser conhecida antes de existirem,
+        como as páginas do manifesto da galeria.
+        
+        Args:
+            data: Conteúdo do arquivo
+            name: Caminho relativo a static/media/ (ex.: 'gallery/<versão>/0.json')
+            
+        Returns:
+            URL relativa do arquivo ou None se houver erro
+        """
+        if not cls._write_static(name, data):
+            return None
+        return cls._static_media_url(name)
+    
+    @classmethod
+    def _write_static(cls, name: str, data: bytes) -> bool:
+        """Grava um arquivo em static/media/ de forma atômica"""
+        target = cls._static_media_path(name)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, target)
+        except OSError as e:
+            print(f"Erro ao publicar arquivo estático {name}: {e}")
+            return False
+        return True
+    
+    @classmethod
+    @instrumentation.timed('files.publish_file', 'disk')
+    def publish_file(cls, file_path: str) -> Optional[str]:
+        """
+        Publica um arquivo de mídia no diretório static/ com URL pelo hash
+        do conteúdo, para que o navegador possa fazer cache e range requests
+        
+        Args:
+            file_path: Caminho do arquivo original
+            
+        Returns:
+            URL relativa do arquivo publicado ou None se houver erro
+        """
+        return cls._publish(file_path)
+    
+    @classmethod
+    @instrumentation.timed('files.publish_video', 'disk')
+    def publish_video(cls, video_path: str) -> Optional[str]:
+        """
+        Publica um vídeo pronto para reprodução progressiva
+        
+        O servidor estático responde a range requests, então o navegador
+        começa a tocar com os primeiros blocos e pula para qualquer ponto
+        sem baixar o resto (quando entrega o tipo do vídeo; veja
+        server_serves). Para isso o índice ('moov') precisa vir antes
+        dos dados: MP4/MOV fora dessa ordem é publicado como uma cópia
+        reorganizada (veja src/utils/video.py), sem alterar o original.
+        
+        Args:
+            video_path: Caminho do vídeo
+            
+        Returns:
+            URL relativa do vídeo publicado ou None se houver erro
+        """
+        if Path(video_path).suffix.lower() not in cls.MP4_EXTENSIONS:
+            return cls.publish_file(video_path)
+        
+        def remux(source_path: str, output_path: str) -> bool:
+            layout = inspect_mp4(source_path)
+            if layout is None or layout.faststart:
+                return False
+            print(f"⚠️ {source_path}: 'moov' depois dos dados ({layout.describe()}), "
+                  f"publicando cópia faststart")
+            return faststart_remux(source_path, output_path)
+        
+        return cls._publish(video_path, remux)
+    
+    @classmethod
+    def _publish(cls, file_path: str,
+                 prepare: Optional[Callable[[str, str], bool]] = None) -> Optional[str]:
+        """
+        Publica um arquivo (ou uma versão dele) com nome pelo hash do conteúdo
+        
+        Args:
+            file_path: Caminho do arquivo original
+            prepare: Função (origem, destino) que grava no destino a versão a
+                publicar; retornando False, o original é publicado como está
+            
+        Returns:
+            URL relativa do arquivo publicado ou None se houver erro ou o
+            servidor não entregar o tipo (veja server_serves); nesse caso
+            quem chama usa data URI ou outro formato
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            print(f"Erro ao publicar {file_path}: {e}")
+            return None
+        
+        if not cls.server_serves(Path(file_path).suffix, stat.st_size):
+            return None
+        
+        key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, prepare is not None)
+        with cls._publish_lock:
+            name = cls._published.get(key)
+        if name:
+            return cls._static_media_url(name)
+        
+        media_dir = os.path.dirname(cls._static_media_path(""))
+        prepared_path = os.path.join(media_dir, f".{os.getpid()}.{threading.get_ident()}.prepared")
+        try:
+            os.makedirs(media_dir, exist_ok=True)
+            source_path = prepared_path if prepare and prepare(file_path, prepared_path) else file_path
+            
+            digest = hashlib.sha256()
+            with open(source_path, "rb") as source:
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            name = digest.hexdigest()[:20] + Path(file_path).suffix.lower()
+            target = cls._static_media_path(name)
+            
+            if not os.path.exists(target):
+                if source_path == prepared_path:
+                    os.replace(prepared_path, target)
+                else:
+                    tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    try:
+                        # Hard link evita cópia quando está no mesmo sistema de arquivos
+                        os.link(file_path, tmp_path)
+                    except OSError:
+                        shutil.copyfile(file_path, tmp_path)
+                    os.replace(tmp_path, target)
+        except OSError as e:
+            print(f"Erro ao publicar {file_path}: {e}")
+            return None
+        finally:
+            if os.path.exists(prepared_path):
+                os.remove(prepared_path)
+        
+        with cls._publish_lock:
+            cls._published[key] = name
+        return cls._static_media_url(name)
+
+
+@lru_cache(maxsize=1)
+def _app_static_file_limits() -> Tuple[Optional[Tuple[str, ...]], Optional[int]]:
+    """
+    Extensões entregues com o tipo certo e tamanho máximo do handler de
+    app/static do Streamlit; (None, None) em servidores que usam o tipo pelo
+    mimetypes, sem lista fixa
+    """
+    try:
+        from streamlit.web.server import app_static_file_handler
+    except ImportError:
+        return None, None
+    safe_extensions = tuple(getattr(app_static_file_handler, "SAFE_APP_STATIC_FILE_EXTENSIONS", ()))
+    return safe_extensions, getattr(app_static_file_handler, "MAX_APP_STATIC_FILE_SIZE", None)
 
 
 class ImageProcessor:
     """Processador de imagens com otimização"""
     
     @staticmethod
-    def image_to_base64(image_path: str, max_width: int = 1920) -> Optional[str]:
+    def _cache_key(kind: str, file_path: str, *params) -> Optional[tuple]:
+        """
+        Monta a chave de cache de um arquivo a partir de tamanho e mtime
+
+        Args:
+            kind: Tipo de conteúdo armazenado (ex.: 'image_base64')
+            file_path: Caminho do arquivo
+            *params: Parâmetros que alteram o resultado da codificação
+
+        Returns:
+            Tupla da chave ou None se o arquivo não existir
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (kind, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns) + params
+    
+    @staticmethod
+    @instrumentation.timed('image.base64', 'encode')
+    def image_to_base64(image_path: str, max_width: int = 1920, quality: int = 85,
+                        resample: str = 'lanczos') -> Optional[str]:
         """
         Converte imagem para base64 com otimização
         
+        O resultado fica no cache compartilhado do processo, então a mesma
+        imagem só é decodificada e recodificada uma vez enquanto não mudar.
+        
         Args:
             image_path: Caminho da imagem
             max_width: Largura máxima para redimensionamento
+            quality: Qualidade JPEG da recodificação
+            resample: Filtro de reamostragem (veja RESAMPLING_FILTERS)
             
         Returns:
             String base64 da imagem ou None se houver erro
         """
+        key = ImageProcessor._cache_key('image_base64', image_path, max_width, quality, resample)
+        if key is None:
+            print(f"Erro ao processar {image_path}: arquivo não encontrado")
+            return None
+        
+        return media_cache.get_or_compute(
+            key, lambda: ImageProcessor._encode_image(image_path, max_width, quality, resample)
+        )
+    
+    @staticmethod
+    def _encode_image_bytes(image_path: str, max_width: int, quality: int,
+                            resample: str = 'lanczos') -> Optional[bytes]:
+        """
+        Obtém a imagem redimensionada em JPEG, lendo o derivado pré-gerado
+        quando existir e decodificando o original apenas como fallback
+        """
+        with instrumentation.span('image.derivative_read', 'disk') as span:
+            img_bytes = derivative_store.read(image_path, max_width, quality, resample)
+            span.add_bytes(img_bytes)
+        if img_bytes is not None:
+            return img_bytes
+        
         try:
-            img = Image.open(image_path)
+            with instrumentation.span('image.render', 'pillow') as span:
+                img_bytes, _, _ = render_image(image_path, max_width, quality, resample)
+                span.add_bytes(img_bytes)
+            return img_bytes
+        except Exception as e:
+            print(f"Erro ao processar {image_path}: {e}")
+            return None
+    
+    @staticmethod
+    def _encode_image(image_path: str, max_width: int, quality: int,
+                      resample: str = 'lanczos') -> Optional[str]:
+        """Decodifica, redimensiona e recodifica a imagem em data URI JPEG"""
+        img_bytes = ImageProcessor._encode_image_bytes(image_path, max_width, quality, resample)
+        if img_bytes is None:
+            return None
+        
+        # Converter para base64
+        with instrumentation.span('image.base64_encode', 'base64') as span:
+            img_base64 = base64.b64encode(img_bytes).decode()
+            span.add_bytes(img_base64)
+        return f"data:image/jpeg;base64,{img_base64}"
+    
+    @staticmethod
+    @instrumentation.timed('image.url', 'encode')
+    def image_to_url(image_path: str, max_width: int = 1920, quality: int = 85,
+                     resample: str = 'lanczos') -> Optional[str]:
+        """
+        Publica a versão redimensionada da imagem como arquivo estático
+        
+        Args:
+            image_path: Caminho da imagem
+            max_width: Largura máxima para redimensionamento
+            quality: Qualidade JPEG da recodificação
+            resample: Filtro de reamostragem (veja RESAMPLING_FILTERS)
             
-            # Redimensionar se muito grande
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+        Returns:
+            URL relativa da imagem ou None se houver erro
+        """
+        key = ImageProcessor._cache_key('image_url', image_path, max_width, quality, resample)
+        if key is None:
+            print(f"Erro ao processar {image_path}: arquivo não encontrado")
+            return None
+        
+        def publish() -> Optional[str]:
+            derivative_path = derivative_store.find(image_path, max_width, quality, resample)
+            if derivative_path:
+                return FileManager.publish_file(derivative_path)
+            img_bytes = ImageProcessor._encode_image_bytes(image_path, max_width, quality, resample)
+            return FileManager.publish_bytes(img_bytes, '.jpg') if img_bytes else None
+        
+        return media_cache.get_or_compute(key, publish)
+    
+    @staticmethod
+    def get_image_src(image_path: str, max_width: int = 1920, quality: int = 85,
+                      resample: str = 'lanczos') -> Optional[str]:
+        """
+        Retorna o valor de src para uma imagem: URL estática quando o servidor
+        serve o diretório static/, ou data URI base64 caso contrário
+        """
+        if FileManager.is_static_serving_enabled():
+            url = ImageProcessor.image_to_url(image_path, max_width, quality, resample)
+            if url:
+                return url
+        return ImageProcessor.image_to_base64(image_path, max_width, quality, resample)
+    
+    @staticmethod
+    def get_rendition_src(image_path: str, rendition: str) -> Optional[str]:
+        """
+        Retorna o src de uma versão nomeada da imagem ('mosaic', 'gallery',
+        'proposal'), usando os parâmetros definidos em RENDITIONS
+        """
+        spec = RENDITIONS[rendition]
+        return ImageProcessor.get_image_src(image_path, spec.max_width, spec.quality, spec.resample)
+
+    @staticmethod
+    def _alternative_formats() -> Tuple[str, ...]:
+        """
+        Formatos modernos entregues além do JPEG: só com URLs estáticas (em
+        data URI todas as versões iriam no HTML) e se o Pillow os suporta
+        """
+        if not FileManager.is_static_serving_enabled():
+            return ()
+        return tuple(name for name in MODERN_FORMATS if name in supported_formats())
+
+    @staticmethod
+    def get_rendition_sources(image_path: str, rendition: str) -> Tuple[ImageSource, ...]:
+        """
+        Alternativas de uma versão da imagem para o navegador escolher:
+        formatos modernos (AVIF, WebP) e a escada de larguras do srcset
+
+        Vêm apenas dos derivados pré-gerados (alternativas que ficaram
+        menores que o JPEG): codificar WebP ou AVIF leva cerca de 10x o
+        tempo do JPEG, então isso não é feito durante o request. Só existem
+        com URLs estáticas; em data URI todas iriam no HTML.
+
+        Args:
+            image_path: Caminho da imagem
+            rendition: Nome da versão ('mosaic', 'gallery', 'proposal')
+
+        Returns:
+            Alternativas do formato preferido para o JPEG, cada formato da
+            menor largura para a maior (vazia sem derivados). O JPEG só entra
+            quando há escada; sem ela, o src do JPEG já basta.
+        """
+        if not FileManager.is_static_serving_enabled():
+            return ()
+        key = ImageProcessor._cache_key('image_sources', image_path, rendition, derivative_store.version())
+        if key is None:
+            return ()
+        formats = ImageProcessor._alternative_formats()
+
+        def collect() -> Tuple[ImageSource, ...]:
+            variants = derivative_store.variants(image_path, RENDITIONS[rendition])
+            jpeg_widths = {width for image_format, width, _, _ in variants if image_format == 'jpeg'}
+            sources = []
+            for wanted in formats + (('jpeg',) if len(jpeg_widths) > 1 else ()):
+                for image_format, width, height, path in variants:
+                    url = FileManager.publish_file(path) if image_format == wanted else None
+                    if url:
+                        sources.append(ImageSource(url, IMAGE_FORMATS[image_format].mime, width, height))
+            return tuple(sources)
+
+        return media_cache.get_or_compute(key, collect)
+
+    @staticmethod
+    def css_background_image(src: str, sources: Tuple[ImageSource, ...] = (),
+                             overlay: Optional[str] = None, important: bool = False) -> str:
+        """
+        Declarações background-image com a foto como última camada
+
+        Com alternativas, a declaração é repetida com image-set(): o
+        navegador usa o primeiro formato que suporta, e navegadores sem
+        image-set() descartam a segunda declaração e ficam com o JPEG. Das
+        alternativas com largura, só as da maior largura entram (os degraus
+        menores ficam em css_responsive_backgrounds).
+
+        Args:
+            src: src do JPEG
+            sources: Alternativas (get_rendition_sources, get_mosaic_sources)
+            overlay: Camadas sobre a foto (ex.: um linear-gradient)
+            important: Acrescenta !important às declarações
+
+        Returns:
+            Declarações CSS
+        """
+        modern = [source for source in sources if source.mime != 'image/jpeg']
+        widest = max((source.width or 0 for source in modern), default=0)
+        modern = [source for source in modern if (source.width or 0) == widest]
+
+        layers = f"{overlay}, " if overlay else ""
+        suffix = " !important" if important else ""
+        css = f"background-image: {layers}url('{src}'){suffix};"
+        if modern:
+            options = [f"url('{source.src}') type('{source.mime}')" for source in modern]
+            options.append(f"url('{src}') type('image/jpeg')")
+            css += f"\n            background-image: {layers}image-set({', '.join(options)}){suffix};"
+        return css
+
+    @staticmethod
+    def css_responsive_backgrounds(selector: str, sources: Tuple[ImageSource, ...],
+                                   overlay: Optional[str] = None, important: bool = False) -> str:
+        """
+        Regras @media que trocam um fundo com background-size: cover pelos
+        degraus menores da escada quando a tela não precisa da largura máxima
+
+        Um degrau basta quando cobre a tela em pixels físicos: largura da
+        tela e altura x proporção da foto, vezes a densidade de pixels. Cada
+        degrau gera uma condição de largura, altura e resolução máximas por
+        densidade (1x, 2x, 3x); os degraus menores vêm por último e
+        prevalecem.
+
+        Args:
+            selector: Seletor do elemento com o fundo (ex.: '.stApp')
+            sources: Alternativas com largura (get_rendition_sources)
+            overlay: Camadas sobre a foto, como em css_background_image
+            important: Acrescenta !important às declarações
+
+        Returns:
+            CSS das regras (vazio sem escada)
+        """
+        steps = sorted((source for source in sources if source.mime == 'image/jpeg' and source.width),
+                       key=lambda source: source.width)
+        rules = []
+        for step in reversed(steps[:-1]):
+            aspect = step.width / step.height
+            alternatives = tuple(source for source in sources
+                                 if source.width == step.width and source.mime != 'image/jpeg')
+            declarations = ImageProcessor.css_background_image(step.src, alternatives, overlay, important)
+            for density in (1, 2, 3):
+                max_width = step.width // density
+                if max_width < 240:
+                    # Nenhuma tela é tão estreita
+                    continue
+                max_height = int(step.width / (density * aspect))
+                rules.append(f"@media (max-width: {max_width}px) and (max-height: {max_height}px) "
+                             f"and (max-resolution: {density}dppx) {{\n"
+                             f"        {selector} {{\n            {declarations}\n        }}\n    }}")
+        return "\n    ".join(rules)
+
+    @staticmethod
+    @instrumentation.timed('image.encode_many', 'encode')
+    def encode_many(image_paths: List[str], rendition: str,
+                    cancel: Optional[Callable[[], bool]] = None) -> List[Optional[str]]:
+        """
+        Obtém o src de uma versão de várias imagens em paralelo
+
+        As imagens são codificadas no pool compartilhado (veja
+        src/utils/encode_pool.py), limitado por threads e pela memória
+        estimada de cada decodificação. Imagens já em cache ou com derivado
+        pré-gerado não passam pelo Pillow.
+
+        Args:
+            image_paths: Caminhos das imagens
+            rendition: Nome da versão ('mosaic', 'gallery', 'proposal')
+            cancel: Função consultada durante a espera; True abandona as
+                imagens que ainda não começaram (ficam com None)
+
+        Returns:
+            Lista de src na mesma ordem de image_paths (None em erro)
+        """
+        spec = RENDITIONS[rendition]
+
+        def cost(image_path: str) -> int:
+            if derivative_store.find(image_path, spec.max_width, spec.quality, spec.resample):
+                return 0
+            return estimate_render_bytes(image_path, spec.max_width)
+
+        return encode_pool.map(lambda path: ImageProcessor.get_rendition_src(path, rendition),
+                               image_paths, cost=cost, cancel=cancel)
+
+    @staticmethod
+    def _mosaic_key(photos: List[str], set_id: Optional[str], columns: int, rows: int,
+                    tile_size: tuple, quality: int) -> Optional[tuple]:
+        """
+        Chave de cache do mosaico: o set_id do conjunto de fotos quando
+        informado (já identifica fotos e versões), ou tamanho e mtime de cada foto
+        """
+        if set_id:
+            identity = ('set', set_id)
+        else:
+            identity = tuple(ImageProcessor._cache_key('tile', path) for path in photos)
+            if not identity or None in identity:
+                return None
+        return (identity, columns, rows, tuple(tile_size), quality)
+    
+    @staticmethod
+    @instrumentation.timed('image.mosaic', 'pillow')
+    def build_mosaic(photos: List[str], set_id: Optional[str] = None, columns: int = 4,
+                     rows: int = 3, tile_size: tuple = (400, 300), quality: int = 80) -> Optional[bytes]:
+        """
+        Compõe uma grade de fotos em um único JPEG, guardado no cache
+        
+        Args:
+            photos: Fotos na ordem dos ladrilhos (linha a linha)
+            set_id: Identificador do conjunto (veja PhotoSelectionService)
+            columns: Colunas da grade
+            rows: Linhas da grade
+            tile_size: Tamanho (largura, altura) de cada ladrilho
+            quality: Qualidade JPEG
             
-            # Converter para RGB se necessário
-            if img.mode in ('RGBA', 'P'):
-                img = img.convert('RGB')
+        Returns:
+            Bytes do JPEG composto ou None se houver erro
+        """
+        key = ImageProcessor._mosaic_key(photos, set_id, columns, rows, tile_size, quality)
+        if key is None:
+            return None
+        
+        def compose() -> Optional[bytes]:
+            try:
+                canvas = compose_mosaic(list(photos), columns, rows, tile_size)
+                data = encode_image(canvas, 'jpeg', quality, progressive=True)
+                # Alternativas da mesma grade em segundo plano (levam ~10x o
+                # tempo do JPEG); get_mosaic_sources as entrega quando prontas
+                for image_format in ImageProcessor._alternative_formats():
+                    encode_pool.submit(lambda name: media_cache.put(
+                        ('mosaic_bytes', name) + key, encode_image(canvas, name, quality)), image_format)
+                return data
+            except Exception as e:
+                print(f"Erro ao compor mosaico: {e}")
+                return None
+        
+        return media_cache.get_or_compute(('mosaic_bytes',) + key, compose)
+    
+    @staticmethod
+    def get_mosaic_src(photos: List[str], set_id: Optional[str] = None, columns: int = 4,
+                       rows: int = 3, tile_size: tuple = (400, 300), quality: int = 80) -> Optional[str]:
+        """
+        Retorna o src do mosaico composto: URL estática quando o servidor
+        serve o diretório static/, ou data URI base64 caso contrário
+        
+        Args:
+            photos: Fotos na ordem dos ladrilhos (linha a linha)
+            set_id: Identificador do conjunto; com ele o resultado é
+                reaproveitado por todas as sessões que recebem o mesmo conjunto
+            columns: Colunas da grade
+            rows: Linhas da grade
+            tile_size: Tamanho (largura, altura) de cada ladrilho
+            quality: Qualidade JPEG
+            
+        Returns:
+            src da imagem ou None se não houver fotos
+        """
+        key = ImageProcessor._mosaic_key(photos, set_id, columns, rows, tile_size, quality)
+        if key is None:
+            return None
+        static_mode = FileManager.is_static_serving_enabled()
+        
+        def build_src() -> Optional[str]:
+            data = ImageProcessor.build_mosaic(photos, set_id, columns, rows, tile_size, quality)
+            if data is None:
+                return None
+            if static_mode:
+                url = FileManager.publish_bytes(data, '.jpg')
+                if url:
+                    return url
+            return f"data:image/jpeg;base64,{base64.b64encode(data).decode()}"
+        
+        kind = 'mosaic_url' if static_mode else 'mosaic_data_uri'
+        return media_cache.get_or_compute((kind,) + key, build_src)
+
+    @staticmethod
+    def get_mosaic_sources(photos: List[str], set_id: Optional[str] = None, columns: int = 4,
+                           rows: int = 3, tile_size: tuple = (400, 300),
+                           quality: int = 80) -> Tuple[ImageSource, ...]:
+        """
+        Alternativas do mosaico em formatos modernos (AVIF, WebP)
+
+        São codificadas em segundo plano por build_mosaic, a partir da mesma
+        grade do JPEG, e publicadas como arquivos estáticos. Enquanto não
+        ficam prontas, sem URLs estáticas ou quando a alternativa não ficou
+        menor que o JPEG, não há alternativas. Os argumentos são os de
+        get_mosaic_src.
+
+        Returns:
+            Alternativas da preferida para a menos
+        """
+        key = ImageProcessor._mosaic_key(photos, set_id, columns, rows, tile_size, quality)
+        if key is None or not ImageProcessor._alternative_formats():
+            return ()
+
+        def publish() -> Optional[Tuple[ImageSource, ...]]:
+            jpeg = ImageProcessor.build_mosaic(photos, set_id, columns, rows, tile_size, quality)
+            if jpeg is None:
+                return None
+            sources = []
+            for image_format in ImageProcessor._alternative_formats():
+                data = media_cache.get(('mosaic_bytes', image_format) + key)
+                if data is None:
+                    # Ainda codificando: não guarda o resultado parcial
+                    return None
+                if len(data) < len(jpeg):
+                    spec = IMAGE_FORMATS[image_format]
+                    url = FileManager.publish_bytes(data, spec.extension)
+                    if url:
+                        sources.append(ImageSource(url, spec.mime))
+            return tuple(sources)
+
+        return media_cache.get_or_compute(('mosaic_sources',) + key, publish) or ()
+    
+    @staticmethod
+    def build_derivatives(pictures_directory: str = "pictures", workers: Optional[int] = None) -> dict:
+        """
+        Gera os derivados de todas as fotos do diretório no armazenamento
+        padrão (veja src/utils/derivatives.py)
+        
+        Args:
+            pictures_directory: Diretório das fotos originais
+            workers: Número de processos do pool
             
-            # Salvar em buffer
-            buffer = BytesIO()
-            img.save(buffer, format='JPEG', quality=85, optimize=True)
-            img_bytes = buffer.getvalue()
+        Returns:
+            Manifesto com hash, dimensões e tamanho de cada versão
+        """
+        image_files = FileManager.get_image_files(pictures_directory)
+        return derivative_store.build(image_files, workers=workers)
+    
+    @staticmethod
+    @instrumentation.timed('media.src', 'encode')
+    def get_media_src(media_path: str) -> Optional[str]:
+        """
+        Retorna o valor de src para vídeo ou áudio: URL estática quando o
+        servidor entrega o tipo (veja FileManager.server_serves), ou data URI
+        base64 caso contrário
+        
+        O data URI de um vídeo fica no cache de mídia, então é codificado uma
+        vez por versão do arquivo, e não a cada render.
+        """
+        if FileManager.is_static_serving_enabled():
+            if FileManager.is_video_file(media_path):
+                url = FileManager.publish_video(media_path)
+            else:
+                url = FileManager.publish_file(media_path)
+            if url:
+                return url
+        
+        if FileManager.is_video_file(media_path):
+            key = ImageProcessor._cache_key('video_data_uri', media_path)
+            if key is None:
+                return None
+            return media_cache.get_or_compute(key, lambda: ImageProcessor.video_to_base64(media_path))
+        
+        audio_base64 = ImageProcessor.audio_to_base64(media_path)
+        if audio_base64 is None:
+            return None
+        return f"data:{FileManager.get_mime_type(media_path)};base64,{audio_base64}"
+    
+    @staticmethod
+    @instrumentation.timed('media.video_poster', 'encode')
+    def get_video_poster(video_path: str) -> Optional[str]:
+        """
+        Retorna o src do poster de um vídeo (quadro extraído em JPEG): URL
+        estática quando o servidor serve o diretório static/, ou data URI
+        
+        O resultado (inclusive a ausência de poster, sem ffmpeg nem capa
+        embutida) fica no cache de mídia, então a extração roda uma vez por
+        versão do arquivo.
+        
+        Args:
+            video_path: Caminho do vídeo
             
-            # Converter para base64
-            img_base64 = base64.b64encode(img_bytes).decode()
-            return f"data:image/jpeg;base64,{img_base64}"
-        except Exception as e:
-            print(f"Erro ao processar {image_path}: {e}")
+        Returns:
+            src do poster ou None se não houver como extrair
+        """
+        key = ImageProcessor._cache_key('video_poster', video_path, FileManager.is_static_serving_enabled())
+        if key is None:
             return None
+        
+        def build() -> str:
+            data = extract_poster(video_path)
+            if data is None:
+                return ''
+            if FileManager.is_static_serving_enabled():
+                url = FileManager.publish_bytes(data, '.jpg')
+                if url:
+                    return url
+            return f"data:image/jpeg;base64,{base64.b64encode(data).decode()}"
+        
+        return media_cache.get_or_compute(key, build) or None
     
     @staticmethod
+    @instrumentation.timed('media.video_base64', 'base64')
     def video_to_base64(video_path: str) -> Optional[str]:
-        """Converte vídeo para base64"""
+        """
+        Converte vídeo para data URI base64
+        
+        O arquivo é codificado em blocos a partir de um mmap (veja
+        HtmlBuilder), sem cópia do arquivo inteiro em bytes; a montagem do
+        data URI ainda usa cerca de duas vezes o tamanho dele em memória.
+        """
         try:
-            with open(video_path, "rb") as video_file:
-                video_bytes = video_file.read()
-                video_base64 = base64.b64encode(video_bytes).decode()
-                
-                # Determinar mime type baseado na extensão
-                ext = Path(video_path).suffix.lower()
-                mime_types = {
-                    '.mp4': 'video/mp4',
-                    '.webm': 'video/webm',
-                    '.avi': 'video/x-msvideo',
-                    '.mov': 'video/quicktime',
-                    '.mkv': 'video/x-matroska'
-                }
-                mime_type = mime_types.get(ext, 'video/mp4')
-                
-                return f"data:{mime_type};base64,{video_base64}"
+            # Determinar mime type baseado na extensão
+            mime_type = FileManager.MIME_TYPES.get(Path(video_path).suffix.lower(), 'video/mp4')
+            
+            builder = HtmlBuilder().write(f"data:{mime_type};base64,").write_base64_file(video_path)
+            return builder.build()
         except Exception as e:
             print(f"Erro ao processar vídeo {video_path}: {e}")
             return None
     
     @staticmethod
+    @instrumentation.timed('media.audio_base64', 'base64')
     def audio_to_base64(audio_path: str) -> Optional[str]:
-        """Converte áudio para base64"""
+        """Converte áudio para base64 (codificado em blocos, como em video_to_base64)"""
         try:
-            with open(audio_path, "rb") as audio_file:
-                audio_bytes = audio_file.read()
-                return base64.b64encode(audio_bytes).decode()
+            return HtmlBuilder().write_base64_file(audio_path).build()
         except Exception as e:
             print(f"Erro ao processar áudio {audio_path}: {e}")
             return None
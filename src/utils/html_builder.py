@@ -0,0 +1,80 @@
+"""
+Montagem de HTML com trechos base64 codificados em blocos
+"""
+import base64
+import mmap
+from typing import Iterator, List, Tuple, Union
+
+
+# Blocos múltiplos de 3 bytes: o base64 de cada bloco não tem padding e os
+# blocos podem ser concatenados. 768 KiB de entrada -> 1 MiB de saída.
+BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+
+def iter_base64_file(file_path: str, chunk_size: int = BASE64_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Codifica um arquivo em base64 bloco a bloco, sem ler o arquivo inteiro
+
+    O arquivo é mapeado em memória (as páginas lidas podem ser descartadas
+    pelo sistema), então a memória usada fica limitada ao tamanho do bloco.
+
+    Args:
+        file_path: Caminho do arquivo
+        chunk_size: Tamanho dos blocos lidos (arredondado para múltiplo de 3)
+
+    Yields:
+        Trechos base64 que, concatenados, formam a codificação do arquivo
+    """
+    chunk_size = max(3, chunk_size - chunk_size % 3)
+    with open(file_path, "rb") as source:
+        try:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio não pode ser mapeado
+            return
+        with mapped:
+            for offset in range(0, len(mapped), chunk_size):
+                yield base64.b64encode(mapped[offset:offset + chunk_size]).decode("ascii")
+
+
+class HtmlBuilder:
+    """
+    Acumula trechos de HTML e arquivos a embutir em base64
+
+    Arquivos só são lidos em build(), que monta a string final lendo cada
+    arquivo uma única vez, sem cópia do arquivo inteiro em bytes. Enquanto a
+    string é montada os trechos codificados e o resultado coexistem: o pico
+    de memória é cerca de duas vezes o tamanho da saída.
+    """
+
+    def __init__(self, chunk_size: int = BASE64_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._parts: List[Union[str, Tuple[str]]] = []
+
+    def write(self, text: str) -> "HtmlBuilder":
+        """Acrescenta um trecho de texto"""
+        if text:
+            self._parts.append(text)
+        return self
+
+    def write_base64_file(self, file_path: str) -> "HtmlBuilder":
+        """Acrescenta o conteúdo de um arquivo codificado em base64"""
+        self._parts.append((file_path,))
+        return self
+
+    def _iter_parts(self) -> Iterator[str]:
+        """Percorre os trechos, codificando os arquivos sob demanda"""
+        for part in self._parts:
+            if isinstance(part, tuple):
+                yield from iter_base64_file(part[0], self.chunk_size)
+            else:
+                yield part
+
+    def build(self) -> str:
+        """
+        Monta a string final
+
+        Returns:
+            HTML completo
+        """
+        return "".join(self._iter_parts())
@@ -0,0 +1,296 @@
+"""
+Medição das fases de render (spans) com destinos plugáveis
+
+Cada span registra página, nome, fase (render, disk, pillow, base64,
+encode, quiz), duração e bytes produzidos. Os spans são entregues aos
+destinos (sinks) configurados: linhas de log, um buffer circular em memória
+ou um endpoint de texto no formato do Prometheus.
+
+Configuração por variáveis de ambiente:
+    APP_INSTRUMENTATION=log,prometheus   destinos além do buffer circular
+    APP_METRICS_PORT=9464                porta do endpoint /metrics
+"""
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# Página em renderização no contexto atual (cada sessão roda em sua thread)
+_current_page: contextvars.ContextVar = contextvars.ContextVar("current_page", default=None)
+
+
+class Span(NamedTuple):
+    """Medição de uma operação"""
+    name: str
+    phase: str
+    page: Optional[str]
+    duration_ms: float
+    bytes: int
+    timestamp: float
+
+
+class SpanRecorder:
+    """Acumula os bytes produzidos enquanto o span está aberto"""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+    def add_bytes(self, value: Any):
+        """Soma o tamanho de um valor (bytes/str) ou um inteiro"""
+        self.bytes += value if isinstance(value, int) else size_of(value)
+
+
+def size_of(value: Any) -> int:
+    """Tamanho em bytes de um resultado (bytes, str, ou tupla começando por bytes)"""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, tuple) and value and isinstance(value[0], (bytes, bytearray)):
+        return len(value[0])
+    return 0
+
+
+class LoggingSink:
+    """Escreve cada span como uma linha de log"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("app.instrumentation")
+        self.level = level
+
+    def emit(self, span: Span):
+        """Registra o span no logger"""
+        self.logger.log(self.level, "span name=%s phase=%s page=%s duration_ms=%.2f bytes=%d",
+                        span.name, span.phase, span.page or "-", span.duration_ms, span.bytes)
+
+
+class RingBufferSink:
+    """Mantém os últimos spans em memória para inspeção no próprio processo"""
+
+    def __init__(self, capacity: int = 2048):
+        self._spans: deque = deque(maxlen=capacity)
+
+    def emit(self, span: Span):
+        """Guarda o span, descartando o mais antigo se o buffer estiver cheio"""
+        self._spans.append(span)
+
+    def spans(self, name: Optional[str] = None, page: Optional[str] = None) -> List[Span]:
+        """
+        Lista os spans guardados
+
+        Args:
+            name: Filtra pelo nome da operação
+            page: Filtra pela página
+
+        Returns:
+            Spans do mais antigo para o mais recente
+        """
+        return [span for span in list(self._spans)
+                if (name is None or span.name == name) and (page is None or span.page == page)]
+
+    def clear(self):
+        """Esvazia o buffer"""
+        self._spans.clear()
+
+
+class PrometheusSink:
+    """Agrega os spans em contadores no formato de texto do Prometheus"""
+
+    def __init__(self):
+        self._totals: Dict[Tuple[str, str, str], List[float]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def emit(self, span: Span):
+        """Soma o span aos totais de (nome, fase, página)"""
+        key = (span.name, span.phase, span.page or "")
+        with self._lock:
+            totals = self._totals.setdefault(key, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += span.duration_ms / 1000
+            totals[2] += span.bytes
+
+    def render(self) -> str:
+        """
+        Gera o texto de exposição das métricas
+
+        Returns:
+            Texto no formato aceito pelo Prometheus
+        """
+        with self._lock:
+            items = sorted(self._totals.items())
+        lines = []
+        for column, metric in enumerate(("app_spans_total", "app_span_seconds_total", "app_span_bytes_total")):
+            lines.append(f"# TYPE {metric} counter")
+            for (name, phase, page), totals in items:
+                labels = f'name="{name}",phase="{phase}",page="{page}"'
+                value = f"{totals[column]:.6f}" if column == 1 else f"{totals[column]}"
+                lines.append(f"{metric}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "0.0.0.0") -> bool:
+        """
+        Publica o endpoint /metrics em uma thread separada
+
+        Args:
+            port: Porta HTTP
+            host: Endereço de escuta
+
+        Returns:
+            True se o servidor foi iniciado
+        """
+        if self._server is not None:
+            return True
+
+        sink = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            print(f"Erro ao iniciar endpoint de métricas na porta {port}: {e}")
+            return False
+
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        return True
+
+
+class Instrumentation:
+    """Cria spans e os entrega aos destinos registrados"""
+
+    def __init__(self, sinks: Optional[List[Any]] = None):
+        self._sinks: List[Any] = list(sinks or [])
+        self.enabled = True
+
+    @property
+    def sinks(self) -> List[Any]:
+        """Destinos registrados"""
+        return list(self._sinks)
+
+    def add_sink(self, sink: Any):
+        """Registra um destino (qualquer objeto com emit(span))"""
+        if sink not in self._sinks:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink: Any):
+        """Remove um destino registrado"""
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def get_sink(self, sink_type: type) -> Optional[Any]:
+        """Obtém o primeiro destino do tipo informado"""
+        for sink in self._sinks:
+            if isinstance(sink, sink_type):
+                return sink
+        return None
+
+    def emit(self, span: Span):
+        """Entrega o span a todos os destinos; falhas de um destino não param o render"""
+        for sink in self._sinks:
+            try:
+                sink.emit(span)
+            except Exception as e:
+                print(f"Erro ao registrar span {span.name}: {e}")
+
+    @contextmanager
+    def page(self, page: str) -> Iterator[None]:
+        """Define a página atual para os spans abertos dentro do bloco"""
+        token = _current_page.set(page)
+        try:
+            yield
+        finally:
+            _current_page.reset(token)
+
+    @contextmanager
+    def span(self, name: str, phase: str, page: Optional[str] = None) -> Iterator[SpanRecorder]:
+        """
+        Mede o bloco como um span
+
+        Args:
+            name: Nome da operação (ex.: 'image.render')
+            phase: Fase (ex.: 'pillow', 'base64', 'disk')
+            page: Página; por padrão a definida por page()
+
+        Yields:
+            Recorder para informar os bytes produzidos
+        """
+        recorder = SpanRecorder()
+        if not self.enabled or not self._sinks:
+            yield recorder
+            return
+
+        start = time.perf_counter()
+        try:
+            yield recorder
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.emit(Span(name, phase, page or _current_page.get(), duration_ms,
+                           recorder.bytes, time.time()))
+
+    def timed(self, name: str, phase: str) -> Callable:
+        """
+        Decorador que mede cada chamada da função como um span, usando o
+        tamanho do retorno como bytes produzidos
+
+        Args:
+            name: Nome da operação
+            phase: Fase
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, phase) as recorder:
+                    result = func(*args, **kwargs)
+                    recorder.add_bytes(result)
+                    return result
+            return wrapper
+        return decorator
+
+
+def _configure_from_environment(instance: Instrumentation):
+    """Registra os destinos pedidos em APP_INSTRUMENTATION e APP_METRICS_PORT"""
+    requested = {name.strip() for name in os.environ.get("APP_INSTRUMENTATION", "").split(",")
+                 if name.strip()}
+    port = os.environ.get("APP_METRICS_PORT")
+
+    if "log" in requested:
+        sink = LoggingSink()
+        if not sink.logger.handlers and not logging.getLogger().handlers:
+            sink.logger.addHandler(logging.StreamHandler())
+            sink.logger.setLevel(logging.INFO)
+        instance.add_sink(sink)
+    if "prometheus" in requested or port:
+        sink = PrometheusSink()
+        instance.add_sink(sink)
+        if port:
+            try:
+                sink.serve(int(port))
+            except ValueError:
+                print(f"Erro: APP_METRICS_PORT inválida: {port}")
+
+
+# Instância única usada por PageManager, serviços e utilitários
+instrumentation = Instrumentation([RingBufferSink()])
+_configure_from_environment(instrumentation)
@@ -0,0 +1,168 @@
+"""
+Cache de mídia codificada compartilhado por todo o processo
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+
+class MediaCache:
+    """
+    Cache LRU limitado pelo tamanho em bytes das entradas (chave e valor)
+
+    É compartilhado entre todas as sessões do Streamlit (vive no módulo, que
+    não é reexecutado a cada rerun), então renders repetidos de uma mesma
+    mídia custam apenas uma consulta ao dicionário.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def _size_of(cls, value: Any, seen: Optional[Set[int]] = None) -> int:
+        """
+        Calcula o tamanho aproximado de um valor em bytes
+
+        Conta o próprio objeto (sys.getsizeof) e, recursivamente, os itens de
+        tuplas, listas, conjuntos e dicionários e os atributos de objetos com
+        __slots__ ou __dict__ (como os modelos de src/models). Objetos
+        compartilhados são contados uma vez.
+        """
+        if seen is None:
+            seen = set()
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+
+        size = sys.getsizeof(value)
+        if isinstance(value, (str, bytes, bytearray)):
+            return size
+        if isinstance(value, dict):
+            return size + sum(cls._size_of(k, seen) + cls._size_of(v, seen) for k, v in value.items())
+        if isinstance(value, (tuple, list, set, frozenset)):
+            return size + sum(cls._size_of(item, seen) for item in value)
+        for name in getattr(type(value), "__slots__", ()):
+            if hasattr(value, name):
+                size += cls._size_of(getattr(value, name), seen)
+        if hasattr(value, "__dict__"):
+            size += cls._size_of(vars(value), seen)
+        return size
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Obtém um valor do cache, marcando-o como usado recentemente
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            Valor armazenado ou None se não existir
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Armazena um valor, removendo as entradas menos usadas se necessário
+
+        O tamanho da entrada soma chave e valor (veja _size_of).
+
+        Args:
+            key: Chave da entrada
+            value: Valor a armazenar
+        """
+        size = self._size_of(key) + self._size_of(value)
+
+        # Entradas maiores que o cache inteiro não são armazenadas
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self.current_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, factory: Callable[[], Any]) -> Optional[Any]:
+        """
+        Obtém um valor do cache ou calcula e armazena se não existir
+
+        Args:
+            key: Chave da entrada
+            factory: Função que gera o valor em caso de miss
+
+        Returns:
+            Valor do cache ou o resultado de factory (None não é armazenado)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = factory()
+        if value is not None:
+            self.put(key, value)
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove todas as entradas cuja chave satisfaz o predicado
+
+        Args:
+            predicate: Função que recebe a chave e retorna True para remover
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+                self.current_bytes -= self._sizes.pop(key)
+            return len(keys)
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna contadores de uso do cache"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# Instância única usada por ImageProcessor e pelos serviços
+media_cache = MediaCache()
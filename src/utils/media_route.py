@@ -0,0 +1,112 @@
+"""
+Rota de mídia do servidor: static/ servido com o tipo certo e range requests
+
+O handler de app/static do Streamlit só entrega com o tipo certo as extensões
+da sua lista fixa (JPEG/PNG/GIF/WebP; PDF a partir da 1.40; fontes, XML e
+JSON a partir da 1.43) e responde text/plain com nosniff a todo o resto, o
+que o navegador recusa para áudio, vídeo, AVIF e CSS. Este módulo registra
+no servidor uma rota irmã, app/files/, sobre o mesmo diretório static/, com
+um StaticFileHandler do tornado: Content-Type pela extensão, range requests
+(206), ETag e cache longo para os arquivos nomeados pelo hash do conteúdo.
+
+A rota entra no app do tornado criado por Server._create_app (presente da
+1.37 à 1.50 do Streamlit), então install() precisa rodar no processo do
+servidor antes de ele subir (veja src/server.py).
+"""
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+# Prefixo das URLs relativas servidas pela rota (equivale a app/static/)
+ROUTE_PREFIX = "app/files"
+
+# Arquivos nomeados pelo hash do conteúdo (veja FileManager.publish_bytes)
+HASHED_NAME = re.compile(r"^media/[0-9a-f]{20}\.\w+$")
+
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_CONTROL_REVALIDATE = "no-cache"
+
+_installed = threading.Event()
+_registered = threading.Event()
+
+
+def install(directory: str, content_types: Dict[str, str]) -> bool:
+    """
+    Registra a rota nos servidores do Streamlit criados por este processo
+
+    Args:
+        directory: Diretório servido (static/)
+        content_types: Content-Type por extensão; as demais extensões e os
+            arquivos ocultos (temporários da publicação) respondem 404
+
+    Returns:
+        True se a rota será registrada quando o servidor subir
+    """
+    if _installed.is_set():
+        return True
+    try:
+        import tornado.web
+        from streamlit import config
+        from streamlit.web.server.server import Server
+        from streamlit.web.server.server_util import make_url_path_regex
+    except ImportError as e:
+        print(f"Rota de mídia indisponível: {e}")
+        return False
+
+    class MediaFileHandler(tornado.web.StaticFileHandler):
+        """static/ com o Content-Type da extensão e cache pelo nome"""
+
+        def validate_absolute_path(self, root: str, absolute_path: str) -> Optional[str]:
+            name = os.path.basename(absolute_path)
+            if name.startswith(".") or os.path.splitext(name)[1].lower() not in content_types:
+                raise tornado.web.HTTPError(404)
+            return super().validate_absolute_path(root, absolute_path)
+
+        def get_content_type(self) -> str:
+            return content_types[os.path.splitext(self.absolute_path)[1].lower()]
+
+        def set_extra_headers(self, path: str):
+            immutable = HASHED_NAME.match(path.replace(os.sep, "/"))
+            self.set_header("Cache-Control",
+                            CACHE_CONTROL_IMMUTABLE if immutable else CACHE_CONTROL_REVALIDATE)
+
+    create_app = Server._create_app
+    root = os.path.abspath(directory)
+
+    def create_app_with_media_route(server):
+        app = create_app(server)
+        base = config.get_option("server.baseUrlPath")
+        # Entra antes das rotas do Streamlit; o que não casar segue para elas
+        app.add_handlers(r".*", [
+            (make_url_path_regex(base, f"{ROUTE_PREFIX}/(.*)"), MediaFileHandler, {"path": root}),
+        ])
+        _registered.set()
+        return app
+
+    Server._create_app = create_app_with_media_route
+    _installed.set()
+    return True
+
+
+def is_installed() -> bool:
+    """Verifica se install() preparou a rota neste processo"""
+    return _installed.is_set()
+
+
+def is_registered() -> bool:
+    """Verifica se o servidor deste processo já está servindo a rota"""
+    return _registered.is_set()
+
+
+def wait(timeout: Optional[float] = None) -> bool:
+    """Espera o servidor registrar a rota; False se o tempo acabar"""
+    return _registered.wait(timeout)
+
+
+def mark_registered():
+    """
+    Dá a rota como registrada sem servidor HTTP, para medir com o AppTest
+    (benchmarks) as páginas como src/server.py as entrega
+    """
+    _registered.set()
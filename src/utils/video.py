@@ -0,0 +1,307 @@
+"""
+Vídeos para reprodução progressiva: layout MP4 (faststart) e poster
+
+Um MP4 só começa a tocar antes de chegar inteiro se o átomo 'moov' (índice
+das amostras) vier antes do 'mdat' (dados). Este módulo lê os átomos do
+topo do arquivo, move o 'moov' para a frente quando preciso (sem recodificar,
+só corrigindo os offsets de 'stco'/'co64') e extrai um quadro como poster.
+
+Uso pela linha de comando (relatório; --fix corrige os arquivos no lugar):
+    python -m src.utils.video --pictures pictures
+    python -m src.utils.video --pictures pictures --fix
+"""
+import argparse
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from io import BytesIO
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from .derivatives import encode_image
+
+
+# Contêineres no caminho até as tabelas de offsets e até a capa embutida
+SAMPLE_TABLE_PATH = {b'trak', b'mdia', b'minf', b'stbl'}
+COVER_PATH = {b'udta', b'meta', b'ilst', b'covr'}
+
+# Largura máxima e qualidade JPEG dos posters
+POSTER_MAX_WIDTH = 1280
+POSTER_QUALITY = 80
+
+# Instante do quadro do poster (segundos); vídeos mais curtos usam o primeiro
+POSTER_TIME = 1.0
+
+# Tempo máximo de uma chamada ao ffmpeg (segundos)
+FFMPEG_TIMEOUT = 30
+
+
+class Mp4Box(NamedTuple):
+    """Átomo do MP4: tipo, posição, tamanho total e tamanho do cabeçalho"""
+    kind: bytes
+    offset: int
+    size: int
+    header: int
+
+    @property
+    def end(self) -> int:
+        """Posição logo depois do átomo"""
+        return self.offset + self.size
+
+
+class Mp4Layout(NamedTuple):
+    """Átomos do topo de um arquivo MP4, na ordem em que aparecem"""
+    boxes: Tuple[Mp4Box, ...]
+
+    def find(self, kind: bytes) -> Optional[Mp4Box]:
+        """Primeiro átomo do tipo informado"""
+        return next((box for box in self.boxes if box.kind == kind), None)
+
+    @property
+    def faststart(self) -> bool:
+        """Indica se o 'moov' vem antes do primeiro 'mdat'"""
+        moov, mdat = self.find(b'moov'), self.find(b'mdat')
+        if moov is None:
+            return False
+        return mdat is None or moov.offset < mdat.offset
+
+    def describe(self) -> str:
+        """Ordem dos átomos, ex.: 'ftyp moov mdat'"""
+        return " ".join(box.kind.decode('latin-1') for box in self.boxes)
+
+
+def iter_boxes(stream: BinaryIO, start: int, end: int) -> Iterator[Mp4Box]:
+    """
+    Percorre os átomos de um trecho do arquivo (ou de um buffer)
+
+    Args:
+        stream: Arquivo binário com seek
+        start: Posição do primeiro átomo
+        end: Fim do trecho
+
+    Yields:
+        Mp4Box de cada átomo
+
+    Raises:
+        ValueError: Se um átomo tiver tamanho inválido
+    """
+    offset = start
+    while offset + 8 <= end:
+        stream.seek(offset)
+        size, kind = struct.unpack('>I4s', stream.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', stream.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise ValueError(f"átomo '{kind.decode('latin-1')}' inválido na posição {offset}")
+        yield Mp4Box(kind, offset, size, header)
+        offset += size
+
+
+def inspect_mp4(video_path: str) -> Optional[Mp4Layout]:
+    """
+    Lê os átomos do topo de um MP4/MOV sem carregar o arquivo
+
+    Args:
+        video_path: Caminho do vídeo
+
+    Returns:
+        Mp4Layout ou None se o arquivo não for um MP4 válido
+    """
+    try:
+        with open(video_path, 'rb') as stream:
+            boxes = tuple(iter_boxes(stream, 0, os.fstat(stream.fileno()).st_size))
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Erro ao ler átomos de {video_path}: {e}")
+        return None
+    if not boxes or boxes[0].kind not in (b'ftyp', b'wide', b'free', b'moov', b'mdat'):
+        return None
+    return Mp4Layout(boxes)
+
+
+def _find_children(buffer: BytesIO, parent: Mp4Box, kinds: set, path: set) -> Iterator[Mp4Box]:
+    """Átomos dos tipos informados dentro de parent, descendo pelos contêineres de path"""
+    start = parent.offset + parent.header
+    if parent.kind == b'meta':
+        # 'meta' é um full box no MP4 (4 bytes de versão/flags) mas não no QuickTime
+        buffer.seek(start)
+        if buffer.read(4) == b'\0\0\0\0':
+            start += 4
+    for box in iter_boxes(buffer, start, parent.end):
+        if box.kind in kinds:
+            yield box
+        if box.kind in path:
+            yield from _find_children(buffer, box, kinds, path)
+
+
+def _shift_chunk_offsets(moov: bytearray, delta: int, first: int, last: int):
+    """
+    Soma delta aos offsets de 'stco'/'co64' que apontam para [first, last)
+
+    Raises:
+        ValueError: Se um offset de 32 bits estourar
+    """
+    buffer = BytesIO(bytes(moov))
+    root = next(iter_boxes(buffer, 0, len(moov)))
+    for table in _find_children(buffer, root, {b'stco', b'co64'}, SAMPLE_TABLE_PATH):
+        entries_at = table.offset + table.header + 4
+        count = struct.unpack_from('>I', moov, entries_at)[0]
+        width, code = (8, '>Q') if table.kind == b'co64' else (4, '>I')
+        for index in range(count):
+            position = entries_at + 4 + index * width
+            value = struct.unpack_from(code, moov, position)[0]
+            if first <= value < last:
+                value += delta
+                if width == 4 and value >= 2 ** 32:
+                    raise ValueError("offset acima de 4 GB em 'stco'")
+                struct.pack_into(code, moov, position, value)
+
+
+def faststart_remux(video_path: str, output_path: str) -> bool:
+    """
+    Grava uma cópia do vídeo com o 'moov' antes dos dados
+
+    Não recodifica nada: os átomos são copiados em blocos e só os offsets
+    das amostras dentro do 'moov' são corrigidos.
+
+    Args:
+        video_path: Vídeo original
+        output_path: Destino da cópia (gravado de forma atômica)
+
+    Returns:
+        True se a cópia foi gravada
+    """
+    layout = inspect_mp4(video_path)
+    if layout is None or layout.find(b'moov') is None or layout.faststart:
+        return False
+    moov, mdat = layout.find(b'moov'), layout.find(b'mdat')
+
+    try:
+        with open(video_path, 'rb') as source:
+            source.seek(moov.offset)
+            moov_data = bytearray(source.read(moov.size))
+            # Tudo entre o primeiro 'mdat' e o 'moov' anda moov.size bytes para frente
+            _shift_chunk_offsets(moov_data, moov.size, mdat.offset, moov.offset)
+
+            output_dir = os.path.dirname(os.path.abspath(output_path))
+            fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as target:
+                    for box in layout.boxes:
+                        if box is mdat:
+                            target.write(moov_data)
+                        if box is moov:
+                            continue
+                        source.seek(box.offset)
+                        remaining = box.size
+                        while remaining:
+                            chunk = source.read(min(remaining, 1024 * 1024))
+                            if not chunk:
+                                raise ValueError("arquivo terminou antes do esperado")
+                            target.write(chunk)
+                            remaining -= len(chunk)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Erro ao reorganizar {video_path}: {e}")
+        return False
+    return True
+
+
+def _ffmpeg_frame(video_path: str, seconds: float) -> Optional[bytes]:
+    """Quadro do vídeo no instante informado (PNG) extraído com o ffmpeg"""
+    command = ['ffmpeg', '-v', 'error', '-ss', f"{seconds:.3f}", '-i', video_path,
+               '-frames:v', '1', '-f', 'image2pipe', '-vcodec', 'png', '-']
+    result = subprocess.run(command, capture_output=True, timeout=FFMPEG_TIMEOUT, check=False)
+    return result.stdout or None
+
+
+def _embedded_cover(video_path: str) -> Optional[bytes]:
+    """Capa embutida no vídeo ('covr' dos metadados), se houver"""
+    layout = inspect_mp4(video_path)
+    moov = layout.find(b'moov') if layout else None
+    if moov is None:
+        return None
+    with open(video_path, 'rb') as source:
+        source.seek(moov.offset)
+        buffer = BytesIO(source.read(moov.size))
+    root = Mp4Box(b'moov', 0, moov.size, moov.header)
+    for data in _find_children(buffer, root, {b'data'}, COVER_PATH):
+        # Cabeçalho do 'data': tipo (4 bytes) e idioma (4 bytes)
+        buffer.seek(data.offset + data.header + 8)
+        payload = buffer.read(data.size - data.header - 8)
+        if payload[:3] == b'\xff\xd8\xff' or payload[:8] == b'\x89PNG\r\n\x1a\n':
+            return payload
+    return None
+
+
+def extract_poster(video_path: str, max_width: int = POSTER_MAX_WIDTH,
+                   quality: int = POSTER_QUALITY) -> Optional[bytes]:
+    """
+    Extrai um quadro do vídeo como poster JPEG
+
+    Usa o ffmpeg quando instalado (quadro em POSTER_TIME, ou o primeiro em
+    vídeos curtos); sem ele, usa a capa embutida nos metadados do MP4.
+
+    Args:
+        video_path: Caminho do vídeo
+        max_width: Largura máxima do poster
+        quality: Qualidade JPEG
+
+    Returns:
+        Bytes do JPEG ou None se não houver como extrair
+    """
+    try:
+        frame = None
+        if shutil.which('ffmpeg'):
+            frame = _ffmpeg_frame(video_path, POSTER_TIME) or _ffmpeg_frame(video_path, 0.0)
+        if frame is None:
+            frame = _embedded_cover(video_path)
+        if frame is None:
+            return None
+
+        with Image.open(BytesIO(frame)) as img:
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            if img.width > max_width:
+                img = img.resize((max_width, round(img.height * max_width / img.width)),
+                                 Image.Resampling.LANCZOS)
+            return encode_image(img, 'jpeg', quality)
+    except (OSError, ValueError, struct.error, subprocess.SubprocessError) as e:
+        print(f"Erro ao extrair poster de {video_path}: {e}")
+        return None
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ponto de entrada da linha de comando"""
+    from .file_utils import FileManager
+
+    parser = argparse.ArgumentParser(description="Verifica se os vídeos tocam antes de baixar inteiros")
+    parser.add_argument("--pictures", default="pictures", help="Diretório dos vídeos")
+    parser.add_argument("--fix", action="store_true", help="Move o 'moov' para o início no próprio arquivo")
+    args = parser.parse_args(argv)
+
+    for video_path in FileManager.get_video_files(args.pictures):
+        layout = inspect_mp4(video_path)
+        size_mb = os.path.getsize(video_path) / 1024 / 1024
+        if layout is None:
+            print(f"❔ {video_path} ({size_mb:.1f} MB): não é MP4/MOV")
+        elif layout.faststart:
+            print(f"✅ {video_path} ({size_mb:.1f} MB): faststart ({layout.describe()})")
+        elif args.fix and faststart_remux(video_path, video_path):
+            print(f"🔧 {video_path} ({size_mb:.1f} MB): 'moov' movido para o início")
+        else:
+            print(f"⚠️ {video_path} ({size_mb:.1f} MB): 'moov' depois dos dados ({layout.describe()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Configuração dos testes: a raiz do projeto no sys.path, como nos benchmarks
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
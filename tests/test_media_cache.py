@@ -0,0 +1,62 @@
+"""
+Testes do cache de mídia (src/utils/media_cache.py)
+"""
+from src.models import ImageSource
+from src.utils.media_cache import MediaCache
+
+
+def test_size_counts_key_and_nested_values():
+    sources = tuple(ImageSource(f"app/files/media/{i:020d}.webp", "image/webp", 960) for i in range(4))
+    assert MediaCache._size_of(sources) > sum(len(source.src) for source in sources)
+    assert MediaCache._size_of({"a": [b"x" * 1000]}) > 1000
+
+    cache = MediaCache(max_bytes=10 * 1024)
+    key = ("sources", "x" * 2000)
+    cache.put(key, ())
+    assert cache.current_bytes > 2000
+
+
+def test_eviction_with_mixed_values():
+    cache = MediaCache(max_bytes=16 * 1024)
+    values = {
+        ("bytes", 0): b"b" * 3000,
+        ("str", 1): "s" * 3000,
+        ("sources", 2): tuple(ImageSource("u" * 1000, "image/avif", w) for w in (480, 960, 1440)),
+        ("dict", 3): {"srcset": ["c" * 1500, "d" * 1500]},
+        ("empty", 4): (),
+    }
+    for round_ in range(4):
+        for (kind, i), value in values.items():
+            cache.put((kind, i, round_), value)
+            assert cache.current_bytes <= cache.max_bytes
+
+    stats = cache.stats()
+    assert stats["evictions"] > 0
+    assert stats["entries"] < len(values) * 4
+    # As entradas mais recentes ficam, as mais antigas saem primeiro
+    assert cache.get(("empty", 4, 3)) == ()
+    assert cache.get(("bytes", 0, 0)) is None
+
+
+def test_entry_larger_than_cache_is_not_stored():
+    cache = MediaCache(max_bytes=1024)
+    cache.put("big", ["x" * 2048])
+    assert cache.get("big") is None
+    assert cache.current_bytes == 0
+
+
+def test_get_or_compute_does_not_store_none():
+    cache = MediaCache()
+    calls = []
+    assert cache.get_or_compute("k", lambda: calls.append(1)) is None
+    assert cache.get_or_compute("k", lambda: "v") == "v"
+    assert cache.get_or_compute("k", lambda: "outro") == "v"
+    assert calls == [1]
+
+
+def test_invalidate_releases_bytes():
+    cache = MediaCache()
+    cache.put(("a", 1), "x" * 100)
+    cache.put(("b", 1), "y" * 100)
+    assert cache.invalidate(lambda key: key[0] == "a") == 1
+    assert cache.current_bytes == MediaCache._size_of(("b", 1)) + MediaCache._size_of("y" * 100)
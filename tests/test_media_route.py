@@ -0,0 +1,86 @@
+"""
+Testes da rota de mídia (src/utils/media_route.py)
+"""
+import asyncio
+import threading
+
+import pytest
+import tornado.web
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.testing import bind_unused_port
+from streamlit.web.server.server import Server
+
+from src.utils import media_route
+from src.utils.file_utils import FileManager
+
+HASHED = "media/0123456789abcdef0123.mp3"
+
+
+@pytest.fixture
+def route(tmp_path, monkeypatch):
+    """Instala a rota sobre um app vazio, sem as rotas do Streamlit"""
+    monkeypatch.setattr(media_route, "_installed", threading.Event())
+    monkeypatch.setattr(media_route, "_registered", threading.Event())
+    monkeypatch.setattr(Server, "_create_app", lambda server: tornado.web.Application([]))
+
+    (tmp_path / "media").mkdir()
+    (tmp_path / "fonts").mkdir()
+    (tmp_path / HASHED).write_bytes(bytes(range(256)) * 4)
+    (tmp_path / "media" / ".1.2.prepared").write_bytes(b"x")
+    (tmp_path / "media" / "x.exe").write_bytes(b"x")
+    (tmp_path / "fonts" / "a.woff2").write_bytes(b"wOF2")
+
+    assert media_route.install(str(tmp_path), FileManager.STATIC_MIME_TYPES)
+    assert not media_route.is_registered()
+    app = Server._create_app(None)
+    assert media_route.is_registered()
+    return app
+
+
+def fetch_all(app, requests):
+    async def run():
+        sock, port = bind_unused_port()
+        server = HTTPServer(app)
+        server.add_sockets([sock])
+        client = AsyncHTTPClient()
+        try:
+            return [await client.fetch(f"http://127.0.0.1:{port}/{path}", headers=headers, raise_error=False)
+                    for path, headers in requests]
+        finally:
+            server.stop()
+    return asyncio.run(run())
+
+
+def test_serves_types_ranges_and_cache_headers(route):
+    full, partial, font = fetch_all(route, [
+        (f"{media_route.ROUTE_PREFIX}/{HASHED}", {}),
+        (f"{media_route.ROUTE_PREFIX}/{HASHED}", {"Range": "bytes=10-19"}),
+        (f"{media_route.ROUTE_PREFIX}/fonts/a.woff2", {}),
+    ])
+    assert full.code == 200
+    assert full.headers["Content-Type"] == "audio/mpeg"
+    assert "immutable" in full.headers["Cache-Control"]
+
+    assert partial.code == 206
+    assert partial.body == bytes(range(10, 20))
+    assert partial.headers["Content-Range"] == "bytes 10-19/1024"
+
+    assert font.headers["Content-Type"] == "font/woff2"
+    assert font.headers["Cache-Control"] == "no-cache"
+
+
+def test_refuses_hidden_unknown_and_outside_files(route):
+    responses = fetch_all(route, [
+        (f"{media_route.ROUTE_PREFIX}/media/.1.2.prepared", {}),
+        (f"{media_route.ROUTE_PREFIX}/media/x.exe", {}),
+        (f"{media_route.ROUTE_PREFIX}/../secret.mp3", {}),
+    ])
+    assert [response.code for response in responses] == [404, 404, 403]
+
+
+def test_file_manager_uses_the_route(route):
+    assert FileManager.server_serves(".mp4")
+    assert FileManager.server_serves(".css")
+    assert not FileManager.server_serves(".exe")
+    assert FileManager.static_url("fonts/a.woff2") == f"{media_route.ROUTE_PREFIX}/fonts/a.woff2"
@@ -0,0 +1,77 @@
+"""
+Testes da máquina de estados do quiz (src/services/quiz_service.py)
+"""
+from src.services.quiz_bank import quiz_bank
+from src.services.quiz_service import QuizService, QuizState
+
+
+def new_quiz() -> QuizService:
+    return QuizService(quiz_bank.get(), session_state={})
+
+
+def wrong_choice(question) -> int:
+    return (question.correct + 1) % len(question.options)
+
+
+def test_starts_on_first_question_with_session_defaults():
+    quiz = new_quiz()
+    assert quiz.state == QuizState.QUESTION
+    assert quiz.current_index == 0
+    assert quiz.session_state['quiz_answers'] == {}
+    assert quiz.session_state['show_popup'] is False
+
+
+def test_answer_then_advance():
+    quiz = new_quiz()
+    question = quiz.current_question
+
+    assert quiz.answer(question.correct)
+    assert quiz.state == QuizState.FEEDBACK
+    assert quiz.session_state['popup_type'] == "success"
+    assert quiz.answers == {question.key: question.correct}
+
+    # Uma segunda resposta (clique duplo) não muda nada
+    assert not quiz.answer(wrong_choice(question))
+    assert quiz.answers == {question.key: question.correct}
+
+    assert quiz.advance()
+    assert quiz.state == QuizState.QUESTION
+    assert quiz.current_index == 1
+    assert not quiz.advance()
+
+
+def test_wrong_and_special_feedback():
+    quiz = new_quiz()
+    question = quiz.current_question
+    quiz.answer(wrong_choice(question))
+    assert quiz.session_state['popup_type'] == "error"
+
+    special = next(q for q in quiz.questions if not q.is_scored)
+    assert quiz.feedback_for(special, 0)[1] == "special"
+
+
+def test_consume_feedback_advances_to_result():
+    quiz = new_quiz()
+    for index in range(quiz.total):
+        assert quiz.state == QuizState.QUESTION
+        question = quiz.current_question
+        quiz.answer(question.correct if question.is_scored else 0)
+        feedback = quiz.consume_feedback()
+        assert feedback.question == index
+        assert quiz.consume_feedback() is None
+
+    assert quiz.state == QuizState.RESULT
+    result = quiz.result()
+    assert result.percentage == 100
+    assert not result.wrong_questions
+    assert result.total == len(quiz.quiz_set.scored_questions)
+
+
+def test_reset_returns_to_first_question():
+    quiz = new_quiz()
+    quiz.answer(wrong_choice(quiz.current_question))
+    quiz.advance()
+    quiz.reset()
+    assert quiz.state == QuizState.QUESTION
+    assert quiz.current_index == 0
+    assert quiz.answers == {}
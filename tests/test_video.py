@@ -0,0 +1,95 @@
+"""
+Testes do faststart dos vídeos (src/utils/video.py)
+"""
+import struct
+
+from src.utils.video import faststart_remux, inspect_mp4
+
+
+def box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I4s', 8 + len(payload), kind) + payload
+
+
+def offsets_table(kind: bytes, offsets) -> bytes:
+    code = '>Q' if kind == b'co64' else '>I'
+    entries = b''.join(struct.pack(code, offset) for offset in offsets)
+    return box(kind, b'\0\0\0\0' + struct.pack('>I', len(offsets)) + entries)
+
+
+def moov_with(tables) -> bytes:
+    traks = b''.join(box(b'trak', box(b'mdia', box(b'minf', box(b'stbl', table)))) for table in tables)
+    return box(b'moov', box(b'mvhd', b'\0' * 100) + traks)
+
+
+def write_mp4_moov_last(path, table_kinds=(b'stco',)) -> dict:
+    """
+    MP4 sintético com o 'moov' no fim e tabelas de offsets apontando para
+    amostras dentro do 'mdat'; retorna {offset original: bytes da amostra}
+    """
+    ftyp = box(b'ftyp', b'isom\0\0\0\0isommp41')
+    samples = [bytes([i]) * (50 + i * 10) for i in range(6)]
+    mdat_payload = b''.join(samples)
+    mdat_start = len(ftyp) + 8
+
+    offsets, position = [], mdat_start
+    for sample in samples:
+        offsets.append(position)
+        position += len(sample)
+
+    # Uma tabela por faixa, com as amostras repartidas entre elas
+    tables = [offsets_table(kind, offsets[i::len(table_kinds)]) for i, kind in enumerate(table_kinds)]
+    with open(path, 'wb') as mp4:
+        mp4.write(ftyp + box(b'mdat', mdat_payload) + moov_with(tables))
+    return dict(zip(offsets, samples))
+
+
+def read_offsets(data: bytes):
+    """Offsets de todas as tabelas stco/co64 do arquivo, na ordem"""
+    found = []
+    for kind, code, width in ((b'stco', '>I', 4), (b'co64', '>Q', 8)):
+        start = data.find(kind)
+        while start != -1:
+            count = struct.unpack_from('>I', data, start + 8)[0]
+            found += [struct.unpack_from(code, data, start + 12 + i * width)[0] for i in range(count)]
+            start = data.find(kind, start + 1)
+    return found
+
+
+def test_remux_moves_moov_and_fixes_offsets(tmp_path):
+    source, output = tmp_path / "in.mp4", tmp_path / "out.mp4"
+    samples = write_mp4_moov_last(source, (b'stco', b'co64'))
+    assert not inspect_mp4(str(source)).faststart
+
+    assert faststart_remux(str(source), str(output))
+
+    layout = inspect_mp4(str(output))
+    assert layout.faststart
+    assert layout.describe() == "ftyp moov mdat"
+    assert output.stat().st_size == source.stat().st_size
+
+    data = output.read_bytes()
+    new_offsets = read_offsets(data)
+    assert len(new_offsets) == len(samples)
+    moov_size = layout.find(b'moov').size
+    for old_offset, new_offset in zip(sorted(samples), sorted(new_offsets)):
+        assert new_offset == old_offset + moov_size
+        sample = samples[old_offset]
+        assert data[new_offset:new_offset + len(sample)] == sample
+
+
+def test_remux_leaves_faststart_files_alone(tmp_path):
+    source, output = tmp_path / "in.mp4", tmp_path / "out.mp4"
+    write_mp4_moov_last(source)
+    assert faststart_remux(str(source), str(output))
+
+    assert not faststart_remux(str(output), str(tmp_path / "again.mp4"))
+    assert not (tmp_path / "again.mp4").exists()
+
+
+def test_remux_rejects_invalid_files(tmp_path):
+    source = tmp_path / "broken.mp4"
+    source.write_bytes(struct.pack('>I4s', 4096, b'ftyp') + b'curto')
+
+    assert inspect_mp4(str(source)) is None
+    assert not faststart_remux(str(source), str(tmp_path / "out.mp4"))
+    assert [path.name for path in tmp_path.iterdir()] == ["broken.mp4"]